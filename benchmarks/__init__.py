@@ -0,0 +1,18 @@
+"""
+Benchmarks for the Cayley permutation packages and TileScope, with the results
+compared to a baseline to catch slowdowns.
+
+Run them with python -m benchmarks, see python -m benchmarks --help.
+"""
+
+from .harness import BENCHMARKS, LEVELS, Benchmark, benchmark, compare, run_benchmarks
+from . import suite  # noqa: F401  # registers the benchmarks
+
+__all__ = [
+    "BENCHMARKS",
+    "LEVELS",
+    "Benchmark",
+    "benchmark",
+    "compare",
+    "run_benchmarks",
+]
@@ -0,0 +1,67 @@
+"""
+Run the benchmarks from the command line, e.g.
+
+    python -m benchmarks --level core --level tiling --save-baseline baseline.json
+    python -m benchmarks --baseline baseline.json --output results.json
+
+The exit status is 1 if a benchmark is slower or uses more memory than in the
+baseline by more than the tolerance.
+"""
+
+import argparse
+import logging
+import sys
+from typing import Optional
+
+import logzero  # type: ignore[import-untyped]
+
+from . import LEVELS, compare, run_benchmarks
+from .harness import load_results, save_results
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run the benchmarks and return the exit status."""
+    parser = argparse.ArgumentParser(description="Run the benchmarks.")
+    parser.add_argument(
+        "--level",
+        action="append",
+        choices=LEVELS,
+        help="level of benchmarks to run, can be repeated (default: all)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks whose name contains this"
+    )
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument(
+        "--save-baseline", help="file to write the results to as a new baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="fraction above the baseline counted as a regression (default: 0.25)",
+    )
+    parser.add_argument(
+        "--no-memory", action="store_true", help="do not measure peak memory"
+    )
+    args = parser.parse_args(argv)
+    logzero.loglevel(logging.WARNING)
+    results = run_benchmarks(
+        args.level or LEVELS, args.filter, not args.no_memory, log=print
+    )
+    for path in (args.output, args.save_baseline):
+        if path is not None:
+            save_results(results, path)
+    if args.baseline is None:
+        return 0
+    regressions = compare(results, load_results(args.baseline), args.tolerance)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+The harness for the benchmarks: registering benchmarks, timing them, measuring
+their peak memory, and comparing the results to a baseline.
+
+Each benchmark is timed over a number of runs without tracing memory, and the
+fastest run is the time recorded. The peak memory is measured with tracemalloc
+in one more run, since tracing slows the code down.
+"""
+
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Iterable, Optional
+
+LEVELS = ("core", "tiling", "search")
+
+
+class Benchmark:
+    """A benchmark at one of the LEVELS. The setup function returns the input
+    to the benchmark and is not timed."""
+
+    def __init__(
+        self,
+        name: str,
+        level: str,
+        func: Callable[[Any], Any],
+        setup: Optional[Callable[[], Any]] = None,
+        repeat: int = 5,
+    ) -> None:
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
+        if level not in LEVELS:
+            raise ValueError(f"Unknown level {level}, must be one of {LEVELS}.")
+        self.name = name
+        self.level = level
+        self.func = func
+        self.setup = setup
+        self.repeat = repeat
+
+    def run_once(self) -> float:
+        """Run the benchmark and return the time taken in seconds."""
+        data = None if self.setup is None else self.setup()
+        start = time.perf_counter()
+        self.func(data)
+        return time.perf_counter() - start
+
+    def peak_memory(self) -> int:
+        """Run the benchmark and return the peak memory allocated in bytes."""
+        data = None if self.setup is None else self.setup()
+        tracemalloc.start()
+        try:
+            self.func(data)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    def measure(self, memory: bool = True) -> dict:
+        """Return the times of the runs, the fastest and median time, and the
+        peak memory of the benchmark."""
+        times = [self.run_once() for _ in range(self.repeat)]
+        return {
+            "level": self.level,
+            "time": min(times),
+            "median_time": statistics.median(times),
+            "times": times,
+            "peak_memory": self.peak_memory() if memory else None,
+        }
+
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(
+    level: str,
+    name: Optional[str] = None,
+    setup: Optional[Callable[[], Any]] = None,
+    repeat: int = 5,
+) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    """Register the decorated function as a benchmark. It is given the value
+    returned by setup, or None."""
+
+    def register(func: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        bench = Benchmark(name or func.__name__, level, func, setup, repeat)
+        if bench.name in BENCHMARKS:
+            raise ValueError(f"There is already a benchmark called {bench.name}.")
+        BENCHMARKS[bench.name] = bench
+        return func
+
+    return register
+
+
+def run_benchmarks(
+    levels: Iterable[str] = LEVELS,
+    pattern: str = "",
+    memory: bool = True,
+    log: Optional[Callable[[str], Any]] = None,
+) -> dict:
+    """Run the benchmarks at the levels whose names contain the pattern and return
+    the results, keyed by benchmark name, with information about the machine."""
+    levels = tuple(levels)
+    results: dict[str, dict] = {}
+    for bench in BENCHMARKS.values():
+        if bench.level not in levels or pattern not in bench.name:
+            continue
+        results[bench.name] = bench.measure(memory)
+        if log is not None:
+            log(format_result(bench.name, results[bench.name]))
+    return {
+        "machine": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "benchmarks": results,
+    }
+
+
+def format_result(name: str, result: dict) -> str:
+    """Return a line describing the result of the benchmark."""
+    line = f"{result['level']:>6} {name:<45} {result['time']:10.4f}s"
+    if result["peak_memory"] is not None:
+        line += f" {result['peak_memory'] / 1024 / 1024:10.2f}MiB"
+    return line
+
+
+def save_results(results: dict, path: str) -> None:
+    """Write the results to the path as JSON."""
+    with open(path, "w", encoding="utf-8") as results_file:
+        json.dump(results, results_file, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """Return the results written to the path by save_results."""
+    with open(path, encoding="utf-8") as results_file:
+        return json.load(results_file)
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list[str]:
+    """Return a description of each benchmark whose time or peak memory is more
+    than the tolerance (as a fraction) above the baseline. Benchmarks not in the
+    baseline are ignored."""
+    regressions = []
+    for name, result in results["benchmarks"].items():
+        base = baseline["benchmarks"].get(name)
+        if base is None:
+            continue
+        for key, unit in (("time", "s"), ("peak_memory", " bytes")):
+            if result[key] is None or base[key] is None:
+                continue
+            if result[key] > base[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {key} went from {base[key]:.4g}{unit} to "
+                    f"{result[key]:.4g}{unit} "
+                    f"({result[key] / base[key] - 1:+.0%})"
+                )
+    return regressions
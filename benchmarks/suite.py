@@ -0,0 +1,196 @@
+"""
+The benchmarks, at three levels:
+
+- core: the Cayley permutation operations everything else is built on.
+- tiling: the tiling operations applied by the strategies.
+- search: auto_search on a fixed roster of bases.
+
+The inputs are fixed, and generated from seeded random number generators where
+they are random, so results from different commits can be compared.
+"""
+
+from random import Random
+
+from comb_spec_searcher.exception import StrategyDoesNotApply
+
+from cayley_permutations import Av, CayleyPermutation, string_to_basis
+from clouds import TrackedSearcher, TrackedTileScopePack
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+from gridded_cayley_permutations.point_placements import PointPlacement
+from tilescope import TileScope, TileScopePack
+from tilescope.strategies import LessThanOrEqualRowColSeparationFactory
+from tilescope.strategies.row_column_separation import LessThanRowColSeparation
+
+from .harness import benchmark
+
+# Core level
+
+
+def random_cayley_permutation(size: int, rng: Random) -> CayleyPermutation:
+    """Return a Cayley permutation of the size with values chosen by rng."""
+    return CayleyPermutation.standardise(rng.randrange(size) for _ in range(size))
+
+
+def occurrences_setup() -> tuple[list[CayleyPermutation], list[CayleyPermutation]]:
+    """Return all the patterns of size 3 and some words of size 12."""
+    rng = Random(0)
+    words = [random_cayley_permutation(12, rng) for _ in range(20)]
+    return CayleyPermutation.of_size(3), words
+
+
+@benchmark("core", setup=occurrences_setup)
+def occurrences_in(data) -> int:
+    """Count the occurrences of each pattern in each word."""
+    patterns, words = data
+    return sum(
+        1 for patt in patterns for word in words for _ in patt.occurrences_in(word)
+    )
+
+
+@benchmark("core", repeat=3)
+def av_counter(_) -> list[int]:
+    """Count a class by brute force."""
+    return Av(string_to_basis("012_2100")).counter(7)
+
+
+@benchmark(
+    "core", setup=lambda: [Random(i).choices(range(100), k=10) for i in range(10000)]
+)
+def standardise(words) -> list[CayleyPermutation]:
+    """Standardise some words."""
+    return [CayleyPermutation.standardise(word) for word in words]
+
+
+# Tiling level
+
+
+def class_tiling(basis: str) -> Tiling:
+    """Return the 1x1 tiling for the class with the basis."""
+    return Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis(basis)],
+        [],
+        (1, 1),
+    )
+
+
+def point() -> GriddedCayleyPerm:
+    """Return the point in the cell (0, 0)."""
+    return GriddedCayleyPerm(CayleyPermutation((0,)), ((0, 0),))
+
+
+def placed_tilings() -> list[Tiling]:
+    """Return the tilings found by placing the rightmost and topmost points of
+    some classes, and then the leftmost point in the bottom left cell."""
+    tilings = []
+    for basis in ("012_2100", "231_312_2121", "0101_1010", "012_021_1001"):
+        tiling = class_tiling(basis).add_requirement_list((point(),))
+        for direction in (0, 1):
+            (placed,) = PointPlacement(tiling).point_placement(
+                (point(),), (0,), direction
+            )
+            tilings.append(placed)
+            again = placed.add_requirement_list((point(),))
+            tilings.extend(PointPlacement(again).point_placement((point(),), (0,), 3))
+    return tilings
+
+
+def tiling_data() -> list[tuple]:
+    """Return the obstructions, requirements and dimensions of the placed tilings."""
+    return [
+        (tiling.obstructions, tiling.requirements, tiling.dimensions)
+        for tiling in placed_tilings()
+    ]
+
+
+@benchmark("tiling", setup=tiling_data)
+def tiling_simplify(data) -> list[Tiling]:
+    """Create the tilings, simplifying the obstructions and requirements."""
+    return [Tiling(obs, reqs, dimensions) for obs, reqs, dimensions in data]
+
+
+@benchmark("tiling", setup=tiling_data)
+def tiling_is_empty(data) -> list[bool]:
+    """Check if the tilings, and each tiling with an extra point in its bottom
+    left cell, are empty."""
+    tilings = [Tiling(obs, reqs, dims, simplify=False) for obs, reqs, dims in data]
+    return [tiling.is_empty() for tiling in tilings] + [
+        tiling.add_requirement_list((point(),)).is_empty() for tiling in tilings
+    ]
+
+
+@benchmark(
+    "tiling",
+    setup=lambda: [class_tiling(basis) for basis in ("012_2100", "0101_1010")],
+    repeat=3,
+)
+def point_placement(tilings) -> list[Tiling]:
+    """Place the point in each direction, and then place the point in the same
+    direction in the bottom left cell of the result."""
+    placed = []
+    for tiling in tilings:
+        tiling = tiling.add_requirement_list((point(),))
+        for direction in PointPlacement.DIRECTIONS:
+            for child in PointPlacement(tiling).point_placement(
+                (point(),), (0,), direction
+            ):
+                placed.append(child)
+                again = child.add_requirement_list((point(),))
+                placed.extend(
+                    PointPlacement(again).point_placement((point(),), (0,), direction)
+                )
+    return placed
+
+
+@benchmark("tiling", setup=placed_tilings)
+def fusion_checks(tilings) -> list[bool]:
+    """Check if each row and column of the tilings can be fused."""
+    return [
+        tiling.is_fusable(fuse_rows, index)
+        for tiling in tilings
+        for fuse_rows in (True, False)
+        for index in range(tiling.dimensions[fuse_rows] - 1)
+    ]
+
+
+@benchmark("tiling", setup=placed_tilings)
+def row_col_separation(tilings) -> int:
+    """Separate the rows and columns of the tilings in all the ways the
+    separation strategies do."""
+    found = 0
+    factory = LessThanOrEqualRowColSeparationFactory()
+    for tiling in tilings:
+        found += sum(1 for _ in LessThanRowColSeparation(tiling).row_col_separation())
+        for strategy in factory(tiling):
+            try:
+                found += len(strategy.decomposition_function(tiling))
+            except StrategyDoesNotApply:
+                pass
+    return found
+
+
+# Search level
+
+
+def tilescope_search(basis: str):
+    """Return a benchmark of the point placement search for the basis."""
+
+    def search(_) -> None:
+        TileScope(class_tiling(basis), TileScopePack.point_placement()).auto_search()
+
+    return search
+
+
+def tracked_search(basis: str):
+    """Return a benchmark of the fusion search with clouds for the basis."""
+
+    def search(_) -> None:
+        pack = TrackedTileScopePack.standard_fusion_pack(expansion_methods=["point"])
+        TrackedSearcher(basis, pack, max_cvs=1).auto_search()
+
+    return search
+
+
+for _basis in ("231_312_2121", "012_021"):
+    benchmark("search", f"tilescope_{_basis}", repeat=1)(tilescope_search(_basis))
+for _basis in ("012_101_010", "101_010", "210_101_011"):
+    benchmark("search", f"tracked_{_basis}", repeat=1)(tracked_search(_basis))
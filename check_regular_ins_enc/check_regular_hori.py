@@ -2,6 +2,9 @@
 is a horizontal juxtaposition and if a basis has a regular
 horizontal insertion encoding."""
 
+from functools import lru_cache
+from typing import Iterable
+
 from cayley_permutations import string_to_basis, CayleyPermutation
 
 
@@ -85,8 +88,12 @@ def seq_type(cperm: list[int], seqtype: int, vals_seen: set[int] | None = None)
     raise ValueError("Type must be 0, 1, or 2.")
 
 
+# A set bit 2 * i + j means the pattern is a horizontal juxtaposition of type (i, j).
+ALL_HORIZONTAL_TYPES = (1 << 4) - 1
+
+
 def regular_horizontal_insertion_encoding(
-    basis: str | tuple[CayleyPermutation, ...],
+    basis: str | Iterable[CayleyPermutation],
 ) -> bool:
     """Checks if a basis has a regular insertion encoding.
     The basis must have permutations which are of the form
@@ -100,12 +107,38 @@ def regular_horizontal_insertion_encoding(
     True
     """
     basis = string_to_basis(basis) if isinstance(basis, str) else basis
+    return _regular_horizontal_insertion_encoding(frozenset(map(tuple, basis)))
+
+
+@lru_cache(maxsize=2**16)
+def _regular_horizontal_insertion_encoding(basis: frozenset[tuple[int, ...]]) -> bool:
+    """Checks if the basis contains a horizontal juxtaposition of each type. The
+    verdict is cached for each basis."""
+    mask = 0
+    for cperm in basis:
+        mask |= horizontal_juxtaposition_mask(cperm)
+        if mask == ALL_HORIZONTAL_TYPES:
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def horizontal_juxtaposition_mask(cperm: tuple[int, ...]) -> int:
+    """Returns the bit mask of the types (i, j) such that the sequence is a
+    horizontal juxtaposition of type (i, j), with bit 2 * i + j for (i, j).
+
+    Examples:
+    >>> horizontal_juxtaposition_mask((0,)) == ALL_HORIZONTAL_TYPES
+    True
+    >>> bin(horizontal_juxtaposition_mask((0, 1, 2)))
+    '0b1110'
+    """
+    mask = 0
     for i in range(2):
         for j in range(2):
-            if any(checks_hori_type(list(cperm), (i, j)) for cperm in basis):
-                continue
-            return False
-    return True
+            if checks_hori_type(list(cperm), (i, j)):
+                mask |= 1 << (2 * i + j)
+    return mask
 
 
 def checks_hori_type(cperm: list[int], class_to_check: tuple[int, int]) -> bool:
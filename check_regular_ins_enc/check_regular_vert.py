@@ -2,12 +2,18 @@
 is a vertical juxtaposition and if a basis has a regular
 vertical insertion encoding."""
 
+from functools import lru_cache
+from typing import Iterable
+
 from cayley_permutations import string_to_basis, CayleyPermutation
 
+# A set bit 3 * i + j means the pattern is a vertical juxtaposition of type (i, j).
+ALL_VERTICAL_TYPES = (1 << 9) - 1
+
 
 # pylint: disable=duplicate-code
 def regular_vertical_insertion_encoding(
-    basis: str | tuple[CayleyPermutation, ...],
+    basis: str | Iterable[CayleyPermutation],
 ) -> bool:
     """Checks if a basis has a regular insertion encoding.
 
@@ -16,12 +22,38 @@ def regular_vertical_insertion_encoding(
     True
     """
     basis = string_to_basis(basis) if isinstance(basis, str) else basis
+    return _regular_vertical_insertion_encoding(frozenset(map(tuple, basis)))
+
+
+@lru_cache(maxsize=2**16)
+def _regular_vertical_insertion_encoding(basis: frozenset[tuple[int, ...]]) -> bool:
+    """Checks if the basis contains a vertical juxtaposition of each type. The
+    verdict is cached for each basis."""
+    mask = 0
+    for cperm in basis:
+        mask |= vertical_juxtaposition_mask(cperm)
+        if mask == ALL_VERTICAL_TYPES:
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def vertical_juxtaposition_mask(cperm: tuple[int, ...]) -> int:
+    """Returns the bit mask of the types (i, j) such that the sequence is a
+    vertical juxtaposition of type (i, j), with bit 3 * i + j for (i, j).
+
+    Examples:
+    >>> vertical_juxtaposition_mask((0,)) == ALL_VERTICAL_TYPES
+    True
+    >>> bin(vertical_juxtaposition_mask((0, 1, 2)))
+    '0b10111010'
+    """
+    mask = 0
     for i in range(3):
         for j in range(3):
-            if any(checks_vert_type(list(cperm), (i, j)) for cperm in basis):
-                continue
-            return False
-    return True
+            if checks_vert_type(list(cperm), (i, j)):
+                mask |= 1 << (3 * i + j)
+    return mask
 
 
 def checks_vert_type(cperm: list[int], class_to_check: tuple[int, int]) -> bool:
@@ -0,0 +1,128 @@
+"""Module with the ParameterBounds class, which finds the values the parameters of
+a tracked tiling can take on the gridded Cayley permutations of a given size."""
+
+from itertools import combinations
+from typing import TYPE_CHECKING, Iterator
+
+from gridded_cayley_permutations import GriddedCayleyPerm
+
+if TYPE_CHECKING:
+    from .tracked_tiling import TrackedTiling
+
+
+class ParameterBounds:
+    """
+    Bounds on the parameters of a tracked tiling, in the order of
+    extra_parameters. Every gridded Cayley permutation on the tiling contains one
+    of its minimal gridded Cayley permutations, and the number of points in a set
+    of columns and the number of values in a set of rows can only go down when
+    points are removed, so the bounds are found from the minimal ones:
+
+    - each parameter is at least its smallest value on them.
+    - each parameter is at most n minus the fewest points outside its cloud,
+      and exactly n for an indices cloud containing every active column.
+    - a parameter is at most the parameter of any cloud of the same type
+      containing its cloud.
+    - the parameters of pairwise disjoint clouds of the same type sum to at most
+      n minus the fewest points outside all of them.
+    """
+
+    def __init__(self, tiling: "TrackedTiling") -> None:
+        self.parameters = tiling.extra_parameters
+        clouds = [(cloud, False) for cloud in tiling.indices_clouds] + [
+            (cloud, True) for cloud in tiling.value_clouds
+        ]
+        minimal_gcps = tuple(tiling.minimal_gridded_cperms())
+        self.empty = not minimal_gcps
+        parameters_array = tiling.get_parameters_array(minimal_gcps)
+        self.minimums = (
+            tuple(parameters_array.min(axis=0).tolist())
+            if minimal_gcps
+            else tuple(0 for _ in self.parameters)
+        )
+        self.outside_minimums = tuple(
+            self._fewest_outside(minimal_gcps, set(cloud), row) for cloud, row in clouds
+        )
+        active_cols, _ = tiling.active_col_rows
+        self.exact = tuple(
+            not row and active_cols.issubset(cloud) for cloud, row in clouds
+        )
+        # (i, j) if the parameter i is at most the parameter j
+        self.subsets = tuple(
+            (i, j)
+            for i, (cloud, row) in enumerate(clouds)
+            for j, (other, other_row) in enumerate(clouds)
+            if i != j and row == other_row and set(cloud) < set(other)
+        )
+        # (parameters, bound) if the parameters sum to at most n - bound
+        self.families: list[tuple[tuple[int, ...], int]] = []
+        for row in (False, True):
+            same_type = [i for i, (_, is_row) in enumerate(clouds) if is_row == row]
+            for size in range(2, len(same_type) + 1):
+                for family in combinations(same_type, size):
+                    union = set().union(*(clouds[i][0] for i in family))
+                    if sum(len(clouds[i][0]) for i in family) == len(union):
+                        bound = self._fewest_outside(minimal_gcps, union, row)
+                        self.families.append((family, bound))
+
+    @staticmethod
+    def _fewest_outside(
+        gcps: tuple[GriddedCayleyPerm, ...], cloud: set[int], row: bool
+    ) -> int:
+        """Return the fewest points of the gridded Cayley permutations outside the
+        rows (if row) or columns of the cloud."""
+        axis = 1 if row else 0
+        return min(
+            (
+                sum(1 for cell in gcp.positions if cell[axis] not in cloud)
+                for gcp in gcps
+            ),
+            default=0,
+        )
+
+    def value_range(self, idx: int, n: int) -> range:
+        """Return the values the parameter with the index can take for size n,
+        from its own bounds only."""
+        lower = n if self.exact[idx] else self.minimums[idx]
+        return range(lower, n - self.outside_minimums[idx] + 1)
+
+    def feasible(self, n: int) -> Iterator[tuple[int, ...]]:
+        """Yield the values of the parameters, in lexicographic order, which
+        satisfy the bounds for size n."""
+        if self.empty:
+            return
+        values: list[int] = []
+        yield from self._extend(n, values)
+
+    def _extend(self, n: int, values: list[int]) -> Iterator[tuple[int, ...]]:
+        idx = len(values)
+        if idx == len(self.parameters):
+            yield tuple(values)
+            return
+        values_range = self.value_range(idx, n)
+        lower, upper = values_range.start, values_range.stop - 1
+        for i, j in self.subsets:
+            if j == idx and i < idx:
+                lower = max(lower, values[i])
+            elif i == idx and j < idx:
+                upper = min(upper, values[j])
+        for value in range(lower, upper + 1):
+            values.append(value)
+            if self._families_fit(n, values):
+                yield from self._extend(n, values)
+                values.pop()
+            else:
+                values.pop()
+                break
+
+    def _families_fit(self, n: int, values: list[int]) -> bool:
+        """Return True if the families containing the last parameter can still
+        sum to at most their bound, with the smallest values for the parameters
+        not yet chosen."""
+        idx = len(values) - 1
+        for family, bound in self.families:
+            if idx in family:
+                total = sum(values[i] if i <= idx else self.minimums[i] for i in family)
+                if total > n - bound:
+                    return False
+        return True
@@ -0,0 +1,54 @@
+"""
+Module containing the QueueMetrics class, the running counts kept by a
+TrackedQueue for each level of underlying tilings.
+
+The counts are updated as labels are added and expanded, so a snapshot only
+reads them and the lengths of the queues. Snapshots are JSON types and can be
+appended to a file as JSON lines, one snapshot per line, to follow a long search.
+"""
+
+import json
+import time
+from collections import Counter
+
+
+class QueueMetrics:
+    """
+    For each level of underlying tilings, the number of underlying labels and of
+    all labels found at that level, the number of rules rejected by max_cvs when
+    expanding its labels, and the number of expansions of its labels and the time
+    they took.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.time()
+        self.underlying_labels: Counter[int] = Counter()
+        self.all_labels: Counter[int] = Counter()
+        self.rejected_rules: Counter[int] = Counter()
+        self.expansions: Counter[int] = Counter()
+        self.expansion_times: dict[int, float] = {}
+
+    def record_expansion(self, level: int, elapsed: float) -> None:
+        """Record an expansion of a label at the level which took elapsed seconds."""
+        self.expansions[level] += 1
+        self.expansion_times[level] = self.expansion_times.get(level, 0.0) + elapsed
+
+    def record_rejected(self, level: int) -> None:
+        """Record a rule rejected by max_cvs when expanding a label at the level."""
+        self.rejected_rules[level] += 1
+
+    def level_jsonable(self, level: int) -> dict:
+        """Return the counts for the level as a dictionary of JSON types."""
+        return {
+            "underlying_labels": self.underlying_labels[level],
+            "all_labels": self.all_labels[level],
+            "rejected_rules": self.rejected_rules[level],
+            "expansions": self.expansions[level],
+            "expansion_time": self.expansion_times.get(level, 0.0),
+        }
+
+    @staticmethod
+    def append_json(snapshot: dict, path: str) -> None:
+        """Append the snapshot to the path as a line of JSON."""
+        with open(path, "a", encoding="utf-8") as json_file:
+            json_file.write(json.dumps(snapshot) + "\n")
@@ -4,6 +4,7 @@ Adapted from Tilings' assumption insertion strategy, which can be found here:
 https://github.com/PermutaTriangle/Tilings/blob/develop/tilings/strategies/assumption_insertion.py
 """
 
+from bisect import bisect_left
 from collections import Counter
 from itertools import product
 from random import randint
@@ -26,6 +27,7 @@ from comb_spec_searcher.typing import (
 )
 from gridded_cayley_permutations import GriddedCayleyPerm as GriddedPerm
 from ..tracked_tiling import TrackedTiling as Tiling
+from .dense_terms import SMALL_TERMS, map_terms
 from .extra_parameters import ExtraParametersForStrategies
 
 Cell = Tuple[int, int]
@@ -36,6 +38,8 @@ class AddAssumptionsConstructor(Constructor):
     The constructor used to count when a new variable is added.
     """
 
+    # pylint: disable=too-many-instance-attributes
+
     def __init__(
         self,
         parent: Tiling,
@@ -47,7 +51,21 @@ class AddAssumptionsConstructor(Constructor):
         self.extra_parameters = extra_parameters
         #  the paramater that was added, to count we must sum over all possible values
         self.new_parameters = tuple(new_parameters)
-        self.child_param_map = self._build_child_param_map(parent, child)
+        self.num_parent_params = len(parent.extra_parameters)
+        self.child_pos_to_parent_pos = self._child_pos_to_parent_pos(parent, child)
+        self.child_param_map = self.build_param_map(
+            self.child_pos_to_parent_pos, self.num_parent_params
+        )
+        self.child_bounds = child.parameter_bounds
+        self.new_parameter_indices = tuple(
+            child.extra_parameters.index(k) for k in self.new_parameters
+        )
+        # (n, child parameters) -> child parameters with the new parameters set,
+        # and the cumulative counts of the child for them
+        self.sample_tables: Dict[
+            Tuple[int, Tuple[Tuple[str, int], ...]],
+            Tuple[List[Dict[str, int]], List[int]],
+        ] = {}
 
     def get_equation(self, lhs_func: Function, rhs_funcs: Tuple[Function, ...]) -> Eq:
         rhs_func = rhs_funcs[0]
@@ -65,6 +83,11 @@ class AddAssumptionsConstructor(Constructor):
         self, parent_terms: Callable[[int], Terms], subterms: SubTerms, n: int
     ) -> Terms:
         assert len(subterms) == 1
+        child_terms = subterms[0](n)
+        if len(child_terms) >= SMALL_TERMS:
+            return map_terms(
+                child_terms, self.child_pos_to_parent_pos, self.num_parent_params
+            )
         return self._push_add_assumption(n, subterms[0], self.child_param_map)
 
     @staticmethod
@@ -78,12 +101,14 @@ class AddAssumptionsConstructor(Constructor):
             new_terms[child_param_map(param)] += value
         return new_terms
 
-    def _build_child_param_map(self, parent: Tiling, child: Tiling) -> ParametersMap:
+    def _child_pos_to_parent_pos(
+        self, parent: Tiling, child: Tiling
+    ) -> Tuple[Tuple[int, ...], ...]:
         parent_param_to_pos = {
             param: pos for pos, param in enumerate(parent.extra_parameters)
         }
         child_param_to_parent_param = {v: k for k, v in self.extra_parameters.items()}
-        child_pos_to_parent_pos: Tuple[Tuple[int, ...], ...] = tuple(
+        return tuple(
             (
                 tuple()
                 if param in self.new_parameters
@@ -91,9 +116,6 @@ class AddAssumptionsConstructor(Constructor):
             )
             for param in child.extra_parameters
         )
-        return self.build_param_map(
-            child_pos_to_parent_pos, len(parent.extra_parameters)
-        )
 
     def get_sub_objects(
         self, subobjs: SubObjects, n: int
@@ -101,7 +123,6 @@ class AddAssumptionsConstructor(Constructor):
         for param, gps in subobjs[0](n).items():
             yield self.child_param_map(param), (gps,)
 
-    # pylint:disable=inconsistent-return-statements
     def random_sample_sub_objects(
         self,
         parent_count: int,
@@ -110,19 +131,41 @@ class AddAssumptionsConstructor(Constructor):
         n: int,
         **parameters: int,
     ) -> Tuple[Tuple[Optional[GriddedPerm]], ...]:
-
-        subrec = subrecs[0]
-        subsampler = subsamplers[0]
-        random_choice = randint(1, parent_count)
         new_params = {self.extra_parameters[k]: val for k, val in parameters.items()}
-        res = 0
-        for values in product(*[range(n + 1) for _ in self.new_parameters]):
-            for k, val in zip(self.new_parameters, values):
-                new_params[k] = val
-            res += subrec(n, **new_params)
-            if random_choice <= res:
-                return (subsampler(n, **new_params),)
-        raise RuntimeError("Should not reach here")
+        choices, cumulative = self._sample_table(subrecs[0], n, new_params)
+        random_choice = randint(1, parent_count)
+        idx = bisect_left(cumulative, random_choice)
+        if idx == len(cumulative):
+            raise RuntimeError("Should not reach here")
+        return (subsamplers[0](n, **choices[idx]),)
+
+    def _sample_table(
+        self, subrec: Callable[..., int], n: int, new_params: Dict[str, int]
+    ) -> Tuple[List[Dict[str, int]], List[int]]:
+        """Return the child parameters for each value of the new parameters the
+        child has objects of size n for, and the cumulative counts of the child
+        for them, so a sample is found with a binary search."""
+        key = (n, tuple(sorted(new_params.items())))
+        table = self.sample_tables.get(key)
+        if table is None:
+            choices: List[Dict[str, int]] = []
+            cumulative: List[int] = []
+            total = 0
+            for values in product(
+                *[
+                    self.child_bounds.value_range(idx, n)
+                    for idx in self.new_parameter_indices
+                ]
+            ):
+                params = dict(new_params, **dict(zip(self.new_parameters, values)))
+                count = subrec(n, **params)
+                if count:
+                    total += count
+                    choices.append(params)
+                    cumulative.append(total)
+            table = (choices, cumulative)
+            self.sample_tables[key] = table
+        return table
 
     def equiv(
         self, other: "Constructor", data: Optional[object] = None
@@ -154,7 +197,11 @@ class RemoveAssumptionsConstructor(Constructor):
         #  the paramater that was added, to count we must sum over all possible values
         self.parameter = parameter
         self.parameter_idx = parent.extra_parameters.index(self.parameter)
-        self.child_param_map = self._build_child_param_map(parent, child)
+        self.num_parent_params = len(parent.extra_parameters)
+        self.child_pos_to_parent_pos = self._child_pos_to_parent_pos(parent, child)
+        self.child_param_map = self.build_param_map(
+            self.child_pos_to_parent_pos, self.num_parent_params
+        )
 
     def get_equation(self, lhs_func: Function, rhs_funcs: Tuple[Function, ...]) -> Eq:
         rhs_func = rhs_funcs[0]
@@ -171,6 +218,14 @@ class RemoveAssumptionsConstructor(Constructor):
         self, parent_terms: Callable[[int], Terms], subterms: SubTerms, n: int
     ) -> Terms:
         assert len(subterms) == 1
+        child_terms = subterms[0](n)
+        if len(child_terms) >= SMALL_TERMS:
+            return map_terms(
+                child_terms,
+                self.child_pos_to_parent_pos,
+                self.num_parent_params,
+                (self.parameter_idx, n),
+            )
         return self._push_add_assumption(n, subterms[0], self.child_param_map)
 
     def _push_add_assumption(
@@ -186,18 +241,17 @@ class RemoveAssumptionsConstructor(Constructor):
             new_terms[tuple(new_param)] += value
         return new_terms
 
-    def _build_child_param_map(self, parent: Tiling, child: Tiling) -> ParametersMap:
+    def _child_pos_to_parent_pos(
+        self, parent: Tiling, child: Tiling
+    ) -> Tuple[Tuple[int, ...], ...]:
         parent_param_to_pos = {
             param: pos for pos, param in enumerate(parent.extra_parameters)
         }
         child_param_to_parent_param = {v: k for k, v in self.extra_parameters.items()}
-        child_pos_to_parent_pos: Tuple[Tuple[int, ...], ...] = tuple(
+        return tuple(
             (parent_param_to_pos[child_param_to_parent_param[param]],)
             for param in child.extra_parameters
         )
-        return self.build_param_map(
-            child_pos_to_parent_pos, len(parent.extra_parameters)
-        )
 
     def get_sub_objects(
         self, subobjs: SubObjects, n: int
@@ -211,8 +265,14 @@ class RemoveAssumptionsConstructor(Constructor):
         subrecs: SubRecs,
         n: int,
         **parameters: int,
-    ):
-        raise NotImplementedError
+    ) -> Tuple[Tuple[Optional[GriddedPerm]], ...]:
+        # the removed parameter is n, and the others fix the child parameters
+        new_params = {
+            self.extra_parameters[k]: val
+            for k, val in parameters.items()
+            if k != self.parameter
+        }
+        return (subsamplers[0](n, **new_params),)
 
     def equiv(
         self, other: "Constructor", data: Optional[object] = None
@@ -230,6 +290,9 @@ class RemoveAssumptionsConstructor(Constructor):
 class AddCloudsStrategy(ExtraParametersForStrategies, Strategy[Tiling, GriddedPerm]):
     """A strategy for adding clouds to a tiling class."""
 
+    # the child has the same tiling as the parent
+    predictable_clouds = True
+
     def __init__(
         self,
         val_clouds: Optional[Iterable[Iterable[int]]] = None,
@@ -289,6 +352,9 @@ class AddCloudsStrategy(ExtraParametersForStrategies, Strategy[Tiling, GriddedPe
         row_map = {i: (i,) for i in range(comb_class.dimensions[1])}
         return ((col_map, row_map),)
 
+    def added_clouds(self, comb_class: Tiling):
+        return ((self.idx_clouds, self.val_clouds),)
+
     def constructor(
         self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
     ) -> AddAssumptionsConstructor:
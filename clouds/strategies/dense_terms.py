@@ -0,0 +1,148 @@
+"""
+Counting the terms of the constructors for clouds with NumPy arrays.
+
+The terms of a class of size n are a Counter from parameter tuples to counts. For
+large Counters, the constructors turn them into an array of parameter tuples and
+an array of counts, move the parameters with array arithmetic, and add up the
+counts for each new parameter tuple in a dense array indexed by the parameter
+values. The counts are int64 if their total fits, and Python integers (object
+dtype) if not, so the result is always exact.
+
+Counters with fewer than SMALL_TERMS entries are left to the loops in the
+constructors, since for them the arrays cost more than they save.
+"""
+
+from collections import Counter
+from math import prod
+from typing import Optional
+
+import numpy as np
+from comb_spec_searcher.typing import Terms
+
+# Counters smaller than this are counted with Python loops.
+SMALL_TERMS = 64
+# The largest dense array, in entries, used to add up the counts. Larger results
+# are added up by sorting the parameter tuples instead.
+DENSE_LIMIT = 1 << 24
+
+INT64_LIMIT = int(np.iinfo(np.int64).max)
+
+
+def terms_to_arrays(terms: Terms, num_params: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return the parameter tuples of the terms as an m x num_params int64 array
+    and the counts as an array of length m."""
+    keys = np.array(list(terms.keys()), dtype=np.int64).reshape(-1, num_params)
+    counts = list(terms.values())
+    dtype = np.int64 if sum(counts) <= INT64_LIMIT else object
+    return keys, np.array(counts, dtype=dtype)
+
+
+def arrays_to_terms(keys: np.ndarray, counts: np.ndarray) -> Terms:
+    """Return the terms with the rows of keys as parameter tuples, the inverse
+    of terms_to_arrays."""
+    params = zip(*(column.tolist() for column in keys.T))
+    return Counter(dict(zip(params, counts.tolist())))
+
+
+def position_matrix(
+    child_pos_to_parent_pos: tuple[tuple[int, ...], ...], num_parent_params: int
+) -> np.ndarray:
+    """Return the matrix which maps child parameter tuples (as rows) to parent
+    parameter tuples, as in Constructor.param_map.
+
+    >>> position_matrix(((1,), (), (0, 1)), 2).tolist()
+    [[0, 1], [0, 0], [1, 1]]
+    """
+    matrix = np.zeros((len(child_pos_to_parent_pos), num_parent_params), np.int64)
+    for child_pos, parent_positions in enumerate(child_pos_to_parent_pos):
+        for parent_pos in parent_positions:
+            matrix[child_pos, parent_pos] += 1
+    return matrix
+
+
+def accumulate(keys: np.ndarray, counts: np.ndarray) -> Terms:
+    """Return the terms with the total count for each row of keys.
+
+    >>> keys = np.array([[0, 1], [2, 0], [0, 1]])
+    >>> accumulate(keys, np.array([1, 2, 3]))
+    Counter({(0, 1): 4, (2, 0): 2})
+    """
+    if len(keys) == 0:
+        return Counter()
+    if keys.shape[1] == 0:
+        return Counter({(): sum(counts.tolist())})
+    offset = keys.min(axis=0)
+    shape = tuple(int(size) for size in keys.max(axis=0) - offset + 1)
+    if prod(shape) <= DENSE_LIMIT:
+        linear = np.ravel_multi_index(tuple((keys - offset).T), shape)
+        dense = np.zeros(prod(shape), dtype=counts.dtype)
+        np.add.at(dense, linear, counts)
+        nonzero = np.flatnonzero(dense)
+        rows = np.stack(np.unravel_index(nonzero, shape), axis=1) + offset
+        totals = dense[nonzero]
+    else:
+        rows, inverse = np.unique(keys, axis=0, return_inverse=True)
+        totals = np.zeros(len(rows), dtype=counts.dtype)
+        np.add.at(totals, inverse.reshape(-1), counts)
+    return arrays_to_terms(rows, totals)
+
+
+def map_terms(
+    terms: Terms,
+    child_pos_to_parent_pos: tuple[tuple[int, ...], ...],
+    num_parent_params: int,
+    fixed: Optional[tuple[int, int]] = None,
+) -> Terms:
+    """Return the terms with each parameter tuple mapped as in
+    Constructor.param_map, adding up the counts of tuples with the same image. If
+    fixed is (index, value) then that parent parameter is set to value.
+
+    >>> map_terms(Counter({(1, 2): 3, (2, 1): 1, (3, 0): 5}), ((0,), (0, 1)), 2)
+    Counter({(3, 0): 5, (3, 2): 3, (3, 1): 1})
+    """
+    keys, counts = terms_to_arrays(terms, len(child_pos_to_parent_pos))
+    parent_keys = keys @ position_matrix(child_pos_to_parent_pos, num_parent_params)
+    if fixed is not None:
+        parent_keys[:, fixed[0]] = fixed[1]
+    return accumulate(parent_keys, counts)
+
+
+def fuse_terms(
+    terms: Terms,
+    child_pos_to_parent_pos: tuple[tuple[int, ...], ...],
+    num_parent_params: int,
+    fuse_parameter_index: int,
+    left_parameter_indices: tuple[int, ...],
+    right_parameter_indices: tuple[int, ...],
+    min_points: tuple[int, int],
+) -> Terms:
+    """
+    Return the terms of the parent of a fusion from the terms of the child. Each
+    child parameter tuple with f points in the fused region is mapped to the
+    parent, and then for each way of splitting the f points into l on the left
+    and f - l on the right, with at least min_points on each side, the left
+    parameters are shifted by l - f and the right parameters by -l.
+
+    >>> fuse_terms(Counter({(2,): 1}), ((0, 1),), 2, 0, (0,), (1,), (0, 0))
+    Counter({(0, 2): 1, (1, 1): 1, (2, 0): 1})
+    """
+    # pylint: disable=too-many-arguments, too-many-positional-arguments
+    # pylint: disable=too-many-locals
+    keys, counts = terms_to_arrays(terms, len(child_pos_to_parent_pos))
+    base = keys @ position_matrix(child_pos_to_parent_pos, num_parent_params)
+    fuse_points = keys[:, fuse_parameter_index]
+    base[:, list(left_parameter_indices)] -= fuse_points[:, None]
+    min_left, min_right = min_points
+    splits = np.maximum(fuse_points - min_left - min_right + 1, 0)
+    # each count is repeated once for each split, so the total can be larger
+    # than that of the terms
+    if sum(c * s for c, s in zip(counts.tolist(), splits.tolist())) > INT64_LIMIT:
+        counts = counts.astype(object)
+    rows = np.repeat(np.arange(len(keys)), splits)
+    starts = np.cumsum(splits) - splits
+    left_points = np.arange(len(rows)) - starts[rows] + min_left
+    direction = np.zeros(num_parent_params, np.int64)
+    direction[list(left_parameter_indices)] += 1
+    direction[list(right_parameter_indices)] -= 1
+    parent_keys = base[rows] + left_points[:, None] * direction
+    return accumulate(parent_keys, counts[rows])
@@ -5,15 +5,31 @@ from typing import Optional
 from comb_spec_searcher.strategies.strategy import StrategyDoesNotApply
 from comb_spec_searcher import Strategy
 from gridded_cayley_permutations import RowColMap, GriddedCayleyPerm
-from ..tracked_tiling import TrackedTiling
+from ..tracked_tiling import Clouds, TrackedTiling
+
+
+def num_cvs(indices_clouds: Clouds, value_clouds: Clouds, num_cols: int) -> int:
+    """Return the number of clouds counted by max_cvs, which is every value cloud
+    and every indices cloud not containing all the columns, since the number of
+    points on the tiling is tracked by "x"."""
+    return len(value_clouds) + sum(
+        1 for cloud in indices_clouds if len(cloud) != num_cols
+    )
 
 
 class ExtraParametersForStrategies(Strategy[TrackedTiling, GriddedCayleyPerm]):
     """Strategies inherit to implement extra_parameters function.
     Need to also implement map_for_clouds function on the strategy,
     which returns a tuple of RowColMaps for each child, mapping from the parent to the child.
+
+    If the active cells of each child are the images of the active cells of the
+    parent under maps_for_clouds, the strategy can set predictable_clouds, and the
+    clouds on the children are then found without constructing them, see
+    predicted_num_cvs.
     """
 
+    predictable_clouds = False
+
     def map_cloud(
         self,
         cloud: tuple[int, ...],
@@ -65,6 +81,47 @@ class ExtraParametersForStrategies(Strategy[TrackedTiling, GriddedCayleyPerm]):
                     dicts[idx][parent_param] = child_param
         return dicts
 
+    def added_clouds(
+        self, comb_class: TrackedTiling
+    ) -> tuple[tuple[Clouds, Clouds], ...]:
+        """Returns the indices and value clouds on each child which are not the
+        image of a cloud on the parent."""
+        return tuple(((), ()) for _ in self.maps_for_clouds(comb_class))
+
+    def predicted_num_cvs(self, comb_class: TrackedTiling) -> Optional[tuple[int, ...]]:
+        """Returns the number of clouds counted by max_cvs on each child, found
+        from the parent and maps_for_clouds, or None if predictable_clouds is not
+        set."""
+        if not self.predictable_clouds:
+            return None
+        active_cols, active_rows = comb_class.active_col_rows
+        result = []
+        for (col_map, row_map), (new_indices, new_values) in zip(
+            self.maps_for_clouds(comb_class), self.added_clouds(comb_class)
+        ):
+            child_active_cols = set(c for col in active_cols for c in col_map[col])
+            child_active_rows = set(r for row in active_rows for r in row_map[row])
+            # pylint: disable=protected-access
+            indices_clouds = TrackedTiling._normalise_clouds(
+                [
+                    sum((col_map[col] for col in cloud), ())
+                    for cloud in comb_class.indices_clouds
+                ]
+                + list(new_indices),
+                child_active_cols,
+            )
+            value_clouds = TrackedTiling._normalise_clouds(
+                [
+                    sum((row_map[row] for row in cloud), ())
+                    for cloud in comb_class.value_clouds
+                ]
+                + list(new_values),
+                child_active_rows,
+            )
+            num_cols = len(set(c for cols in col_map.values() for c in cols))
+            result.append(num_cvs(indices_clouds, value_clouds, num_cols))
+        return tuple(result)
+
     @abc.abstractmethod
     def maps_for_clouds(
         self, comb_class: TrackedTiling
@@ -23,6 +23,10 @@ class AbstractTrackedFusionStrategy(
 ):
     """Abstract fusion strategy for tracked tilings."""
 
+    # the rows or columns fused are the same, so the child has the cells of the
+    # parent with them merged
+    predictable_clouds = True
+
     def maps_for_clouds(self, comb_class: TrackedTiling):
         if self.fuse_rows:
             col_map = {x: (x,) for x in range(comb_class.dimensions[0])}
@@ -38,6 +42,11 @@ class AbstractTrackedFusionStrategy(
             }
         return ((col_map, row_map),)
 
+    def added_clouds(self, comb_class: TrackedTiling):
+        if self.fuse_rows:
+            return (((), ((self.index,),)),)
+        return ((((self.index,),), ()),)
+
     def sided_parameters(self, comb_class: TrackedTiling):
         """Determine which parameters are left-sided, right-sided, or both-sided."""
         left_sided_parameters = []
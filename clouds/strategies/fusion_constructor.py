@@ -38,10 +38,15 @@ from comb_spec_searcher.typing import (
     Terms,
 )
 from ..tracked_tiling import TrackedTiling as Tiling
+from .dense_terms import SMALL_TERMS, fuse_terms
 from gridded_cayley_permutations import GriddedCayleyPerm as GriddedPerm
 
 __all__ = ["FusionConstructor"]
 
+# The most (n, parameters) queries whose points in the fuse region are remembered
+# by each fusion constructor.
+FUSE_REGION_CACHE_SIZE = 1 << 12
+
 
 class FusionConstructor(Constructor[Tiling, GriddedPerm]):
     """
@@ -98,8 +103,6 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
         self.right_sided_parameters = frozenset(right_sided_parameters)
         self.both_sided_parameters = frozenset(both_sided_parameters)
 
-        self._init_checked()
-
         self.parent_fusion_parameters = self.reversed_extra_parameters[
             self.fuse_parameter
         ]
@@ -122,6 +125,21 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
         ]
         self.min_points = min_left, min_right
 
+        self._init_checked()
+
+        # the parameters which determine the points in the fuse region, and the
+        # (left, right) points for the values of them already queried
+        self.fuse_region_parameters = tuple(
+            sorted(
+                set(self.parent_fusion_parameters).union(
+                    *self.predeterminable_left_right_points
+                )
+            )
+        )
+        self.fuse_region_points: Dict[
+            Tuple[int, Tuple[int, ...]], Tuple[Tuple[int, int], ...]
+        ] = {}
+
         index_mapping = {
             child.extra_parameters.index(child_param): tuple(
                 map(parent.extra_parameters.index, parent_params)
@@ -139,11 +157,12 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
             if k in self.right_sided_parameters
         )
         self.fuse_parameter_index = child.extra_parameters.index(self.fuse_parameter)
-        child_pos_to_parent_pos = tuple(
+        self.child_pos_to_parent_pos = tuple(
             index_mapping[idx] for idx in range(len(child.extra_parameters))
         )
+        self.num_parent_params = len(parent.extra_parameters)
         self.children_param_map = self.build_param_map(
-            child_pos_to_parent_pos, len(parent.extra_parameters)
+            self.child_pos_to_parent_pos, self.num_parent_params
         )
 
     def _init_checked(self):
@@ -154,6 +173,10 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
         Moreover, if two parent assumptions map to the same assumption, then one
         of them is one sided, and the other covers both sides, OR they are all
         contained fully in fuse region. This is checked in the second assertion.
+
+        For each of the predeterminable_left_right_points, which of them is one
+        sided is also found here, rather than for every count, see
+        _one_and_both_sided.
         """
         assert all(len(val) <= 3 for val in self.reversed_extra_parameters.values())
         assert all(
@@ -175,6 +198,12 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
             for parent_vars in self.reversed_extra_parameters.values()
             if len(parent_vars) == 2
         )
+        # for each of the predeterminable_left_right_points, the (one sided, both
+        # sided) parameters and whether the one sided parameter is on the left
+        self.overlapping_parameters: List[Tuple[Optional[Tuple[str, str]], bool]] = [
+            self._one_and_both_sided(overlapping_parameters)
+            for overlapping_parameters in self.predeterminable_left_right_points
+        ]
 
     def get_equation(
         self, lhs_func: sympy.Function, rhs_funcs: Tuple[sympy.Function, ...]
@@ -255,8 +284,19 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
     ) -> Terms:
         """
         Uses the `subterms` functions to and the `children_param_maps` to compute
-        the terms of size `n`.
+        the terms of size `n`. Large terms are fused with arrays, see fuse_terms.
         """
+        child_terms = subterms[0](n)
+        if len(child_terms) >= SMALL_TERMS:
+            return fuse_terms(
+                child_terms,
+                self.child_pos_to_parent_pos,
+                self.num_parent_params,
+                self.fuse_parameter_index,
+                self.left_parameter_indices,
+                self.right_parameter_indices,
+                self.min_points,
+            )
         new_terms: Terms = Counter()
 
         min_left, min_right = self.min_points
@@ -271,7 +311,7 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
             ):
                 new_terms[tuple(params)] += value
 
-        for param, value in subterms[0](n).items():
+        for param, value in child_terms.items():
             fuse_region_points = param[self.fuse_parameter_index]
             new_params = list(self.children_param_map(param))
             for idx in self.left_parameter_indices:
@@ -327,6 +367,25 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
             - left: the parent region was only the left of the unfused region
             - right: the parent region was only the right of the unfused region
             - both: the parent region was all of the unfused region.
+
+        The points found depend only on n and the fuse_region_parameters, so they
+        are remembered for up to FUSE_REGION_CACHE_SIZE queries.
+        """
+        key = (n, tuple(parameters[k] for k in self.fuse_region_parameters))
+        points = self.fuse_region_points.get(key)
+        if points is None:
+            if len(self.fuse_region_points) >= FUSE_REGION_CACHE_SIZE:
+                self.fuse_region_points.clear()
+            points = tuple(self._points_in_fuse_region(n, **parameters))
+            self.fuse_region_points[key] = points
+        return iter(points)
+
+    def _points_in_fuse_region(
+        self, n: int, **parameters: int
+    ) -> Iterator[Tuple[int, int]]:
+        """
+        Yield the number of points on the left and right of the fuse region, see
+        determine_number_of_points_in_fuse_region.
         """
         (
             min_left_points,
@@ -344,7 +403,7 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
         ):
             return
 
-        for overlapping_parameters in self.predeterminable_left_right_points:
+        for overlapping_parameters in self.overlapping_parameters:
             (
                 new_left,
                 new_right,
@@ -442,8 +501,36 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
             max_both_points,
         )
 
+    def _one_and_both_sided(
+        self, overlapping_parameters: List[str]
+    ) -> Tuple[Optional[Tuple[str, str]], bool]:
+        """
+        Return the one sided and both sided parameters of the first two of the
+        overlapping parameters, and whether the one sided parameter is on the left,
+        or None if they are not one sided and one both sided.
+        """
+        p1 = overlapping_parameters[0]
+        p2 = overlapping_parameters[1]
+        p1_left = p1 in self.left_sided_parameters
+        p1_right = p1 in self.right_sided_parameters
+        p2_left = p2 in self.left_sided_parameters
+        p2_right = p2 in self.right_sided_parameters
+        if (p1_left and p2_right) or (p1_right and p2_left):
+            return None, False
+        if p1_left or p1_right:
+            if p2 not in self.both_sided_parameters:
+                return None, False
+            return (p1, p2), p1_left
+        if p2_left or p2_right:
+            if p1 not in self.both_sided_parameters:
+                return None, False
+            return (p2, p1), p2_left
+        return None, False
+
     def _determine_number_of_points_by_overlapping_parameter(
-        self, overlapping_parameters: List[str], **parameters: int
+        self,
+        overlapping_parameters: Tuple[Optional[Tuple[str, str]], bool],
+        **parameters: int,
     ) -> Tuple[Optional[int], Optional[int]]:
         """
         # Case 2:
@@ -462,27 +549,14 @@ class FusionConstructor(Constructor[Tiling, GriddedPerm]):
         - the number of points in the entire region is upper bounded by the number of
         points in B.
         """
-        p1 = overlapping_parameters[0]
-        p2 = overlapping_parameters[1]
-        p1_left = p1 in self.left_sided_parameters
-        p1_right = p1 in self.right_sided_parameters
-        p2_left = p2 in self.left_sided_parameters
-        p2_right = p2 in self.right_sided_parameters
-        # TODO: tidy up this function, and update doc string
-        assert not (p1_left and p2_right) and not (p1_right and p2_left)
-        if p1_left:
-            assert p2 in self.both_sided_parameters
-            return None, parameters[p2] - parameters[p1]
-        if p1_right:
-            assert p2 in self.both_sided_parameters
-            return parameters[p2] - parameters[p1], None
-        if p2_left:
-            assert p1 in self.both_sided_parameters
-            return None, parameters[p1] - parameters[p2]
-        if p2_right:
-            assert p1 in self.both_sided_parameters
-            return parameters[p1] - parameters[p2], None
-        raise ValueError("Overlapping parameters overlap same region")
+        one_and_both_sided, left = overlapping_parameters
+        if one_and_both_sided is None:
+            raise ValueError("Overlapping parameters overlap same region")
+        one_sided, both_sided = one_and_both_sided
+        points = parameters[both_sided] - parameters[one_sided]
+        if left:
+            return None, points
+        return points, None
 
     def update_subparams(
         self, number_of_left_points: int, number_of_right_points: int, **parameters: int
@@ -2,7 +2,7 @@
 
 from functools import cached_property
 from typing import Iterable, Optional
-from gridded_cayley_permutations import GriddedCayleyPerm
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
 from gridded_cayley_permutations.factors import Factors, ShuffleFactors
 from gridded_cayley_permutations.point_placements import PointPlacement
 from tilescope.strategies.row_column_separation import (
@@ -13,9 +13,25 @@ from .tracked_tiling import TrackedTiling
 
 Cell = tuple[int, int]
 
+# The most tilings whose factors are remembered by each of the tracked factor
+# classes.
+FACTORS_CACHE_SIZE = 1 << 12
+
 
 class TrackedFactors(Factors):
-    """Factors and tracks clouds"""
+    """
+    Factors and tracks clouds.
+
+    The factors of a tiling do not depend on its clouds, so they are remembered
+    for up to FACTORS_CACHE_SIZE tilings, and tracked tilings with the same tiling
+    only map their clouds onto them.
+    """
+
+    factors_cache: dict[Tiling, tuple[Tiling, ...]] = {}
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.factors_cache = {}
 
     def __init__(self, tracked_tiling: TrackedTiling) -> None:
         self.tracked_tiling = tracked_tiling
@@ -59,9 +75,19 @@ class TrackedFactors(Factors):
             for cloud in self.tracked_tiling.value_clouds
         )
 
+    def underlying_factors(self) -> tuple[Tiling, ...]:
+        """Return the factors of the tiling, see factors_cache."""
+        factors = self.factors_cache.get(self.tiling)
+        if factors is None:
+            if len(self.factors_cache) >= FACTORS_CACHE_SIZE:
+                self.factors_cache.clear()
+            factors = self.find_factors()
+            self.factors_cache[self.tiling] = factors
+        return factors
+
     def find_tracked_factors(self) -> Iterable[TrackedTiling]:
         """Return the factors of the tracked tiling."""
-        factors = self.find_factors()
+        factors = self.underlying_factors()
         # only one child where the row is positive needs a cloud for a point row
         for factor in factors:
             yield TrackedTiling(
@@ -4,22 +4,28 @@ A tracked searcher adapted from Tilings for use with GriddedCayleyPermutations.
 Original: https://github.com/PermutaTriangle/Tilings/blob/develop/tilings/tilescope.py
 """
 
+import time
 from typing import Iterable, Iterator, Optional, Union
 from collections import Counter, deque
 from logzero import logger  # type: ignore[import-untyped]
-from comb_spec_searcher import CombinatorialSpecificationSearcher
+from comb_spec_searcher import CombinatorialSpecification, StrategyFactory
 from comb_spec_searcher.typing import CSSstrategy, CombinatorialClassType, WorkPacket
 from comb_spec_searcher.strategies.rule import AbstractRule
+from comb_spec_searcher.strategies.strategy import AbstractStrategy
 from comb_spec_searcher.class_queue import DefaultQueue, CSSQueue
 import tabulate
 from cayley_permutations import CayleyPermutation
 from cayley_permutations.simplify_basis import string_to_basis
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
+from tilescope.checkpoint import CheckpointableSearcher
+from tilescope.parallel import ParallelSearcher, WorkerProfile
+from .queue_metrics import QueueMetrics
+from .strategies.extra_parameters import ExtraParametersForStrategies, num_cvs
 from .tracked_tilescope import TrackedTileScopePack
 from .tracked_tiling import TrackedTiling
 
 
-class TrackedSearcher(CombinatorialSpecificationSearcher):
+class TrackedSearcher(CheckpointableSearcher, ParallelSearcher):
     """
     A TileScope that will prioritise expanding tilings whose underlying tilings
     were found at earlier levels. It does this by keeping a queue for each level,
@@ -30,16 +36,34 @@ class TrackedSearcher(CombinatorialSpecificationSearcher):
     in this way for future change levels but if it is False (the default) the next
     level of queue i will be added to the curr level of queue i after the first
     change levels.
+
+    If workers is more than 1, the expansion strategies are applied in that many
+    worker processes, see ParallelSearcher, and the queues for the levels are
+    taken from in turn so the workers expand tilings from several levels at once.
+    A queue still only changes level after the queue before it has, see
+    TrackedQueue.
+
+    Searches can be checkpointed and resumed, see CheckpointableSearcher, and
+    profiled, see ProfiledSearcher. The queue keeps running counts for each level,
+    see QueueMetrics, and if auto_search is given a metrics path a snapshot of them
+    is appended to that file as a line of JSON every metrics_interval seconds and at
+    the end of the search.
     """
 
+    metrics_path: Optional[str] = None
+    metrics_interval: float = 60
+    last_metrics: float = 0
+
     def __init__(
         self,
         start_class: Union[str, Iterable[CayleyPermutation], TrackedTiling],
         strategy_pack: TrackedTileScopePack,
         max_cvs: Optional[int] = None,
         delay_next: bool = False,
+        workers: int = 1,
         **kwargs,
     ) -> None:
+        # pylint: disable=too-many-arguments, too-many-positional-arguments
         start_tiling = self._start_tiling(start_class)
         if start_tiling.dimensions == (1, 1):
             basis = [o.pattern for o in start_tiling.obstructions]
@@ -48,10 +72,15 @@ class TrackedSearcher(CombinatorialSpecificationSearcher):
             except NotImplementedError:
                 logger.warning("Could not add basis to strategy pack.")
         self.max_cvs = max_cvs
+        # the level of the label being expanded, for counting rejected rules
+        self.expanding_level = 0
         super().__init__(
             start_tiling,
             strategy_pack,
-            classqueue=TrackedQueue(strategy_pack, self, delay_next),
+            classqueue=TrackedQueue(
+                strategy_pack, self, delay_next, interleave_levels=workers > 1
+            ),
+            workers=workers,
             **kwargs,
         )
 
@@ -81,37 +110,170 @@ class TrackedSearcher(CombinatorialSpecificationSearcher):
             )
         return start_tiling
 
+    @property
+    def metrics(self) -> QueueMetrics:
+        """Return the running counts kept by the queue for each level."""
+        assert isinstance(self.classqueue, TrackedQueue)
+        return self.classqueue.metrics
+
+    def auto_search(
+        self,
+        *,
+        metrics: Optional[str] = None,
+        metrics_interval: float = 60,
+        **kwargs,
+    ) -> CombinatorialSpecification:
+        """
+        Run the auto search of CheckpointableSearcher. If metrics is a path, a
+        snapshot of the queue is appended to it periodically, at the end of an
+        expansion round, and when the search stops.
+        """
+        if metrics is not None:
+            self.metrics_path = metrics
+            self.metrics_interval = metrics_interval
+        self.last_metrics = time.time()
+        try:
+            return super().auto_search(**kwargs)
+        finally:
+            if self.metrics_path is not None:
+                self.write_metrics(self.metrics_path)
+
+    def _expand_classes_for(
+        self,
+        expansion_time: float,
+        status_update: Optional[int],
+        status_start: float,
+        auto_search_start: float,
+    ) -> tuple[bool, float]:
+        result = super()._expand_classes_for(
+            expansion_time, status_update, status_start, auto_search_start
+        )
+        if (
+            self.metrics_path is not None
+            and time.time() - self.last_metrics >= self.metrics_interval
+        ):
+            self.write_metrics(self.metrics_path)
+        return result
+
+    def write_metrics(self, path: str) -> None:
+        """Append a snapshot of the queue to the path as a line of JSON."""
+        assert isinstance(self.classqueue, TrackedQueue)
+        QueueMetrics.append_json(self.classqueue.snapshot(), path)
+        self.last_metrics = time.time()
+
+    def _expand(
+        self,
+        comb_class: CombinatorialClassType,
+        label: int,
+        strategies: tuple[CSSstrategy, ...],
+        inferral: bool,
+    ) -> None:
+        assert isinstance(self.classqueue, TrackedQueue)
+        self.expanding_level = self.classqueue.level_first_found(label)
+        start = time.perf_counter()
+        super()._expand(comb_class, label, strategies, inferral)
+        self.metrics.record_expansion(self.expanding_level, time.perf_counter() - start)
+
+    def record_worker_expansion(
+        self, label: int, profiles: list[WorkerProfile]
+    ) -> None:
+        assert isinstance(self.classqueue, TrackedQueue)
+        self.expanding_level = self.classqueue.level_first_found(label)
+        self.metrics.record_expansion(
+            self.expanding_level, sum(elapsed for _, elapsed, _, _ in profiles)
+        )
+
     def _rules_from_strategy(  # type: ignore
         self, comb_class: CombinatorialClassType, strategy: CSSstrategy
     ) -> Iterator[AbstractRule]:
         """
         Yield all the rules given by a strategy/strategy factory whose children all
-        satisfy the max_assumptions constraint.
+        satisfy the max_assumptions constraint. Strategies which can predict the
+        clouds on their children are skipped before the children are constructed.
         """
 
         # pylint: disable=arguments-differ
-        def num_cvs(child: TrackedTiling) -> int:
-            return len(child.value_clouds) + sum(
-                1
-                for cloud in child.indices_clouds
-                # if not the number of points on the tiling, so tracked by "x".
-                if len(cloud) != child.dimensions[0]
-            )
-
+        if isinstance(strategy, StrategyFactory):
+            strategy = MaxCvsFactory(strategy, self)
+        elif not self.predicted_within_max_cvs(comb_class, strategy):
+            self.metrics.record_rejected(self.expanding_level)
+            return
         for rule in super()._rules_from_strategy(comb_class, strategy):
-            if self.max_cvs is None or all(
-                num_cvs(child) <= self.max_cvs for child in rule.children
-            ):
+            if self.keep_worker_rule(rule):
                 yield rule
 
+    def predicted_within_max_cvs(
+        self, comb_class: CombinatorialClassType, strategy: CSSstrategy
+    ) -> bool:
+        """Return False if the strategy predicts a child of the class with more
+        clouds than max_cvs, see ExtraParametersForStrategies.predicted_num_cvs."""
+        if self.max_cvs is None or not isinstance(
+            strategy, ExtraParametersForStrategies
+        ):
+            return True
+        assert isinstance(comb_class, TrackedTiling)
+        predicted = strategy.predicted_num_cvs(comb_class)
+        return predicted is None or all(cvs <= self.max_cvs for cvs in predicted)
+
+    def keep_worker_rule(self, rule: AbstractRule) -> bool:
+        """Return True if every child of the rule satisfies the max_cvs constraint."""
+        if self.max_cvs is None or all(
+            num_cvs(child.indices_clouds, child.value_clouds, child.dimensions[0])
+            <= self.max_cvs
+            for child in rule.children
+        ):
+            return True
+        self.metrics.record_rejected(self.expanding_level)
+        return False
+
+
+class MaxCvsFactory(StrategyFactory[TrackedTiling]):
+    """
+    The strategies and rules of a factory, without the strategies predicted to
+    give a child with more clouds than the max_cvs of the searcher, see
+    TrackedSearcher.predicted_within_max_cvs. It has the name of the factory, so
+    the rules are profiled as the factory's.
+    """
+
+    def __init__(self, factory: StrategyFactory, searcher: TrackedSearcher):
+        self.factory = factory
+        self.searcher = searcher
+
+    def __call__(
+        self, comb_class: TrackedTiling
+    ) -> Iterator[Union[AbstractRule, AbstractStrategy]]:
+        for strategy in self.factory(comb_class):
+            if isinstance(
+                strategy, AbstractRule
+            ) or self.searcher.predicted_within_max_cvs(comb_class, strategy):
+                yield strategy
+            else:
+                self.searcher.metrics.record_rejected(self.searcher.expanding_level)
+
+    def __str__(self) -> str:
+        return str(self.factory)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.factory!r})"
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "MaxCvsFactory":
+        raise NotImplementedError("MaxCvsFactory is only used while expanding.")
+
 
 class TrackedDefaultQueue(DefaultQueue):
     """A deafult queue for tracked tilings."""
 
+    # pylint: disable=too-many-instance-attributes
+
     def __init__(self, pack: TrackedTileScopePack, delay_next: bool):
         super().__init__(pack)
         self.next_curr_level: Optional[tuple[deque[int], ...]] = None
         self.delay_next = delay_next
+        # if set, only change level after the previous queue has changed level
+        # more times, or is empty
+        self.previous: Optional["TrackedDefaultQueue"] = None
+        self.levels_changed = 0
 
     def is_empty(self) -> bool:
         """Return whether the queue is empty."""
@@ -134,6 +296,12 @@ class TrackedDefaultQueue(DefaultQueue):
         assert not self.working, "Can't change level is working is not empty"
         assert not any(self.curr_level), "Can't change level is curr_level is not empty"
         assert self.next_curr_level is not None, "not set the next curr queue"
+        if (
+            self.previous is not None
+            and self.previous.levels_changed <= self.levels_changed
+            and not self.previous.is_empty()
+        ):
+            raise StopIteration
         if any(self.next_curr_level):
             # this ensures we only change level when the next curr queue is empty
             # and therefore makes sure we never expand a label with the same strategy
@@ -149,25 +317,37 @@ class TrackedDefaultQueue(DefaultQueue):
             self.next_curr_level = self.curr_level
         if not any(self.curr_level):
             raise StopIteration
+        self.levels_changed += 1
 
 
 class TrackedQueue(CSSQueue):
-    """A queue for tracked tilings."""
+    """
+    A queue for tracked tilings.
+
+    If interleave_levels is True, the queues for the levels are taken from in turn
+    rather than always from the first which is not stuck, and a queue only changes
+    level after the queue before it has changed level more times, or is empty.
+    """
 
     # pylint: disable=too-many-instance-attributes
 
     def __init__(
-        self, pack: TrackedTileScopePack, tilescope: TrackedSearcher, delay_next: bool
+        self,
+        pack: TrackedTileScopePack,
+        tilescope: TrackedSearcher,
+        delay_next: bool,
+        interleave_levels: bool = False,
     ):
         """A queue of labels"""
         # pylint: disable=too-many-instance-attributes
         self.tilescope = tilescope
         self.pack = pack
         self.delay_next = delay_next
+        self.interleave_levels = interleave_levels
+        self.next_queue = 0
         self.label_to_underlying: dict[int, int] = {}
         self._level_first_found: dict[int, int] = {}
-        self._underlyng_labels_per_level: Counter[int] = Counter()
-        self._all_labels_per_level: Counter[int] = Counter()
+        self.metrics = QueueMetrics()
         self.inferral_expanded: set[int] = set()
         self.initial_expanded: set[int] = set()
         self.ignore: set[int] = set()
@@ -188,6 +368,8 @@ class TrackedQueue(CSSQueue):
         last_queue = self.queues[-1]
         new_queue = TrackedDefaultQueue(self.pack, self.delay_next)
         new_queue.set_tracked_queue(self)
+        if self.interleave_levels:
+            new_queue.previous = last_queue
         last_queue.set_next_curr_level(new_queue)
         self.queues.append(new_queue)
 
@@ -200,7 +382,7 @@ class TrackedQueue(CSSQueue):
             underlying_label = self.tilescope.classdb.get_label(underlying_tiling)
             self.label_to_underlying[label] = underlying_label
             # count the number of labels that will be added to this level
-            self._all_labels_per_level[self.level_first_found(underlying_label)] += 1
+            self.metrics.all_labels[self.level_first_found(underlying_label)] += 1
         return underlying_label
 
     def level_first_found(self, label: int) -> int:
@@ -211,7 +393,7 @@ class TrackedQueue(CSSQueue):
             level = len(self.queues) - 2
             self._level_first_found[underlying_label] = level
             # count the number of underlying labels added to this level
-            self._underlyng_labels_per_level[level] += 1
+            self.metrics.underlying_labels[level] += 1
         return level
 
     def add(self, label: int) -> None:
@@ -231,42 +413,54 @@ class TrackedQueue(CSSQueue):
     def do_level(self) -> Iterator[WorkPacket]:
         raise NotImplementedError
 
+    def snapshot(self) -> dict:
+        """Return the sizes of the queues and the metrics for each level as a
+        dictionary of JSON types."""
+        return {
+            "time": time.time() - self.metrics.start,
+            "levels_completed": self.levels_completed,
+            "levels": [
+                {
+                    "working": len(queue.working),
+                    "current": [len(labels) for labels in queue.curr_level[:-1]],
+                    "next": len(queue.next_level),
+                    "levels_changed": queue.levels_changed,
+                    **self.metrics.level_jsonable(level),
+                }
+                for level, queue in enumerate(self.queues)
+            ],
+        }
+
     def status(self) -> str:
+        snapshot = self.snapshot()
+        levels = snapshot["levels"][:-1]
         status = f"Queue status (currently on level {self.levels_completed}):\n"
         table: list[tuple[str, ...]] = []
-        working = ("working",) + tuple(
-            f"{len(queue.working):,d}" for queue in self.queues[:-1]
-        )
-        table.append(working)
+        table.append(("working",) + tuple(f"{lev['working']:,d}" for lev in levels))
         for idx in range(len(self.pack.expansion_strats)):
-            current = (f"current (set {idx + 1})",) + tuple(
-                f"{len(queue.curr_level[idx]):,d}" for queue in self.queues[:-1]
+            table.append(
+                (f"current (set {idx + 1})",)
+                + tuple(f"{lev['current'][idx]:,d}" for lev in levels)
             )
-            table.append(current)
-        nxt = ("next",) + tuple(
-            f"{len(queue.next_level):,d}" for queue in self.queues[:-1]
+        table.append(("next",) + tuple(f"{lev['next']:,d}" for lev in levels))
+        for name, key in (
+            ("underlying", "underlying_labels"),
+            ("all labels", "all_labels"),
+            ("rejected rules", "rejected_rules"),
+            ("expansions", "expansions"),
+        ):
+            table.append((name,) + tuple(f"{lev[key]:,d}" for lev in levels))
+        table.append(
+            ("time (s)",) + tuple(f"{lev['expansion_time']:,.1f}" for lev in levels)
         )
-        table.append(nxt)
-        status += "    "
-        headers = ("Size",) + tuple(
-            f"Queue {idx}" for idx in range(len(self.queues) - 1)
-        )
-        underlying = ("underlying",) + tuple(
-            str(self._underlyng_labels_per_level[level])
-            for level in range(len(self.queues))
-        )
-        table.append(underlying)
-        all_labels = ("all labels",) + tuple(
-            str(self._all_labels_per_level[level]) for level in range(len(self.queues))
-        )
-        table.append(all_labels)
-        table = [headers] + table
-        table = list(zip(*table))
-        headers = table[0]
-        table = table[1:]
+        table = [
+            ("Size",) + tuple(f"Queue {idx}" for idx in range(len(levels)))
+        ] + table
+        headers, *rows = list(zip(*table))
         colalign = ("left",) + tuple("right" for _ in headers[1:])
+        status += "    "
         status += (
-            tabulate.tabulate(table, headers=headers, colalign=colalign).replace(
+            tabulate.tabulate(rows, headers=headers, colalign=colalign).replace(
                 "\n", "\n    "
             )
             + "\n"
@@ -274,13 +468,24 @@ class TrackedQueue(CSSQueue):
         return status
 
     def __next__(self) -> WorkPacket:
+        if self.interleave_levels:
+            # carry on from the queue after the last one taken from
+            for idx in range(self.next_queue, len(self.queues) - 1):
+                try:
+                    packet = next(self.queues[idx])
+                except StopIteration:
+                    continue
+                self.next_queue = idx + 1
+                return packet
         for idx, queue in enumerate(self.queues):
             if idx == len(self.queues) - 1:
                 if all(queue.is_empty() for queue in self.queues):
                     raise StopIteration
                 self.add_new_queue()
             try:
-                return next(queue)
+                packet = next(queue)
             except StopIteration:
                 continue
+            self.next_queue = idx + 1
+            return packet
         raise StopIteration("No elements in queue")
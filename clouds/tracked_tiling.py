@@ -3,13 +3,23 @@ for indices and values."""
 
 from functools import cached_property
 from typing import Iterable, Optional, Iterator, Dict
-from itertools import product
+import numpy as np
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
 from gridded_cayley_permutations.row_col_map import RowColMap
+from .parameter_bounds import ParameterBounds
 
 Cell = tuple[int, int]
 Clouds = tuple[tuple[int, ...], ...]
 
+# The cached properties of a tiling which only depend on its obstructions,
+# requirements and dimensions, so can be shared with tracked tilings of it.
+SHARED_PROPERTIES = tuple(
+    name
+    for cls in Tiling.__mro__
+    for name, value in vars(cls).items()
+    if isinstance(value, cached_property)
+) + ("active_col_rows",)
+
 
 class TrackedTiling(Tiling):
     """A Tiling with clouds which keep track of areas of the tiling.
@@ -29,45 +39,62 @@ class TrackedTiling(Tiling):
         # pylint:disable=too-many-arguments
         # pylint:disable=too-many-positional-arguments
         self.tiling = tiling
-        super().__init__(
-            tiling.obstructions, tiling.requirements, tiling.dimensions, simplify
-        )
-        self.value_clouds = tuple(
-            sorted(set(tuple(sorted(set(c))) for c in value_clouds))
-        )
-        self.indices_clouds = tuple(
-            sorted(set(tuple(sorted(set(c))) for c in indices_clouds))
-        )
-        if intersect_clouds_with_active:
-            active_cols, active_rows = self.active_col_rows
-            self.value_clouds = tuple(
-                sorted(
-                    set(
-                        c
-                        for c in [
-                            tuple(
-                                sorted(set(row for row in cloud if row in active_rows))
-                            )
-                            for cloud in value_clouds
-                        ]
-                        if c
-                    )
-                )
+        if simplify:
+            super().__init__(
+                tiling.obstructions, tiling.requirements, tiling.dimensions, simplify
             )
-            self.indices_clouds = tuple(
-                sorted(
-                    set(
-                        c
-                        for c in [
-                            tuple(
-                                sorted(set(col for col in cloud if col in active_cols))
-                            )
-                            for cloud in indices_clouds
-                        ]
-                        if c
+        else:
+            self._share_tiling(tiling)
+        active_cols, active_rows = (
+            self.active_col_rows if intersect_clouds_with_active else (None, None)
+        )
+        self.value_clouds = self._normalise_clouds(value_clouds, active_rows)
+        self.indices_clouds = self._normalise_clouds(indices_clouds, active_cols)
+
+    def _share_tiling(self, tiling: Tiling) -> None:
+        """Use the obstructions, requirements and dimensions of the tiling, which
+        are already sorted, and the properties it has already cached, instead of
+        creating them again."""
+        self.obstructions = tiling.obstructions
+        self.requirements = tiling.requirements
+        self.dimensions = tiling.dimensions
+        for name in SHARED_PROPERTIES:
+            if name in tiling.__dict__:
+                self.__dict__[name] = tiling.__dict__[name]
+
+    @staticmethod
+    def _normalise_clouds(
+        clouds: Iterable[Iterable[int]], active: Optional[set[int]]
+    ) -> Clouds:
+        """Sort the clouds and the rows or columns in each of them. If active is
+        given, intersect the clouds with it and drop those left empty."""
+        if active is None:
+            return tuple(sorted(set(tuple(sorted(set(c))) for c in clouds)))
+        return tuple(
+            sorted(
+                set(
+                    c
+                    for c in (
+                        tuple(sorted(set(x for x in cloud if x in active)))
+                        for cloud in clouds
                     )
+                    if c
                 )
             )
+        )
+
+    def _with_clouds(
+        self, indices_clouds: Clouds, value_clouds: Clouds
+    ) -> "TrackedTiling":
+        """Returns the tracked tiling with the same tiling and the given clouds,
+        which must already be normalised."""
+        tracked_tiling = TrackedTiling.__new__(TrackedTiling)
+        tracked_tiling.tiling = self.tiling
+        # pylint: disable=protected-access
+        tracked_tiling._share_tiling(self)
+        tracked_tiling.indices_clouds = indices_clouds
+        tracked_tiling.value_clouds = value_clouds
+        return tracked_tiling
 
     def remove_clouds(self) -> "TrackedTiling":
         """Remove all clouds from the tracked tiling."""
@@ -78,22 +105,14 @@ class TrackedTiling(Tiling):
         new_idx_clouds = tuple(
             cloud for cloud in self.indices_clouds if cloud != idx_cloud
         )
-        return TrackedTiling(
-            self.tiling,
-            indices_clouds=new_idx_clouds,
-            value_clouds=self.value_clouds,
-        )
+        return self._with_clouds(new_idx_clouds, self.value_clouds)
 
     def remove_val_cloud(self, val_cloud: tuple[int, ...]) -> "TrackedTiling":
         """Remove a value cloud from the tracked tiling."""
         new_val_clouds = tuple(
             cloud for cloud in self.value_clouds if cloud != val_cloud
         )
-        return TrackedTiling(
-            self.tiling,
-            indices_clouds=self.indices_clouds,
-            value_clouds=new_val_clouds,
-        )
+        return self._with_clouds(self.indices_clouds, new_val_clouds)
 
     def add_clouds(
         self,
@@ -228,6 +247,8 @@ class TrackedTiling(Tiling):
 
         can't fuse rows/cols if a cloud maps onto only part of the rows/cols to be fused,
         must map to all or none of it."""
+        if not self.fusability_check(fuse_rows, index).is_fusable():
+            return False
         if fuse_rows:
             test_tiling = self.delete_rows_and_columns(cols=[], rows=[index])
         else:
@@ -290,10 +311,14 @@ class TrackedTiling(Tiling):
             raise ValueError("Cloud not found in tracked tiling.") from exc
         return f"v_{index}" if row else f"i_{index}"
 
+    @cached_property
+    def parameter_bounds(self) -> ParameterBounds:
+        """Returns the bounds on the parameters found from the minimal gridded
+        Cayley permutations of the tiling."""
+        return ParameterBounds(self)
+
     def get_minimum_value(self, parameter: str) -> int:
-        return min(
-            self.get_value(gcp, parameter) for gcp in self.minimal_gridded_cperms()
-        )
+        return self.parameter_bounds.minimums[self.extra_parameters.index(parameter)]
 
     def get_value(self, gcp: GriddedCayleyPerm, parameter: str) -> int:
         """Returns the value of the parameter on the given gridded Cayley permutation."""
@@ -321,14 +346,55 @@ class TrackedTiling(Tiling):
             return self.indices_clouds[int(y)]
         raise ValueError(f"Not a valid parameter: {parameter}")
 
+    @cached_property
+    def cloud_incidence(
+        self,
+    ) -> tuple[dict[int, tuple[int, ...]], dict[int, tuple[int, ...]]]:
+        """Returns a dictionary from each column to the positions in
+        extra_parameters of the indices clouds containing it, and a dictionary from
+        each row to the positions of the value clouds containing it."""
+        col_params: dict[int, list[int]] = {}
+        for idx, cloud in enumerate(self.indices_clouds):
+            for col in cloud:
+                col_params.setdefault(col, []).append(idx)
+        row_params: dict[int, list[int]] = {}
+        for idx, cloud in enumerate(self.value_clouds, len(self.indices_clouds)):
+            for row in cloud:
+                row_params.setdefault(row, []).append(idx)
+        return (
+            {col: tuple(params) for col, params in col_params.items()},
+            {row: tuple(params) for row, params in row_params.items()},
+        )
+
     def get_parameters(self, obj: GriddedCayleyPerm) -> tuple[int, ...]:
-        return tuple(self.get_value(obj, param) for param in self.extra_parameters)
+        """Returns the values of the parameters on the gridded Cayley permutation,
+        found in one pass over its points."""
+        col_params, row_params = self.cloud_incidence
+        params = [0] * (len(self.indices_clouds) + len(self.value_clouds))
+        values: dict[int, set[int]] = {}
+        for value, (col, row) in zip(obj.pattern, obj.positions):
+            for idx in col_params.get(col, ()):
+                params[idx] += 1
+            for idx in row_params.get(row, ()):
+                values.setdefault(idx, set()).add(value)
+        for idx, cloud_values in values.items():
+            params[idx] = len(cloud_values)
+        return tuple(params)
+
+    def get_parameters_array(self, objs: Iterable[GriddedCayleyPerm]) -> np.ndarray:
+        """Returns an integer array with a row for each gridded Cayley
+        permutation, holding the values of the parameters on it."""
+        rows = [self.get_parameters(obj) for obj in objs]
+        return np.array(rows, dtype=np.int64).reshape(
+            len(rows), len(self.indices_clouds) + len(self.value_clouds)
+        )
 
     def possible_parameters(self, n: int) -> Iterator[Dict[str, int]]:
-        parameters = [
-            self.find_parameter(cloud, False) for cloud in self.indices_clouds
-        ] + [self.find_parameter(cloud, True) for cloud in self.value_clouds]
-        for values in product(*[range(n + 1) for _ in parameters]):
+        """Yields the values of the parameters which gridded Cayley permutations
+        of size n on the tiling could have, skipping those ruled out by the
+        parameter bounds."""
+        parameters = self.extra_parameters
+        for values in self.parameter_bounds.feasible(n):
             yield dict(zip(parameters, values))
 
     def __eq__(self, other):
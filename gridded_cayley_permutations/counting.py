@@ -0,0 +1,296 @@
+"""
+This module contains the GriddedCayleyPermCounter class, which counts the gridded
+Cayley permutations on a tiling without generating them.
+
+The gridded Cayley permutations are built left to right in the same way as
+Tiling._gridded_cayley_permutations, but rather than keeping every gridded
+Cayley permutation we only keep a state which determines its future:
+    - the column of the last point,
+    - the number of distinct values in each row,
+    - the partial occurrences of obstructions (and requirements not yet
+      contained) which could still be completed by points to the right.
+Gridded Cayley permutations with the same state have the same number of
+extensions of each size, so we count states with multiplicity.
+
+A partial occurrence (idx, k, values) is an occurrence of the first k points of
+the idx-th pattern using points with the given values. If every completion of
+one partial occurrence also completes another with the same idx and k, then we
+only need to keep the latter.
+"""
+
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import TYPE_CHECKING, Iterator, Optional
+
+if TYPE_CHECKING:
+    # pylint: disable=all
+    from gridded_cayley_permutations import GriddedCayleyPerm
+
+Cell = tuple[int, int]
+Gcptuple = tuple["GriddedCayleyPerm", ...]
+Requirements = tuple[Gcptuple, ...]
+PartialOccurrence = tuple[int, int, tuple[int, ...]]
+Partials = frozenset[PartialOccurrence]
+State = tuple[int, tuple[int, ...], Partials, tuple[Optional[Partials], ...]]
+Insertion = tuple[Cell, int, bool]
+# The region a future point of a pattern can take relative to the values of a
+# partial occurrence, either (True, index of equal value, -1) or
+# (False, index of floor value, index of ceiling value), with -1 if none.
+Region = tuple[bool, int, int]
+
+
+class GriddedCayleyPermCounter:
+    """
+    Counts the gridded Cayley permutations of each size which avoid the
+    obstructions and contain the requirements.
+    """
+
+    def __init__(
+        self,
+        obstructions: Gcptuple,
+        requirements: Requirements,
+        dimensions: tuple[int, int],
+    ) -> None:
+        self.obstructions = obstructions
+        self.requirements = requirements
+        self.dimensions = dimensions
+        self.patterns: Gcptuple = tuple(obstructions) + tuple(
+            gcp for req_list in requirements for gcp in req_list
+        )
+        self.requirement_list_of: dict[int, int] = {}
+        idx = len(obstructions)
+        for list_idx, req_list in enumerate(requirements):
+            for _ in req_list:
+                self.requirement_list_of[idx] = list_idx
+                idx += 1
+        self.starting_in_cell: dict[Cell, list[int]] = defaultdict(list)
+        for idx, patt in enumerate(self.patterns):
+            if len(patt) > 0:
+                self.starting_in_cell[patt.positions[0]].append(idx)
+        self.last_start_column = tuple(
+            max((req.positions[0][0] for req in req_list if len(req) > 0), default=-1)
+            for req_list in requirements
+        )
+        self.empty_cells = set(
+            ob.positions[0] for ob in self.obstructions if len(ob) == 1
+        )
+        self.regions = tuple(
+            tuple(self._regions(patt, k) for k in range(len(patt)))
+            for patt in self.patterns
+        )
+        self.terms: list[int] = []
+        self.states: Counter[State] = Counter()
+
+    @staticmethod
+    def _regions(patt: "GriddedCayleyPerm", k: int) -> tuple[Region, ...]:
+        """Return the regions the points after the first k points of the pattern
+        can lie in, relative to the first k points."""
+        regions = []
+        for val in patt.pattern[k:]:
+            equal, floor, ceiling = -1, -1, -1
+            for idx, other in enumerate(patt.pattern[:k]):
+                if other == val:
+                    equal = idx
+                elif other < val and (floor == -1 or other > patt.pattern[floor]):
+                    floor = idx
+                elif other > val and (ceiling == -1 or other < patt.pattern[ceiling]):
+                    ceiling = idx
+            if equal != -1:
+                regions.append((True, equal, -1))
+            else:
+                regions.append((False, floor, ceiling))
+        return tuple(regions)
+
+    def initial_state(self) -> Optional[State]:
+        """Return the state of the empty gridded Cayley permutation, or None
+        if it contains an obstruction."""
+        if any(len(ob) == 0 for ob in self.obstructions):
+            return None
+        req_partials: tuple[Optional[Partials], ...] = tuple(
+            None if any(len(req) == 0 for req in req_list) else frozenset()
+            for req_list in self.requirements
+        )
+        return (
+            -1,
+            tuple(0 for _ in range(self.dimensions[1])),
+            frozenset(),
+            req_partials,
+        )
+
+    def count(self, size: int) -> int:
+        """Return the number of gridded Cayley permutations of the given size."""
+        while len(self.terms) <= size:
+            self._next_level()
+        return self.terms[size]
+
+    def counts(self, size: int) -> list[int]:
+        """Return the number of gridded Cayley permutations of each size up to size."""
+        self.count(size)
+        return self.terms[: size + 1]
+
+    def _next_level(self) -> None:
+        """Compute the states for the next size and record its count."""
+        if not self.terms:
+            initial = self.initial_state()
+            if initial is not None:
+                self.states[initial] = 1
+        else:
+            next_states: Counter[State] = Counter()
+            for state, multiplicity in self.states.items():
+                for next_state in self.next_states(state):
+                    next_states[next_state] += multiplicity
+            self.states = next_states
+        self.terms.append(
+            sum(
+                multiplicity
+                for state, multiplicity in self.states.items()
+                if self.satisfies_requirements(state)
+            )
+        )
+
+    @staticmethod
+    def satisfies_requirements(state: State) -> bool:
+        """Return True if the gridded Cayley permutations with the state contain
+        the requirements."""
+        return all(partials is None for partials in state[3])
+
+    def next_states(self, state: State) -> Iterator[State]:
+        """Yield the states after inserting a point to the right of the gridded
+        Cayley permutation, once for each gridded Cayley permutation."""
+        for _, next_state in self.insertions(state):
+            yield next_state
+
+    def insertions(self, state: State) -> Iterator[tuple[Insertion, State]]:
+        """Yield the insertions (cell, value, new_value) of a point to the right
+        of the gridded Cayley permutation which avoid the obstructions, together
+        with the state after the insertion. If new_value, the point is inserted
+        with GriddedCayleyPerm.insertion_different_value, otherwise with
+        GriddedCayleyPerm.insertion_same_value."""
+        last_col, row_counts, _, _ = state
+        for col in range(max(last_col, 0), self.dimensions[0]):
+            base = 0
+            for row, row_count in enumerate(row_counts):
+                cell = (col, row)
+                if cell not in self.empty_cells:
+                    for value in range(base, base + row_count + 1):
+                        next_state = self._insert(state, cell, value, True)
+                        if next_state is not None:
+                            yield (cell, value, True), next_state
+                    for value in range(base, base + row_count):
+                        next_state = self._insert(state, cell, value, False)
+                        if next_state is not None:
+                            yield (cell, value, False), next_state
+                base += row_count
+
+    def _insert(
+        self, state: State, cell: Cell, value: int, new_value: bool
+    ) -> Optional[State]:
+        """Return the state after inserting a point with the given value into
+        the cell. If new_value, then values at least value are shifted up.
+        Returns None if an obstruction is completed or a requirement list can
+        no longer be contained."""
+        _, row_counts, ob_partials, req_partials = state
+        col, row = cell
+        if new_value:
+            row_counts = (
+                row_counts[:row] + (row_counts[row] + 1,) + row_counts[row + 1 :]
+            )
+        extended = self._extend(ob_partials, cell, value, new_value)
+        if extended is None:
+            return None
+        new_req_partials = tuple(
+            (
+                None
+                if partials is None
+                else self._extend(partials, cell, value, new_value, list_idx)
+            )
+            for list_idx, partials in enumerate(req_partials)
+        )
+        if any(
+            partials is not None
+            and not partials
+            and self.last_start_column[list_idx] < col
+            for list_idx, partials in enumerate(new_req_partials)
+        ):
+            return None
+        return (col, row_counts, extended, new_req_partials)
+
+    def _extend(
+        self,
+        partials: Partials,
+        cell: Cell,
+        value: int,
+        new_value: bool,
+        list_idx: int = -1,
+    ) -> Optional[Partials]:
+        """Return the partial occurrences after inserting the point. If
+        list_idx is -1 these are obstructions and None is returned if one is
+        completed, otherwise None is returned if the requirement list is
+        contained."""
+        col = cell[0]
+        result: set[PartialOccurrence] = set()
+        for idx in self.starting_in_cell.get(cell, ()):
+            if self.requirement_list_of.get(idx, -1) != list_idx:
+                continue
+            if len(self.patterns[idx]) == 1:
+                return None
+            result.add((idx, 1, (value,)))
+        for idx, k, values in partials:
+            patt = self.patterns[idx]
+            if new_value:
+                values = tuple(val + 1 if val >= value else val for val in values)
+            if patt.positions[k][0] < col:
+                continue
+            result.add((idx, k, values))
+            if patt.positions[k] == cell and self._consistent(patt, k, values, value):
+                if k + 1 == len(patt):
+                    return None
+                result.add((idx, k + 1, values + (value,)))
+        return self._remove_dominated(result)
+
+    @staticmethod
+    def _consistent(
+        patt: "GriddedCayleyPerm", k: int, values: tuple[int, ...], value: int
+    ) -> bool:
+        """Return True if value can be the (k + 1)-th point of an occurrence of
+        patt whose first k points have the given values."""
+        patt_val = patt.pattern[k]
+        for other_patt_val, other in zip(patt.pattern, values):
+            if (patt_val < other_patt_val) != (value < other) or (
+                patt_val > other_patt_val
+            ) != (value > other):
+                return False
+        return True
+
+    def _remove_dominated(self, partials: set[PartialOccurrence]) -> Partials:
+        """Remove the partial occurrences for which every completion is also
+        a completion of another partial occurrence."""
+        groups: dict[tuple[int, int], list[tuple[int, ...]]] = defaultdict(list)
+        for idx, k, values in partials:
+            groups[(idx, k)].append(values)
+        for (idx, k), group in groups.items():
+            if len(group) == 1:
+                continue
+            regions = self.regions[idx][k]
+            for values, other in combinations(group, 2):
+                if self._dominates(regions, values, other):
+                    partials.discard((idx, k, other))
+                elif self._dominates(regions, other, values):
+                    partials.discard((idx, k, values))
+        return frozenset(partials)
+
+    @staticmethod
+    def _dominates(
+        regions: tuple[Region, ...], values: tuple[int, ...], other: tuple[int, ...]
+    ) -> bool:
+        """Return True if each region for other is contained in the region for values."""
+        for equal, floor, ceiling in regions:
+            if equal:
+                if values[floor] != other[floor]:
+                    return False
+                continue
+            if floor != -1 and values[floor] > other[floor]:
+                return False
+            if ceiling != -1 and values[ceiling] < other[ceiling]:
+                return False
+        return True
@@ -0,0 +1,90 @@
+"""
+This module contains the FusabilityCheck class, which is a cheap test for
+whether two adjacent rows or columns of a tiling can be fused.
+
+Fusing rows (or columns) index and index + 1 collapses them into a single
+row. The tiling is fusable exactly when every obstruction is accompanied by
+all the other ways of splitting its points in the fused row between the two
+rows, and likewise within each requirement list. Rather than building the
+fused and unfused tilings, we map every gridded Cayley permutation onto the
+fused tiling and count how many of its preimages are present.
+"""
+
+from collections import Counter
+from typing import Iterable
+
+from .gridded_cayley_perms import GriddedCayleyPerm
+
+Cell = tuple[int, int]
+Signature = tuple[tuple[int, ...], tuple[Cell, ...]]
+
+
+class FusabilityCheck:
+    """
+    Checks whether rows (if fuse_rows) or columns index and index + 1 can be fused.
+
+    The check is a necessary condition for Tiling.is_fusable. For the
+    obstructions it is also sufficient, so the full construction is only
+    needed to confirm the requirements line up.
+    """
+
+    def __init__(
+        self,
+        obstructions: Iterable[GriddedCayleyPerm],
+        requirements: Iterable[Iterable[GriddedCayleyPerm]],
+        fuse_rows: bool,
+        index: int,
+    ) -> None:
+        self.obstructions = obstructions
+        self.requirements = requirements
+        self.fuse_rows = fuse_rows
+        self.index = index
+
+    def signature(self, gcp: GriddedCayleyPerm) -> tuple[Signature, int]:
+        """
+        Returns the image of the gridded Cayley permutation on the fused tiling
+        together with the number of preimages that image has.
+
+        A row with k distinct values can be split between two rows in k + 1 ways,
+        and a column with k points can be split between two columns in k + 1 ways.
+        """
+        index = self.index
+        fused = (index, index + 1)
+        if self.fuse_rows:
+            positions = tuple((x, y if y <= index else y - 1) for x, y in gcp.positions)
+            number_of_points = len(
+                set(
+                    val for val, (_, y) in zip(gcp.pattern, gcp.positions) if y in fused
+                )
+            )
+        else:
+            positions = tuple((x if x <= index else x - 1, y) for x, y in gcp.positions)
+            number_of_points = sum(1 for x, _ in gcp.positions if x in fused)
+        return (tuple(gcp.pattern), positions), number_of_points + 1
+
+    def closed_under_preimages(self, gcps: Iterable[GriddedCayleyPerm]) -> bool:
+        """
+        Return True if for every gridded Cayley permutation in gcps, all of the
+        ways of splitting it between the two rows or columns are also in gcps.
+        """
+        seen: Counter[Signature] = Counter()
+        number_of_preimages: dict[Signature, int] = {}
+        for gcp in set(gcps):
+            image, preimages = self.signature(gcp)
+            seen[image] += 1
+            number_of_preimages[image] = preimages
+        return all(count == number_of_preimages[image] for image, count in seen.items())
+
+    def obstructions_fusable(self) -> bool:
+        """Return True if the obstructions allow the fusion."""
+        return self.closed_under_preimages(self.obstructions)
+
+    def requirements_fusable(self) -> bool:
+        """Return True if each requirement list allows the fusion."""
+        return all(
+            self.closed_under_preimages(req_list) for req_list in self.requirements
+        )
+
+    def is_fusable(self) -> bool:
+        """Return True if the obstructions and requirements allow the fusion."""
+        return self.obstructions_fusable() and self.requirements_fusable()
@@ -344,6 +344,31 @@ class GriddedCayleyPerm(CombinatorialObject):
             (pos for pos in self.positions if pos in cells),
         )
 
+    def reverse(self, dimensions: tuple[int, int]) -> "GriddedCayleyPerm":
+        """Returns the reverse of the gridded Cayley permutation on a tiling with
+        the given dimensions, so the columns are reversed too."""
+        if not self:
+            return self
+        return GriddedCayleyPerm(
+            self.pattern.reverse(),
+            ((dimensions[0] - 1 - col, row) for col, row in reversed(self.positions)),
+        )
+
+    def complement(self, dimensions: tuple[int, int]) -> "GriddedCayleyPerm":
+        """Returns the complement of the gridded Cayley permutation on a tiling
+        with the given dimensions, so the rows are reversed too."""
+        if not self:
+            return self
+        return GriddedCayleyPerm(
+            self.pattern.complement(),
+            ((col, dimensions[1] - 1 - row) for col, row in self.positions),
+        )
+
+    def reverse_complement(self, dimensions: tuple[int, int]) -> "GriddedCayleyPerm":
+        """Returns the reverse complement of the gridded Cayley permutation on a
+        tiling with the given dimensions."""
+        return self.reverse(dimensions).complement(dimensions)
+
     def to_jsonable(self) -> dict:
         """Returns a jsonable dictionary of the gridded Cayley permutation."""
         return {"pattern": self.pattern.to_jsonable(), "positions": self.positions}
@@ -46,16 +46,14 @@ class ObstructionTransitivity:
                 else:
                     # b == d
                     if ob.pattern[0] == 0:
-                        if (
+                        if self.tiling.has_obstruction(
                             GriddedCayleyPerm(CayleyPermutation((0, 0)), ob.positions)
-                            in self.tiling.obstructions
                         ):
                             row_less_than[b].add((c, a))
                         row_less_than_or_equal[b].add((c, a))
                     else:
-                        if (
+                        if self.tiling.has_obstruction(
                             GriddedCayleyPerm(CayleyPermutation((0, 0)), ob.positions)
-                            in self.tiling.obstructions
                         ):
                             row_less_than[b].add((a, c))
                         row_less_than_or_equal[b].add((a, c))
@@ -0,0 +1,78 @@
+"""
+This module contains the GriddedCayleyPermSampler class, which draws gridded
+Cayley permutations on a tiling uniformly at random without generating them all.
+
+The gridded Cayley permutations of size n on a tiling are the leaves at depth n
+of the insertion tree used by Tiling._gridded_cayley_permutations. Using the
+states of a GriddedCayleyPermCounter, we count the number of leaves below each
+node and descend the tree choosing each child with probability proportional to
+its number of leaves. The number of leaves below a state is cached, so drawing
+further samples of the same size is cheap.
+"""
+
+from random import Random
+from typing import TYPE_CHECKING, Optional
+
+from cayley_permutations import CayleyPermutation
+
+from .gridded_cayley_perms import GriddedCayleyPerm
+
+if TYPE_CHECKING:
+    # pylint: disable=all
+    from .counting import GriddedCayleyPermCounter, State
+
+
+class GriddedCayleyPermSampler:
+    """
+    Samples gridded Cayley permutations of a given size uniformly at random
+    from those counted by the counter.
+    """
+
+    def __init__(
+        self, counter: "GriddedCayleyPermCounter", rng: Optional[Random] = None
+    ) -> None:
+        self.counter = counter
+        self.rng = Random() if rng is None else rng
+        self.cache: dict[tuple["State", int], int] = {}
+
+    def completions(self, state: "State", size: int) -> int:
+        """Return the number of ways of inserting size more points into a
+        gridded Cayley permutation with the state so that it is on the tiling."""
+        if size == 0:
+            return int(self.counter.satisfies_requirements(state))
+        key = (state, size)
+        if key not in self.cache:
+            self.cache[key] = sum(
+                self.completions(next_state, size - 1)
+                for _, next_state in self.counter.insertions(state)
+            )
+        return self.cache[key]
+
+    def count(self, size: int) -> int:
+        """Return the number of gridded Cayley permutations of the given size."""
+        state = self.counter.initial_state()
+        if state is None:
+            return 0
+        return self.completions(state, size)
+
+    def sample(self, size: int, rng: Optional[Random] = None) -> GriddedCayleyPerm:
+        """Return a gridded Cayley permutation of the given size on the tiling,
+        chosen uniformly at random using rng (or the sampler's own generator)."""
+        rng = self.rng if rng is None else rng
+        state = self.counter.initial_state()
+        if state is None or self.completions(state, size) == 0:
+            raise ValueError(f"No gridded Cayley permutations of size {size}.")
+        gcp = GriddedCayleyPerm(CayleyPermutation([]), [])
+        for remaining in range(size, 0, -1):
+            choice = rng.randrange(self.completions(state, remaining))
+            for (cell, value, new_value), next_state in self.counter.insertions(state):
+                choice -= self.completions(next_state, remaining - 1)
+                if choice < 0:
+                    break
+            # pylint: disable=undefined-loop-variable
+            if new_value:
+                gcp = gcp.insertion_different_value(value, cell)
+            else:
+                gcp = gcp.insertion_same_value(value, cell)
+            state = next_state
+        return gcp
@@ -0,0 +1,142 @@
+"""
+This module contains the TilingIndex class, which holds the lookup tables that
+the Tiling accessors (point_cells, cells_in_row, obs_by_col_and_row, ...) read
+from.
+
+The index is built once, the first time it is needed, from the obstructions
+and requirements of the tiling. A tiling does not change after it is created, so
+the index is never updated; it only contains frozensets and tuples and should
+not be mutated.
+"""
+
+from collections import defaultdict
+from itertools import chain, product
+from typing import TYPE_CHECKING, Iterable
+
+from cayley_permutations import CayleyPermutation
+
+if TYPE_CHECKING:
+    # pylint: disable=all
+    from gridded_cayley_permutations import GriddedCayleyPerm
+
+Cell = tuple[int, int]
+Gcptuple = tuple["GriddedCayleyPerm", ...]
+
+INCREASING = CayleyPermutation((0, 1))
+DECREASING = CayleyPermutation((1, 0))
+CONSTANT = CayleyPermutation((0, 0))
+
+
+class TilingIndex:
+    """
+    Per-cell, per-row and per-column lookup tables for the obstructions and
+    requirements of a tiling.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        obstructions: Gcptuple,
+        requirements: Iterable[Gcptuple],
+        dimensions: tuple[int, int],
+    ) -> None:
+        requirements = tuple(requirements)
+        self.obstruction_set = frozenset(obstructions)
+        all_cells = frozenset(product(range(dimensions[0]), range(dimensions[1])))
+
+        local_bases: dict[Cell, list[CayleyPermutation]] = defaultdict(list)
+        obs_by_cell: dict[Cell, set["GriddedCayleyPerm"]] = defaultdict(set)
+        obs_by_col: dict[int, set["GriddedCayleyPerm"]] = defaultdict(set)
+        obs_by_row: dict[int, set["GriddedCayleyPerm"]] = defaultdict(set)
+        row_pair_counts: dict[int, int] = defaultdict(int)
+        for ob in obstructions:
+            cells = set(ob.positions)
+            if len(cells) == 1:
+                local_bases[ob.positions[0]].append(ob.pattern)
+            if ob.pattern in (INCREASING, DECREASING):
+                if ob.positions[0][1] == ob.positions[1][1]:
+                    row_pair_counts[ob.positions[0][1]] += 1
+            for cell in cells:
+                obs_by_cell[cell].add(ob)
+                obs_by_col[cell[0]].add(ob)
+                obs_by_row[cell[1]].add(ob)
+        self.local_bases: dict[Cell, frozenset[CayleyPermutation]] = self._freeze(
+            local_bases
+        )
+        self.obs_by_cell = self._freeze(obs_by_cell)
+        self.obs_by_col = self._freeze(obs_by_col)
+        self.obs_by_row = self._freeze(obs_by_row)
+
+        reqs_by_col: dict[int, set[Gcptuple]] = defaultdict(set)
+        reqs_by_row: dict[int, set[Gcptuple]] = defaultdict(set)
+        for req_list in requirements:
+            for col, row in set(chain.from_iterable(req.positions for req in req_list)):
+                reqs_by_col[col].add(req_list)
+                reqs_by_row[row].add(req_list)
+        self.reqs_by_col = self._freeze(reqs_by_col)
+        self.reqs_by_row = self._freeze(reqs_by_row)
+
+        self.empty_cells = frozenset(
+            ob.positions[0] for ob in obstructions if len(ob) == 1
+        )
+        self.active_cells = all_cells - self.empty_cells
+        cells_in_row: dict[int, set[Cell]] = defaultdict(set)
+        cells_in_col: dict[int, set[Cell]] = defaultdict(set)
+        for cell in self.active_cells:
+            cells_in_col[cell[0]].add(cell)
+            cells_in_row[cell[1]].add(cell)
+        self.cells_in_row = self._freeze(cells_in_row)
+        self.cells_in_col = self._freeze(cells_in_col)
+
+        positive_cells = set[Cell]()
+        for req_list in requirements:
+            positive_cells.update(
+                set(req_list[0].positions).intersection(
+                    *(req.positions for req in req_list)
+                )
+            )
+        self.positive_cells = frozenset(positive_cells)
+        self.requirement_cells = frozenset(
+            chain.from_iterable(req.positions for req in chain(*requirements))
+        )
+        self.not_blank_cells = (
+            frozenset(chain.from_iterable(ob.positions for ob in obstructions))
+            | self.requirement_cells
+        )
+        self.single_value_cells = frozenset(
+            cell
+            for cell in self.active_cells
+            if self.in_local_basis(cell, INCREASING, DECREASING)
+        )
+        self.single_position_cells = frozenset(
+            cell
+            for cell in self.single_value_cells
+            if self.in_local_basis(cell, CONSTANT)
+        )
+        self.point_cells = frozenset(
+            cell
+            for cell in self.positive_cells
+            if self.in_local_basis(cell, INCREASING, DECREASING, CONSTANT)
+        )
+        # a row is a point row if there is an increasing and decreasing
+        # obstruction between every pair of its active cells
+        point_rows = set[int]()
+        for row, count in row_pair_counts.items():
+            number_of_cells = len(self.cells_in_row.get(row, ()))
+            if count == number_of_cells * (number_of_cells + 1):
+                point_rows.add(row)
+        self.point_rows = frozenset(point_rows)
+
+    @staticmethod
+    def _freeze(table: dict) -> dict:
+        """Return the table with each value made into a frozenset."""
+        return {key: frozenset(value) for key, value in table.items()}
+
+    def in_local_basis(self, cell: Cell, *patterns: CayleyPermutation) -> bool:
+        """Return True if each pattern is an obstruction localised in the cell."""
+        basis = self.local_bases.get(cell, frozenset())
+        return all(patt in basis for patt in patterns)
+
+    def has_obstruction(self, gcp: "GriddedCayleyPerm") -> bool:
+        """Return True if the gridded Cayley permutation is an obstruction."""
+        return gcp in self.obstruction_set
@@ -5,13 +5,16 @@ A tiling represents the set of gridded Cayley permutations with cells coming up
 dimension, that avoid a set of obstructions and contain a set of requirements.
 """
 
-from collections import defaultdict
+from collections import Counter, defaultdict
 from functools import cached_property
 from itertools import chain, product, combinations, combinations_with_replacement
 from math import factorial
-from typing import Iterable, Iterator, Optional
+from random import Random
+from typing import Callable, Iterable, Iterator, Optional
 
+import sympy  # type: ignore[import-untyped]
 from comb_spec_searcher import CombinatorialClass
+from comb_spec_searcher.typing import Terms
 
 from cayley_permutations import CayleyPermutation, string_to_basis
 from check_regular_ins_enc import (
@@ -19,9 +22,13 @@ from check_regular_ins_enc import (
     regular_horizontal_insertion_encoding,
 )
 
+from .counting import GriddedCayleyPermCounter
+from .fusability import FusabilityCheck
 from .gridded_cayley_perms import GriddedCayleyPerm
 from .minimal_gridded_cperms import MinimalGriddedCayleyPerm
 from .row_col_map import RowColMap
+from .sampling import GriddedCayleyPermSampler
+from .tiling_index import TilingIndex
 from .simplify_obstructions_and_requirements import SimplifyObstructionsAndRequirements
 
 Cell = tuple[int, int]
@@ -67,7 +74,7 @@ class Tiling(CombinatorialClass):
         Generating gridded Cayley permutations of size 'size'.
         """
         if size == 0:
-            if not GriddedCayleyPerm(CayleyPermutation([]), []) in self.obstructions:
+            if not self.has_obstruction(GriddedCayleyPerm(CayleyPermutation([]), [])):
                 yield GriddedCayleyPerm(CayleyPermutation([]), [])
             return
         for gcp in self._gridded_cayley_permutations(size - 1):
@@ -116,120 +123,81 @@ class Tiling(CombinatorialClass):
             and self.satisfies_requirements(gcp)
         )
 
+    @cached_property
+    def tiling_index(self) -> TilingIndex:
+        """Returns the lookup tables for the obstructions and requirements of the tiling."""
+        return TilingIndex(self.obstructions, self.requirements, self.dimensions)
+
+    def has_obstruction(self, gcp: GriddedCayleyPerm) -> bool:
+        """Return True if the gridded Cayley permutation is an obstruction."""
+        return self.tiling_index.has_obstruction(gcp)
+
     @cached_property
     def active_cells(self) -> set[tuple[int, int]]:
         """Returns the set of active cells in the tiling.
         (Cells are active if they do not contain a point obstruction.)"""
-        return SimplifyObstructionsAndRequirements(
-            self.obstructions, self.requirements, self.dimensions
-        ).active_cells()
+        return set(self.tiling_index.active_cells)
 
     def positive_cells(self) -> set[tuple[int, int]]:
         """Returns a set of cells that are positive in the tiling.
         (Cells are positive if they contain a point requirement.)"""
-        positive_cells = set()
-        for req_list in self.requirements:
-            current = set(req_list[0].positions)
-            for req in req_list:
-                current = current.intersection(req.positions)
-            positive_cells.update(current)
-        return positive_cells
+        return set(self.tiling_index.positive_cells)
 
     def point_cells(self) -> set[tuple[int, int]]:
         """Returns the set of cells that can only contain a point."""
-        # can this be made more efficient?
-        point_cells = set()
-        for cell in self.positive_cells():
-            if (
-                GriddedCayleyPerm(CayleyPermutation([0, 1]), [cell, cell])
-                in self.obstructions
-                and GriddedCayleyPerm(CayleyPermutation([1, 0]), [cell, cell])
-                in self.obstructions
-                and GriddedCayleyPerm(CayleyPermutation([0, 0]), [cell, cell])
-                in self.obstructions
-            ):
-                point_cells.add(cell)
-        return point_cells
+        return set(self.tiling_index.point_cells)
 
     def not_blank_cells(self) -> set[tuple[int, int]]:
         """Returns the set of cells that are a position for some ob or req."""
-        if not self.obstructions and not self.requirements:
-            return set()
-        combined_obs_and_reqs = self.obstructions + tuple(chain(*self.requirements))
-        return set(chain(*(gcp.positions for gcp in combined_obs_and_reqs)))
+        return set(self.tiling_index.not_blank_cells)
 
     def blank_cells(self) -> set[tuple[int, int]]:
         """Returns the set of cells that contain no obs or reqs."""
         return (
             set(product(range(self.dimensions[0]), range(self.dimensions[1])))
-            - self.not_blank_cells()
+            - self.tiling_index.not_blank_cells
         )
 
     def empty_cells(self) -> set[Cell]:
         """Returns the set of empty cells"""
-        empty = set()
-        for ob in self.obstructions:
-            if len(ob) == 1:
-                empty.add(ob.positions[0])
-        return empty
+        return set(self.tiling_index.empty_cells)
 
     def single_value_cells(self) -> set[Cell]:
         """Returns the set of cells with at most one value"""
-        cells = set[Cell]()
-        for cell in self.active_cells:
-            if (
-                GriddedCayleyPerm((0, 1), (cell, cell)) in self.obstructions
-                and GriddedCayleyPerm((1, 0), (cell, cell)) in self.obstructions
-            ):
-                cells.add(cell)
-        return cells
+        return set(self.tiling_index.single_value_cells)
 
     def single_position_cells(self) -> set[Cell]:
         """Returns the set of cells with at most one position"""
-        cells = set[Cell]()
-        for cell in self.active_cells:
-            if (
-                GriddedCayleyPerm((0, 1), (cell, cell)) in self.obstructions
-                and GriddedCayleyPerm((1, 0), (cell, cell)) in self.obstructions
-                and GriddedCayleyPerm((0, 0), (cell, cell)) in self.obstructions
-            ):
-                cells.add(cell)
-        return cells
+        return set(self.tiling_index.single_position_cells)
 
     def requirement_cells(self) -> set[Cell]:
         """Returns every cell that contains a requirement"""
-        if not self.requirements:
-            return set[Cell]()
-        return set(chain(*(set(req.positions) for req in chain(*self.requirements))))
+        return set(self.tiling_index.requirement_cells)
 
     def obs_by_col_and_row(
         self,
-    ) -> tuple[dict[int, set[GriddedCayleyPerm]], dict[int, set[GriddedCayleyPerm]]]:
+    ) -> tuple[
+        dict[int, frozenset[GriddedCayleyPerm]], dict[int, frozenset[GriddedCayleyPerm]]
+    ]:
         """Returns a dict with obstructions sorted by intersecting columns
         and a dict with obstructions sorted by intersecting rows"""
-        by_col = defaultdict[int, set[GriddedCayleyPerm]](set)
-        by_row = defaultdict[int, set[GriddedCayleyPerm]](set)
-        for ob in self.obstructions:
-            for pos in set(ob.positions):
-                by_col[pos[0]].add(ob)
-                by_row[pos[1]].add(ob)
-        return by_col, by_row
+        return (
+            defaultdict(frozenset, self.tiling_index.obs_by_col),
+            defaultdict(frozenset, self.tiling_index.obs_by_row),
+        )
 
     def reqs_by_col_and_row(
         self,
     ) -> tuple[
-        dict[int, set[tuple[GriddedCayleyPerm, ...]]],
-        dict[int, set[tuple[GriddedCayleyPerm, ...]]],
+        dict[int, frozenset[tuple[GriddedCayleyPerm, ...]]],
+        dict[int, frozenset[tuple[GriddedCayleyPerm, ...]]],
     ]:
         """Returns a dict with requirements sorted by intersecting columns
         and a dict with requirements sorted by intersecting rows"""
-        by_col = defaultdict[int, set[tuple[GriddedCayleyPerm, ...]]](set)
-        by_row = defaultdict[int, set[tuple[GriddedCayleyPerm, ...]]](set)
-        for req_list in self.requirements:
-            for pos in set(chain.from_iterable(req.positions for req in req_list)):
-                by_col[pos[0]].add(req_list)
-                by_row[pos[1]].add(req_list)
-        return by_col, by_row
+        return (
+            defaultdict(frozenset, self.tiling_index.reqs_by_col),
+            defaultdict(frozenset, self.tiling_index.reqs_by_row),
+        )
 
     def delete_columns(self, cols: Iterable[int]) -> "Tiling":
         """
@@ -444,9 +412,7 @@ class Tiling(CombinatorialClass):
     @cached_property
     def point_rows(self) -> set[int]:
         """Returns the set of rows which only contain points of the same value."""
-        return SimplifyObstructionsAndRequirements(
-            self.obstructions, self.requirements, self.dimensions
-        ).point_rows()
+        return set(self.tiling_index.point_rows)
 
     @cached_property
     def point_cols(self) -> set[int]:
@@ -469,19 +435,11 @@ class Tiling(CombinatorialClass):
 
     def cells_in_row(self, row: int) -> set[tuple[int, int]]:
         """Returns the set of active cells in the given row."""
-        cells = set()
-        for cell in self.active_cells:
-            if cell[1] == row:
-                cells.add(cell)
-        return cells
+        return set(self.tiling_index.cells_in_row.get(row, ()))
 
     def cells_in_col(self, col: int) -> set[tuple[int, int]]:
         """Returns the set of active cells in the given column."""
-        cells = set()
-        for cell in self.active_cells:
-            if cell[0] == col:
-                cells.add(cell)
-        return cells
+        return set(self.tiling_index.cells_in_col.get(col, ()))
 
     def col_is_positive(self, col: int) -> bool:
         """Return true if the column must contain at least one point."""
@@ -499,6 +457,41 @@ class Tiling(CombinatorialClass):
         )
         return self.add_obstructions(req_list).is_empty()
 
+    # Symmetries
+
+    def reverse(self) -> "Tiling":
+        """Returns the tiling whose gridded Cayley permutations are the reverses
+        of those on the tiling."""
+        return self._symmetry(lambda gcp: gcp.reverse(self.dimensions))
+
+    def complement(self) -> "Tiling":
+        """Returns the tiling whose gridded Cayley permutations are the
+        complements of those on the tiling."""
+        return self._symmetry(lambda gcp: gcp.complement(self.dimensions))
+
+    def reverse_complement(self) -> "Tiling":
+        """Returns the tiling whose gridded Cayley permutations are the reverse
+        complements of those on the tiling."""
+        return self._symmetry(lambda gcp: gcp.reverse_complement(self.dimensions))
+
+    def _symmetry(
+        self, symmetry: Callable[[GriddedCayleyPerm], GriddedCayleyPerm]
+    ) -> "Tiling":
+        """Returns the tiling with the symmetry applied to each obstruction and
+        requirement. The symmetries preserve containment so the image is already
+        simplified, it only needs sorting."""
+        return Tiling(
+            map(symmetry, self.obstructions),
+            sorted(
+                set(
+                    tuple(sorted(set(map(symmetry, req_list))))
+                    for req_list in self.requirements
+                )
+            ),
+            self.dimensions,
+            simplify=False,
+        )
+
     # Fusion methods
 
     def fuse(self, fuse_rows: bool, index: int) -> "Tiling":
@@ -518,6 +511,8 @@ class Tiling(CombinatorialClass):
     def is_fusable(self, fuse_rows: bool, index: int) -> bool:
         """If fuse rows, checks if the rows at index and index+1 are fuseable,
         otherwise does the same for cols at index and index+1."""
+        if not self.fusability_check(fuse_rows, index).is_fusable():
+            return False
         if fuse_rows:
             test_tiling = self.delete_rows([index])
         else:
@@ -525,6 +520,11 @@ class Tiling(CombinatorialClass):
         test_tiling = test_tiling.split_row_or_col(fuse_rows, index)
         return test_tiling == self
 
+    def fusability_check(self, fuse_rows: bool, index: int) -> FusabilityCheck:
+        """Returns the cheap fusability test for the rows (if fuse_rows) or cols
+        at index and index+1, which must pass for them to be fusable."""
+        return FusabilityCheck(self.obstructions, self.requirements, fuse_rows, index)
+
     def split_row_or_col(self, unfuse_rows: bool, index: int) -> "Tiling":
         """Unfuses a row (if unfuse_rows) or col (otherwise)
         at index without simplifying the Tiling."""
@@ -862,12 +862,30 @@ class Tiling(CombinatorialClass):
         return sum(max(len(gcp) for gcp in req_list) for req_list in self.requirements)
 
     def is_empty(self) -> bool:
-        return any(len(ob) == 0 for ob in self.obstructions) or self._is_empty()
+        return self._minimum_size is None
 
-    def _is_empty(self) -> bool:
-        for _ in self.minimal_gridded_cperms():
-            return False
-        return True
+    @cached_property
+    def _minimum_size(self) -> Optional[int]:
+        """Returns the size of the smallest gridded Cayley permutation on the tiling,
+        or None if the tiling is empty."""
+        if any(len(ob) == 0 for ob in self.obstructions):
+            return None
+        if len(self.requirements) == 1:
+            # the minimal gridded Cayley permutations are the requirements, which
+            # are not in length order
+            return min(
+                (
+                    len(gcp)
+                    for gcp in self.requirements[0]
+                    if self.satisfies_obstructions(gcp)
+                ),
+                default=None,
+            )
+        # otherwise they are found in length order
+        for gcp in self.minimal_gridded_cperms():
+            if self.satisfies_obstructions(gcp):
+                return len(gcp)
+        return None
 
     def is_horizontal_insertion_encodable(self) -> bool:
         """Returns True if the tiling has a horizontal insertion encoding."""
@@ -946,18 +964,52 @@ class Tiling(CombinatorialClass):
         return True
 
     def minimum_size_of_object(self) -> int:
-        """Or a lower bound."""
-        if self.is_empty():
-            return 0
-        i = 0
-        while True:
-            for _ in self.objects_of_size(i):
-                return i
-            i += 1
+        """Returns the size of the smallest gridded Cayley permutation on the tiling,
+        or 0 if the tiling is empty."""
+        minimum_size = self._minimum_size
+        return 0 if minimum_size is None else minimum_size
 
     def objects_of_size(self, n: int, **parameters: int) -> Iterator[GriddedCayleyPerm]:
         yield from self.gridded_cayley_permutations(n)
 
+    @cached_property
+    def counter(self) -> GriddedCayleyPermCounter:
+        """Returns a counter for the gridded Cayley permutations on the tiling."""
+        return GriddedCayleyPermCounter(
+            self.obstructions, self.requirements, self.dimensions
+        )
+
+    def count_gridded_cayley_permutations(self, size: int) -> int:
+        """Return the number of gridded Cayley permutations of the given size,
+        without generating them."""
+        return self.counter.count(size)
+
+    @cached_property
+    def sampler(self) -> GriddedCayleyPermSampler:
+        """Returns a uniform sampler for the gridded Cayley permutations on the tiling."""
+        return GriddedCayleyPermSampler(self.counter)
+
+    def random_gridded_cayley_perm(
+        self, size: int, rng: Optional[Random] = None
+    ) -> GriddedCayleyPerm:
+        """Return a gridded Cayley permutation of the given size on the tiling,
+        chosen uniformly at random. Raises a ValueError if there are none."""
+        return self.sampler.sample(size, rng)
+
+    def get_terms(self, n: int) -> Terms:
+        if self.extra_parameters:
+            return super().get_terms(n)
+        terms: Terms = Counter()
+        count = self.count_gridded_cayley_permutations(n)
+        if count:
+            terms[()] = count
+        return terms
+
+    def initial_conditions(self, check: int = 6) -> list[sympy.Expr]:
+        if self.extra_parameters:
+            return super().initial_conditions(check)
+        return [sympy.Number(count) for count in self.counter.counts(check)]
+
     @cached_property
     def cell_basis(
         self,
@@ -969,12 +1021,8 @@ class Tiling(CombinatorialClass):
         cell and the second contains the intersections of requirement lists
         that are localized in the cell.
         """
-        obdict: dict[Cell, list[CayleyPermutation]] = defaultdict(list)
+        local_bases = self.tiling_index.local_bases
         reqdict: dict[Cell, list[CayleyPermutation]] = defaultdict(list)
-        for ob in self.obstructions:
-            if len(set(ob.positions)) == 1:
-                cell = ob.positions[0]
-                obdict[cell].append(ob.pattern)
 
         for req_list in self.requirements:
             for gcp in req_list:
@@ -994,7 +1042,10 @@ class Tiling(CombinatorialClass):
             ]
 
         all_cells = product(range(self.dimensions[0]), range(self.dimensions[1]))
-        resdict = {cell: (obdict[cell], reqdict[cell]) for cell in all_cells}
+        resdict = {
+            cell: (sorted(local_bases.get(cell, ())), reqdict[cell])
+            for cell in all_cells
+        }
         return resdict
 
     @cached_property
@@ -1148,7 +1199,7 @@ class Tiling(CombinatorialClass):
                     cayley_ob = GriddedCayleyPerm(
                         (0, 0), ((cols[0], row), (cols[1], row))
                     )
-                    if cayley_ob not in self.obstructions:
+                    if not self.has_obstruction(cayley_ob):
                         is_perm_tiling = False
                         break
                     all_cayley_obs.add(cayley_ob)
@@ -1203,6 +1254,14 @@ class Tiling(CombinatorialClass):
 
         return final_string
 
+    def __getstate__(self) -> dict:
+        """Pickle the tiling without the data cached on it."""
+        return {
+            key: value
+            for key, value in self.__dict__.items()
+            if not isinstance(getattr(type(self), key, None), cached_property)
+        }
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Tiling):
             return NotImplemented
@@ -5,6 +5,7 @@ from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
 from clouds import TrackedTiling
 from clouds.tracked_algos import (
     TrackedFactors,
+    TrackedShuffleFactors,
     TrackedLessThanRowColSeparation,
     TrackedLessThanOrEqualRowColSeparation,
     TrackedPointPlacement,
@@ -223,3 +224,41 @@ def test_fusion_with_clouds():
         indices_clouds=((0,), (1,)),
         value_clouds=((0,), (2,)),
     )
+
+
+def test_tracked_tiling_shares_tiling():
+    """Tracked tilings share the obstructions and cached properties of their
+    tiling, and removing a cloud gives the same tracked tiling as creating it."""
+    til = Tiling.create_vincular_or_bivincular("0")
+    active_cells = til.active_cells
+    track_til = TrackedTiling(
+        til, value_clouds=((2, 1, 1), (0, 5)), indices_clouds=((1, 2), (0,))
+    )
+    assert track_til.obstructions is til.obstructions
+    assert track_til.active_cells is active_cells
+    assert track_til.value_clouds == ((0,), (1, 2))
+    removed = track_til.remove_idx_cloud((0,)).remove_val_cloud((0,))
+    assert removed == TrackedTiling(
+        til, value_clouds=((1, 2),), indices_clouds=((1, 2),)
+    )
+    assert removed.extra_parameters == ("i_0", "v_0")
+
+
+def test_factors_shared_by_clouds(monkeypatch):
+    """Tracked tilings with the same tiling reuse its factors, and only map their
+    clouds onto them."""
+    til = Tiling.create_vincular_or_bivincular("0")
+    first = TrackedTiling(til, value_clouds=((0, 1), (2,)), indices_clouds=((1, 2),))
+    second = TrackedTiling(til, value_clouds=((1,),), indices_clouds=((0, 1),))
+    first_factors = list(TrackedFactors(first).find_tracked_factors())
+    second_factors = list(TrackedFactors(second).find_tracked_factors())
+    assert TrackedFactors.factors_cache[til] == tuple(
+        factor.tiling for factor in first_factors
+    )
+    assert all(
+        factor.tiling is other.tiling
+        for factor, other in zip(first_factors, second_factors)
+    )
+    assert til not in TrackedShuffleFactors.factors_cache
+    monkeypatch.setattr(TrackedFactors, "factors_cache", {})
+    assert second_factors == list(TrackedFactors(second).find_tracked_factors())
@@ -0,0 +1,95 @@
+"""Testing the constructors count the same with and without arrays."""
+
+from collections import Counter
+from random import Random
+
+import pytest
+from comb_spec_searcher import Constructor
+
+from clouds.strategies import add_cloud, fusion_constructor
+from clouds.strategies.add_cloud import (
+    AddAssumptionsConstructor,
+    RemoveAssumptionsConstructor,
+)
+from clouds.strategies.dense_terms import fuse_terms, map_terms
+from clouds.strategies.fusion_constructor import FusionConstructor
+
+
+def random_terms(rng: Random, num_params: int, n: int, big: bool = False) -> Counter:
+    """Return random terms with parameters at most n."""
+    return Counter(
+        {
+            tuple(rng.randint(0, n) for _ in range(num_params)): rng.randint(
+                1, 10**30 if big else 1000
+            )
+            for _ in range(200)
+        }
+    )
+
+
+def loop_and_array_terms(monkeypatch, module, constructor, terms, n):
+    """Return the terms found by the constructor with loops and with arrays."""
+    monkeypatch.setattr(module, "SMALL_TERMS", len(terms) + 1)
+    loop_terms = constructor.get_terms(None, (lambda _: terms,), n)
+    monkeypatch.setattr(module, "SMALL_TERMS", 0)
+    array_terms = constructor.get_terms(None, (lambda _: terms,), n)
+    return loop_terms, array_terms
+
+
+@pytest.mark.parametrize("big", [False, True])
+def test_fusion_terms(monkeypatch, big):
+    """Test fusing with arrays gives the same terms as the loops."""
+    rng = Random(0)
+    for min_points in ((0, 0), (1, 0), (1, 1), (2, 1)):
+        constructor = object.__new__(FusionConstructor)
+        constructor.child_pos_to_parent_pos = ((0,), (1, 2), (3,))
+        constructor.num_parent_params = 4
+        constructor.children_param_map = Constructor.build_param_map(
+            constructor.child_pos_to_parent_pos, 4
+        )
+        constructor.fuse_parameter_index = 1
+        constructor.left_parameter_indices = (1,)
+        constructor.right_parameter_indices = (2,)
+        constructor.min_points = min_points
+        terms = random_terms(rng, 3, 12, big)
+        loop_terms, array_terms = loop_and_array_terms(
+            monkeypatch, fusion_constructor, constructor, terms, 12
+        )
+        assert loop_terms == array_terms
+        assert sum(array_terms.values()) > 0
+
+
+@pytest.mark.parametrize("big", [False, True])
+def test_add_and_remove_assumption_terms(monkeypatch, big):
+    """Test mapping the parameters with arrays gives the same terms as the loops."""
+    rng = Random(1)
+    child_pos_to_parent_pos = ((1,), (), (0,), ())
+    add = object.__new__(AddAssumptionsConstructor)
+    add.child_pos_to_parent_pos = child_pos_to_parent_pos
+    add.num_parent_params = 2
+    add.child_param_map = Constructor.build_param_map(child_pos_to_parent_pos, 2)
+    remove = object.__new__(RemoveAssumptionsConstructor)
+    remove.child_pos_to_parent_pos = ((0,), (2,), (1,))
+    remove.num_parent_params = 3
+    remove.parameter_idx = 1
+    remove.child_param_map = Constructor.build_param_map(((0,), (2,), (1,)), 3)
+    for constructor, num_params in ((add, 4), (remove, 3)):
+        terms = random_terms(rng, num_params, 10, big)
+        loop_terms, array_terms = loop_and_array_terms(
+            monkeypatch, add_cloud, constructor, terms, 10
+        )
+        assert loop_terms == array_terms
+
+
+def test_map_terms_without_parameters():
+    """Test terms with no parameters left are added up."""
+    assert map_terms(Counter({(1,): 2, (3,): 5}), ((),), 0) == Counter({(): 7})
+
+
+def test_fuse_terms_overflow():
+    """Test fusing terms whose counts fit in int64 but whose fused counts do not."""
+    terms = Counter({(f,): 1 for f in range(63)})
+    terms[(63,)] = 5 * 10**17
+    fused = fuse_terms(terms, ((0,),), 1, 0, (), (), (0, 0))
+    assert fused[(63,)] == 32 * 10**18
+    assert fused == Counter({(f,): (f + 1) * count for (f,), count in terms.items()})
@@ -0,0 +1,48 @@
+"""Testing the points in the fuse region found by the fusion constructor."""
+
+from itertools import product
+
+from cayley_permutations import CayleyPermutation
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+from clouds import TrackedTiling
+from clouds.strategies import fusion_constructor
+from clouds.strategies.fusion import TrackedFusionStrategy
+
+
+def test_points_in_fuse_region(monkeypatch):
+    """Test the remembered points in the fuse region agree with finding them again,
+    only depend on the parameters of the fuse region, and are bounded."""
+    # pylint: disable=protected-access
+    tiling = TrackedTiling(
+        Tiling(
+            [
+                GriddedCayleyPerm(CayleyPermutation([0, 1]), [(i, 0), (j, 0)])
+                for i in range(3)
+                for j in range(i, 3)
+            ],
+            [],
+            (3, 1),
+        ),
+        indices_clouds=[(0, 1), (0, 1, 2), (2,)],
+    )
+    constructor = TrackedFusionStrategy(False, 1).constructor(tiling)
+    assert constructor.fuse_region_parameters == ("i_0", "i_1", "i_2")
+    assert constructor.overlapping_parameters == [(("i_0", "i_1"), True)]
+    monkeypatch.setattr(fusion_constructor, "FUSE_REGION_CACHE_SIZE", 50)
+    for n in range(4):
+        for values in product(range(n + 1), repeat=3):
+            parameters = dict(zip(tiling.extra_parameters, values))
+            expected = list(constructor._points_in_fuse_region(n, **parameters))
+            for _ in range(2):
+                assert (
+                    list(
+                        constructor.determine_number_of_points_in_fuse_region(
+                            n, **parameters
+                        )
+                    )
+                    == expected
+                )
+            assert len(constructor.fuse_region_points) <= 50
+    assert list(
+        constructor.determine_number_of_points_in_fuse_region(3, i_0=1, i_1=2, i_2=1)
+    ) == [(0, 1), (1, 1), (2, 1)]
@@ -0,0 +1,84 @@
+"""Testing the parameters of tracked tilings and the bounds on them."""
+
+from itertools import product
+
+import pytest
+
+from cayley_permutations import CayleyPermutation
+from clouds import TrackedTiling
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+from gridded_cayley_permutations.point_placements import PointPlacement
+
+
+def placed_tiling() -> Tiling:
+    """Return Av(012, 2100) with its rightmost point placed."""
+    point = GriddedCayleyPerm(CayleyPermutation((0,)), ((0, 0),))
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation(p), [(0, 0) for _ in p])
+            for p in ((0, 1, 2), (2, 1, 0, 0))
+        ],
+        [],
+        (1, 1),
+    ).add_requirement_list((point,))
+    (placed,) = PointPlacement(tiling).point_placement((point,), (0,), 0)
+    return placed
+
+
+TRACKED_TILINGS = [
+    TrackedTiling(placed_tiling(), indices_clouds=((0,), (1,), (0, 1))),
+    TrackedTiling(placed_tiling(), value_clouds=((0,), (1,), (2,), (0, 1))),
+    TrackedTiling(
+        placed_tiling(), indices_clouds=((0,), (1,)), value_clouds=((1,), (0, 2))
+    ),
+]
+
+
+@pytest.mark.parametrize("tiling", TRACKED_TILINGS)
+def test_possible_parameters(tiling):
+    """The possible parameters should include the parameters of every gridded
+    Cayley permutation and be fewer than all the tuples of values at most n."""
+    for n in range(6):
+        found = {
+            tiling.get_parameters(gcp) for gcp in tiling.gridded_cayley_permutations(n)
+        }
+        possible = [tuple(params.values()) for params in tiling.possible_parameters(n)]
+        assert found <= set(possible)
+        assert possible == sorted(possible)
+        if n > 1:
+            assert len(possible) < len(
+                list(product(range(n + 1), repeat=len(tiling.extra_parameters)))
+            )
+
+
+def test_minimum_value():
+    """Only the clouds containing the placed point have a positive minimum."""
+    tiling = TRACKED_TILINGS[2]
+    assert [tiling.get_minimum_value(p) for p in tiling.extra_parameters] == [
+        0,
+        1,
+        0,
+        1,
+    ]
+
+
+@pytest.mark.parametrize("tiling", TRACKED_TILINGS)
+def test_get_parameters(tiling):
+    """The parameters found in one pass should agree with get_value."""
+    gcps = [gcp for n in range(5) for gcp in tiling.gridded_cayley_permutations(n)]
+    expected = [
+        tuple(tiling.get_value(gcp, param) for param in tiling.extra_parameters)
+        for gcp in gcps
+    ]
+    assert [tiling.get_parameters(gcp) for gcp in gcps] == expected
+    assert tiling.get_parameters_array(gcps).tolist() == [list(p) for p in expected]
+
+
+def test_no_clouds():
+    """Test a tiling with no clouds has the empty parameters, for every size."""
+    tiling = TrackedTiling(Tiling.create_vincular_or_bivincular("01"))
+    assert tiling.get_parameters_array(tiling.minimal_gridded_cperms()).shape == (
+        len(list(tiling.minimal_gridded_cperms())),
+        0,
+    )
+    assert all(list(tiling.possible_parameters(n)) == [{}] for n in range(4))
@@ -0,0 +1,62 @@
+"""Testing the constructors for adding and removing clouds sample correctly."""
+
+from collections import Counter
+
+from cayley_permutations import CayleyPermutation
+from clouds import TrackedTiling
+from clouds.strategies import add_cloud
+from clouds.strategies.add_cloud import AddCloudsStrategy
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+
+def brute_force_counts(tiling: TrackedTiling, n: int) -> Counter:
+    """Return the number of gridded Cayley permutations of size n on the tiling
+    with each tuple of parameters."""
+    return Counter(
+        tiling.get_parameters(gcp) for gcp in tiling.gridded_cayley_permutations(n)
+    )
+
+
+def test_add_and_remove_cloud_samples(monkeypatch):
+    """Every random choice should pick the child parameters with that many
+    objects, and each child parameters should be picked as often as its count."""
+    n = 5
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0))),
+            GriddedCayleyPerm(CayleyPermutation((1, 0)), ((1, 0), (1, 0))),
+        ],
+        [],
+        (2, 1),
+    )
+    parent = TrackedTiling(tiling, indices_clouds=((1,),))
+    strategy = AddCloudsStrategy(idx_clouds=((0,),))
+    (child,) = strategy.decomposition_function(parent)
+    counts = brute_force_counts(child, n)
+
+    def subrec(_, **params):
+        return counts[tuple(params[k] for k in child.extra_parameters)]
+
+    def subsampler(_, **params):
+        return tuple(params[k] for k in child.extra_parameters)
+
+    constructor = strategy.constructor(parent, (child,))
+    parent_count = brute_force_counts(parent, n)[(1,)]
+    picked: Counter = Counter()
+    for choice in range(1, parent_count + 1):
+        monkeypatch.setattr(add_cloud, "randint", lambda _, __, c=choice: c)
+        (sample,) = constructor.random_sample_sub_objects(
+            parent_count, (subsampler,), (subrec,), n, i_0=1
+        )
+        picked[sample] += 1
+    assert picked == Counter(
+        {params: count for params, count in counts.items() if params[1] == 1}
+    )
+    assert len(constructor.sample_tables) == 1
+
+    # removing the cloud samples from the tiling without it, with the rest of
+    # the parameters unchanged
+    remove = strategy.reverse_constructor(0, parent, (child,))
+    assert remove.random_sample_sub_objects(
+        1, (lambda _, **params: params,), (subrec,), n, i_0=n, i_1=2
+    ) == ({"i_0": 2},)
@@ -0,0 +1,99 @@
+"""Testing the tracked searcher with worker processes and its metrics."""
+
+import json
+
+from cayley_permutations import CayleyPermutation
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+from clouds import TrackedSearcher, TrackedTileScopePack, TrackedTiling
+from clouds.strategies.add_cloud import AddCloudsStrategy
+from clouds.strategies.extra_parameters import num_cvs
+from clouds.strategies.fusion import TrackedFusionStrategy
+
+
+def test_parallel_tracked_search():
+    """Test expanding in worker processes, taking from the queues for the levels in
+    turn, finds a specification which keeps to max_cvs."""
+    pack = TrackedTileScopePack.standard_fusion_pack(expansion_methods=["point"])
+    searcher = TrackedSearcher("101_010", pack, max_cvs=1, workers=2)
+    assert searcher.classqueue.interleave_levels
+    spec = searcher.auto_search()
+    assert searcher.pool is None
+    assert all(
+        searcher.keep_worker_rule(rule)
+        for rule in spec.rules_dict.values()
+        if rule.children
+    )
+    assert searcher.classqueue.queues[0].levels_changed >= 1
+
+
+def test_tracked_search_metrics(tmp_path):
+    """Test the running counts of the queue agree with the labels found, and that
+    snapshots of them are written as lines of JSON."""
+    path = tmp_path / "metrics.jsonl"
+    pack = TrackedTileScopePack.standard_fusion_pack(expansion_methods=["point"])
+    searcher = TrackedSearcher("012", pack, max_cvs=1)
+    searcher.auto_search(metrics=str(path), metrics_interval=0)
+    metrics = searcher.metrics
+    queue = searcher.classqueue
+    assert sum(metrics.all_labels.values()) == len(queue.label_to_underlying)
+    assert sum(metrics.underlying_labels.values()) == len(
+        set(queue.label_to_underlying.values())
+    )
+    assert sum(metrics.rejected_rules.values()) > 0
+    assert sum(metrics.expansions.values()) > 0
+    snapshots = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(snapshots) >= 2
+    assert snapshots[-1]["levels"] == json.loads(json.dumps(queue.snapshot()))["levels"]
+    assert snapshots[-1]["levels"][0]["expansions"] == metrics.expansions[0]
+    assert "rejected rules" in queue.status()
+
+
+def test_max_cvs_rejects_before_children():
+    """Test the clouds predicted for the children of adding clouds and fusion agree
+    with the children, and that strategies over max_cvs are rejected without
+    them."""
+    # pylint: disable=protected-access
+    tiling = TrackedTiling(
+        Tiling(
+            [
+                GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (0, 0)]),
+                GriddedCayleyPerm(CayleyPermutation([0, 1]), [(0, 0), (1, 0)]),
+                GriddedCayleyPerm(CayleyPermutation([0, 1]), [(1, 0), (1, 0)]),
+            ],
+            [],
+            (2, 1),
+        ),
+        indices_clouds=[(0,)],
+    )
+    strategies = [
+        AddCloudsStrategy(idx_clouds=[(1,)]),
+        AddCloudsStrategy(val_clouds=[(0,)]),
+        TrackedFusionStrategy(fuse_rows=False, index=0),
+    ]
+    for strategy in strategies:
+        children = strategy.decomposition_function(tiling)
+        assert strategy.predicted_num_cvs(tiling) == tuple(
+            num_cvs(child.indices_clouds, child.value_clouds, child.dimensions[0])
+            for child in children
+        )
+    pack = TrackedTileScopePack.standard_fusion_pack(expansion_methods=["point"])
+    searcher = TrackedSearcher("012", pack, max_cvs=1)
+    assert not searcher.predicted_within_max_cvs(tiling, strategies[1])
+    assert searcher.predicted_within_max_cvs(tiling, strategies[2])
+    rules = list(searcher._rules_from_strategy(tiling, strategies[1]))
+    assert not rules and searcher.metrics.rejected_rules[0] == 1
+
+
+def test_profiled_tracked_search():
+    """Test the rules produced by each factory are profiled under its name, so
+    none keeps more rules than it produced."""
+    pack = TrackedTileScopePack.standard_fusion_pack(expansion_methods=["point"])
+    searcher = TrackedSearcher("012", pack, max_cvs=1, profile=True)
+    searcher.auto_search()
+    profiler = searcher.profiler
+    assert sum(profiler.rules_kept.values()) > 0
+    assert all(
+        profiler.rules_produced[name] >= kept
+        for name, kept in profiler.rules_kept.items()
+    )
+    assert sum(profiler.rules_produced[name] for name in profiler.calls) > 0
@@ -1,5 +1,7 @@
 """Tests for the Tiling class in gridded_cayley_permutations.py."""
 
+from random import Random
+
 import pytest
 
 from gridded_cayley_permutations import Tiling, GriddedCayleyPerm
@@ -22,3 +24,167 @@ def test_repr(all_cperms_tiling, empty_tiling):
     """Test the __repr__ method of the Tiling class."""
     assert all_cperms_tiling == eval(repr(all_cperms_tiling))
     assert empty_tiling == eval(repr(empty_tiling)) == eval(repr(Tiling.empty_tiling()))
+
+
+def test_is_fusable():
+    """Test the fusability checks agree with splitting the fused tiling."""
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 1))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 1), (0, 1))),
+        ],
+        [],
+        (1, 2),
+    )
+    assert tiling.fusability_check(True, 0).is_fusable()
+    assert tiling.is_fusable(True, 0)
+    not_fusable = tiling.add_obstruction(
+        GriddedCayleyPerm(CayleyPermutation((0, 0)), ((0, 1), (0, 1)))
+    )
+    assert not not_fusable.fusability_check(True, 0).is_fusable()
+    assert not not_fusable.is_fusable(True, 0)
+    positive = tiling.add_requirement_list(
+        [GriddedCayleyPerm(CayleyPermutation((0,)), ((0, 0),))]
+    )
+    assert not positive.fusability_check(True, 0).is_fusable()
+    assert not positive.is_fusable(True, 0)
+    for til in (tiling, not_fusable, positive):
+        for fuse_rows in (True, False):
+            for index in range(til.dimensions[fuse_rows] - 1):
+                unfused = til.fuse(fuse_rows, index).split_row_or_col(fuse_rows, index)
+                assert til.is_fusable(fuse_rows, index) == (unfused == til)
+
+
+def test_count_gridded_cayley_permutations(all_cperms_tiling):
+    """Test the counts agree with generating the gridded Cayley permutations."""
+    assert [
+        all_cperms_tiling.count_gridded_cayley_permutations(n) for n in range(6)
+    ] == [
+        1,
+        1,
+        3,
+        13,
+        75,
+        541,
+    ]
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0, 0)), ((0, 0), (1, 0))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0))),
+            GriddedCayleyPerm(CayleyPermutation((1, 0)), ((0, 1), (1, 1))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1, 2)), ((1, 0), (1, 0), (1, 1))),
+        ],
+        [
+            [
+                GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (1, 1))),
+                GriddedCayleyPerm(CayleyPermutation((0,)), ((1, 0),)),
+            ]
+        ],
+        (2, 2),
+    )
+    for n in range(6):
+        assert tiling.count_gridded_cayley_permutations(n) == sum(
+            1 for _ in tiling.gridded_cayley_permutations(n)
+        )
+    assert tiling.initial_conditions(5) == [
+        sum(1 for _ in tiling.gridded_cayley_permutations(n)) for n in range(6)
+    ]
+
+
+def test_random_gridded_cayley_perm():
+    """Test the sampler only draws gridded Cayley permutations on the tiling and
+    draws each of them."""
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0, 0)), ((0, 0), (1, 0))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0))),
+            GriddedCayleyPerm(CayleyPermutation((1, 0)), ((0, 1), (1, 1))),
+        ],
+        [[GriddedCayleyPerm(CayleyPermutation((0,)), ((1, 0),))]],
+        (2, 2),
+    )
+    rng = Random(0)
+    objects = set(tiling.gridded_cayley_permutations(3))
+    assert tiling.sampler.count(3) == len(objects)
+    samples = set(
+        tiling.random_gridded_cayley_perm(3, rng) for _ in range(20 * len(objects))
+    )
+    assert samples == objects
+    assert all(
+        tiling.gcp_in_tiling(tiling.random_gridded_cayley_perm(8, rng))
+        for _ in range(10)
+    )
+    with pytest.raises(ValueError):
+        tiling.random_gridded_cayley_perm(0, rng)
+
+
+def test_cell_accessors():
+    """Test the cell accessors read the obstructions and requirements correctly."""
+    point = GriddedCayleyPerm(CayleyPermutation((0,)), ((1, 0),))
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0,)), ((0, 1),)),
+            GriddedCayleyPerm(CayleyPermutation((0, 0)), ((1, 0), (1, 0))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((1, 0), (1, 0))),
+            GriddedCayleyPerm(CayleyPermutation((1, 0)), ((1, 0), (1, 0))),
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0))),
+        ],
+        [[point]],
+        (2, 2),
+    )
+    assert tiling.empty_cells() == {(0, 1)}
+    assert tiling.active_cells == {(0, 0), (1, 0), (1, 1)}
+    assert tiling.positive_cells() == tiling.point_cells() == {(1, 0)}
+    assert tiling.single_value_cells() == tiling.single_position_cells() == {(1, 0)}
+    assert tiling.cells_in_row(0) == {(0, 0), (1, 0)}
+    assert tiling.cells_in_col(0) == {(0, 0)}
+    assert tiling.cells_in_col(2) == set()
+    assert tiling.has_obstruction(
+        GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0)))
+    )
+    by_col, _ = tiling.obs_by_col_and_row()
+    assert len(by_col[1]) == 3 and not by_col[2]
+    assert tiling.reqs_by_col_and_row()[1][0] == {(point,)}
+
+
+def test_minimum_size_of_object(all_cperms_tiling, empty_tiling):
+    """Test the minimum size agrees with the smallest generated object."""
+    assert all_cperms_tiling.minimum_size_of_object() == 0
+    assert empty_tiling.is_empty() and empty_tiling.minimum_size_of_object() == 0
+    tiling = Tiling(
+        [GriddedCayleyPerm(CayleyPermutation((0, 0)), ((0, 0), (1, 0)))],
+        [
+            [GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (0, 0)))],
+            [
+                GriddedCayleyPerm(CayleyPermutation((1, 0)), ((0, 0), (1, 0))),
+                GriddedCayleyPerm(CayleyPermutation((0, 0, 0)), ((1, 0),) * 3),
+            ],
+        ],
+        (2, 1),
+    )
+    assert not tiling.is_empty()
+    assert tiling.minimum_size_of_object() == 3
+    assert not any(True for size in range(3) for _ in tiling.objects_of_size(size))
+    assert any(True for _ in tiling.objects_of_size(3))
+
+
+def test_symmetries():
+    """Test the symmetries of a tiling map its objects to those of the image."""
+    tiling = Tiling(
+        [
+            GriddedCayleyPerm(CayleyPermutation((0, 1)), ((0, 0), (1, 1))),
+            GriddedCayleyPerm(CayleyPermutation((0, 0)), ((0, 0), (0, 0))),
+            GriddedCayleyPerm(CayleyPermutation((1, 0, 0)), ((1, 1),) * 3),
+        ],
+        [[GriddedCayleyPerm(CayleyPermutation((0,)), ((1, 0),))]],
+        (2, 2),
+    )
+    for symmetry in ("reverse", "complement", "reverse_complement"):
+        image = getattr(tiling, symmetry)()
+        assert getattr(image, symmetry)() == tiling
+        for size in range(5):
+            assert set(image.objects_of_size(size)) == {
+                getattr(gcp, symmetry)(tiling.dimensions)
+                for gcp in tiling.objects_of_size(size)
+            }
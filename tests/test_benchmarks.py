@@ -0,0 +1,27 @@
+"""Tests for the benchmark suite."""
+
+from benchmarks import BENCHMARKS, LEVELS, compare, run_benchmarks
+
+
+def test_benchmark_levels():
+    """Test every level has a benchmark and every benchmark has a known level."""
+    assert {bench.level for bench in BENCHMARKS.values()} == set(LEVELS)
+
+
+def test_run_and_compare():
+    """Test running a benchmark records its times and memory, and comparing
+    results only reports benchmarks which got slower than the tolerance."""
+    results = run_benchmarks(["core"], "occurrences_in")
+    assert list(results["benchmarks"]) == ["occurrences_in"]
+    result = results["benchmarks"]["occurrences_in"]
+    assert len(result["times"]) == 5
+    assert result["time"] == min(result["times"])
+    assert result["peak_memory"] > 0
+    assert not compare(results, results)
+    assert not compare(results, {"benchmarks": {}})
+    slower = {"benchmarks": {"occurrences_in": dict(result, time=result["time"] * 2)}}
+    regressions = compare(slower, results)
+    assert len(regressions) == 1
+    regression = regressions[0]
+    assert regression.startswith("occurrences_in: time went from")
+    assert not compare(slower, results, tolerance=1.5)
@@ -2,11 +2,20 @@
 
 from itertools import combinations
 from typing import List, Iterator
-from cayley_permutations import CayleyPermutation, Av
-from check_regular_ins_enc.check_regular_vert import checks_vert_type
-from check_regular_ins_enc import regular_horizontal_insertion_encoding
-from check_regular_ins_enc.check_regular_hori import dec_left
-
+from cayley_permutations import CayleyPermutation, Av, string_to_basis
+from check_regular_ins_enc.check_regular_vert import (
+    checks_vert_type,
+    vertical_juxtaposition_mask,
+)
+from check_regular_ins_enc import (
+    regular_horizontal_insertion_encoding,
+    regular_vertical_insertion_encoding,
+)
+from check_regular_ins_enc.check_regular_hori import (
+    checks_hori_type,
+    dec_left,
+    horizontal_juxtaposition_mask,
+)
 
 decreasing = [CayleyPermutation([0, 0]), CayleyPermutation([0, 1])]
 increasing = [CayleyPermutation([0, 0]), CayleyPermutation([1, 0])]
@@ -155,3 +164,23 @@ def test_hori_regular_check_pass():
     """Test that this class should pass."""
     assert regular_horizontal_insertion_encoding("132, 213")
     assert dec_left([1, 0, 2], 1)
+
+
+def test_juxtaposition_masks():
+    """Test the cached masks agree with checking each juxtaposition type."""
+    for size in range(1, 5):
+        for cperm in CayleyPermutation.of_size(size):
+            vert_mask = vertical_juxtaposition_mask(tuple(cperm))
+            hori_mask = horizontal_juxtaposition_mask(tuple(cperm))
+            for i in range(3):
+                for j in range(3):
+                    assert bool(vert_mask & 1 << (3 * i + j)) == checks_vert_type(
+                        list(cperm), (i, j)
+                    )
+            for i in range(2):
+                for j in range(2):
+                    assert bool(hori_mask & 1 << (2 * i + j)) == checks_hori_type(
+                        list(cperm), (i, j)
+                    )
+    assert regular_vertical_insertion_encoding(frozenset(string_to_basis("01_10")))
+    assert not regular_vertical_insertion_encoding(())
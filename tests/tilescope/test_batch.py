@@ -0,0 +1,58 @@
+"""Tests for running TileScope on a batch of bases."""
+
+import json
+import time
+
+import pytest
+
+from tilescope import batch
+from tilescope.batch import get_pack, run_batch, run_class, start_tiling, unique_bases
+
+
+def test_unique_bases():
+    """Test bases with the same lex_min are marked as duplicates."""
+    assert [
+        duplicate
+        for _, _, duplicate in unique_bases(
+            ["231,312,2121", "012_021", "132_213_1212", "231_312_2121"]
+        )
+    ] == [False, False, True, True]
+
+
+def test_get_pack():
+    """Test packs are found by name."""
+    root = start_tiling("012_021")
+    assert get_pack("point_placement", root).name == "point_placement"
+    assert get_pack("point_placement_with_verification", root)
+    with pytest.raises(ValueError):
+        get_pack("make_pack", root)
+
+
+def test_run_batch(tmp_path):
+    """Test the results of a batch are written as JSON lines."""
+    bases = tmp_path / "bases.txt"
+    bases.write_text("# pop-stack sortable\n231,312,2121\n\n132_213_1212\n012_021\n")
+    output = tmp_path / "results.jsonl"
+    run_batch(str(bases), "point_placement", str(output), processes=1, count_to=6)
+    results = {
+        result["basis"]: result
+        for result in map(json.loads, output.read_text().splitlines())
+    }
+    assert results["132_213_1212"]["status"] == "duplicate"
+    assert results["231,312,2121"]["counts"] == [1, 1, 3, 11, 41, 151]
+    assert results["012_021"]["counts"] == [1, 1, 3, 11, 43, 171]
+    assert results["012_021"]["status"] == "found"
+    assert "specification" in results["012_021"]
+
+
+def test_run_class_timeout(monkeypatch):
+    """Test a class is stopped after max_time even if the searcher does not check
+    the time."""
+
+    def auto_search(self, **kwargs):  # pylint: disable=unused-argument
+        time.sleep(10)
+
+    monkeypatch.setattr(batch.TileScope, "auto_search", auto_search)
+    result = run_class(("012_021", "point_placement", 1, 6))
+    assert result["status"] == "timeout"
+    assert result["time"] < 5
@@ -0,0 +1,246 @@
+"""Tests for the TileScope searcher."""
+
+import pickle
+from random import Random
+
+import pytest
+from comb_spec_searcher.exception import ExceededMaxtimeError
+
+from cayley_permutations import string_to_basis
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+from tilescope import TileScope, TileScopePack
+from tilescope.cost_queue import CostQueue
+from tilescope.rule_cache import RuleCache
+from tilescope.searcher import compress, decompress
+
+
+def test_parallel_expansion():
+    """Test expanding in worker processes finds a correct specification."""
+    start_class = Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis("012_021")],
+        [],
+        (1, 1),
+    )
+    searcher = TileScope(start_class, TileScopePack.point_placement(), workers=2)
+    spec = searcher.auto_search()
+    assert searcher.pool is None
+    assert [spec.count_objects_of_size(i) for i in range(8)] == [
+        1,
+        1,
+        3,
+        11,
+        43,
+        171,
+        683,
+        2731,
+    ]
+    reloaded = pickle.loads(pickle.dumps(searcher))
+    assert reloaded.strategy_index.keys() == {
+        id(strategy) for strategy in reloaded.strategies
+    }
+
+
+def test_compress():
+    """Test tilings survive being sent to a worker."""
+    tiling = Tiling(
+        [GriddedCayleyPerm((0, 1), ((0, 0), (1, 0)))],
+        [[GriddedCayleyPerm((0,), ((1, 0),)), GriddedCayleyPerm((0,), ((0, 0),))]],
+        (2, 1),
+    )
+    assert decompress(compress(tiling)) == tiling
+
+
+def test_checkpoint_and_resume(tmp_path):
+    """Test a search stopped by the time limit can be resumed from its checkpoint."""
+    start_class = Tiling(
+        [
+            GriddedCayleyPerm(p, [(0, 0) for _ in p])
+            for p in string_to_basis("231,312,2121")
+        ],
+        [],
+        (1, 1),
+    )
+    checkpoint = str(tmp_path / "search.ckpt")
+    searcher = TileScope(start_class, TileScopePack.point_placement())
+    with pytest.raises(ExceededMaxtimeError):
+        searcher.auto_search(max_expansion_time=0, checkpoint=checkpoint)
+    reloaded = TileScope.load_checkpoint(checkpoint)
+    assert reloaded.start_class == start_class
+    assert reloaded.classdb.get_label(start_class) == searcher.start_label
+    spec = TileScope.resume(checkpoint)
+    assert [spec.count_objects_of_size(i) for i in range(8)] == [
+        1,
+        1,
+        3,
+        11,
+        41,
+        151,
+        553,
+        2023,
+    ]
+
+
+def test_pickled_tiling_drops_cached_data():
+    """Test pickling a tiling does not store the data cached on it."""
+    tiling = Tiling([GriddedCayleyPerm((0, 1), ((0, 0), (0, 0)))], [], (1, 1))
+    assert tiling.active_cells and tiling.count_gridded_cayley_permutations(3) == 4
+    reloaded = pickle.loads(pickle.dumps(tiling))
+    assert reloaded == tiling
+    assert "counter" not in reloaded.__dict__
+    assert reloaded.active_cells == tiling.active_cells
+
+
+def test_profiling(tmp_path):
+    """Test a profiled search records the strategies and internal methods."""
+    start_class = Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis("012_021")],
+        [],
+        (1, 1),
+    )
+    searcher = TileScope(start_class, TileScopePack.point_placement(), profile=True)
+    searcher.auto_search()
+    profiler = searcher.profiler
+    assert Tiling.is_empty.__name__ == "is_empty" and not hasattr(
+        Tiling.is_empty, "__wrapped__"
+    )
+    assert profiler.calls["GriddedCayleyPerm.occurrences_in"] > 0
+    assert profiler.calls["SimplifyObstructionsAndRequirements.simplify"] > 0
+    assert sum(profiler.rules_kept.values()) > 0
+    assert all(
+        profiler.rules_kept[name] <= profiler.rules_produced[name]
+        for name in profiler.rules_produced
+    )
+    assert "Profile:" in searcher.status(elaborate=False)
+    profiler.dump_json(str(tmp_path / "profile.json"))
+    profiler.dump_collapsed(str(tmp_path / "profile.folded"))
+    for line in (tmp_path / "profile.folded").read_text().splitlines():
+        stack, microseconds = line.rsplit(" ", 1)
+        assert stack and int(microseconds) > 0
+
+
+def test_rule_cache(tmp_path):
+    """Test a second search reuses the rules cached by the first."""
+    start_class = Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis("012_021")],
+        [],
+        (1, 1),
+    )
+    path = str(tmp_path / "rules.db")
+    counts = []
+    for _ in range(2):
+        cache = RuleCache(path)
+        searcher = TileScope(
+            start_class, TileScopePack.point_placement(), rule_cache=cache
+        )
+        spec = searcher.auto_search()
+        counts.append([spec.count_objects_of_size(i) for i in range(8)])
+        cache.close()
+    assert counts[0] == counts[1] == [1, 1, 3, 11, 43, 171, 683, 2731]
+    assert cache.hits > 0 and cache.misses < cache.hits
+    assert "Rule cache:" in searcher.status(elaborate=False)
+
+
+def test_rule_cache_eviction(tmp_path):
+    """Test the least recently used rules are removed when the cache is full."""
+    cache = RuleCache(str(tmp_path / "rules.db"), max_size=1000)
+    rules = [Random(i).randbytes(400) for i in range(3)]
+    for i, rule in enumerate(rules):
+        cache.put(str(i), rule)
+    assert cache.get("0") is None
+    assert cache.get("2") == rules[2]
+    assert len(cache) == 2 and cache.size() <= 1000
+    cache.close()
+
+
+def test_rule_cache_last_used(tmp_path):
+    """Test the times rules are used are kept until they are written, and are
+    used to choose the rules to evict."""
+    path = str(tmp_path / "rules.db")
+    cache = RuleCache(path, max_size=1000)
+    rules = [Random(i).randbytes(400) for i in range(3)]
+    cache.put("0", rules[0])
+    cache.put("1", rules[1])
+    assert cache.get("0") == rules[0]
+    cache.put("2", rules[2])
+    assert cache.get("1") is None
+    assert cache.get("2") == rules[2]
+    cache.close()
+    cache = RuleCache(path, max_size=1000)
+    cache.put("1", rules[1])
+    assert cache.get("0") is None and cache.get("2") == rules[2]
+    cache.close()
+
+
+def test_symmetries():
+    """Test a search with symmetries only expands one tiling of each symmetry
+    class and finds a correct specification."""
+    start_class = Tiling(
+        [
+            GriddedCayleyPerm(p, [(0, 0) for _ in p])
+            for p in string_to_basis("231,312,2121")
+        ],
+        [],
+        (1, 1),
+    )
+    pack = TileScopePack.point_placement()
+    searcher = TileScope(start_class, pack)
+    symmetry_searcher = TileScope(start_class, pack.add_all_symmetries())
+    spec = symmetry_searcher.auto_search()
+    searcher.auto_search()
+    assert [spec.count_objects_of_size(i) for i in range(8)] == [
+        1,
+        1,
+        3,
+        11,
+        41,
+        151,
+        553,
+        2023,
+    ]
+    assert len(symmetry_searcher.classdb.label_to_info) < len(
+        searcher.classdb.label_to_info
+    )
+
+
+def test_cost_queue():
+    """Test a search expanding the cheapest tilings first finds a correct
+    specification, and times the expansions."""
+    start_class = Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis("012_021")],
+        [],
+        (1, 1),
+    )
+    searcher = TileScope(start_class, TileScopePack.point_placement(), cost_queue=True)
+    assert isinstance(searcher.classqueue, CostQueue)
+    spec = searcher.auto_search()
+    assert [spec.count_objects_of_size(i) for i in range(7)] == [
+        1,
+        1,
+        3,
+        11,
+        43,
+        171,
+        683,
+    ]
+    assert searcher.classqueue.expanded > 0
+    assert sum(searcher.classqueue.times) > 0
+    assert "expanding cheapest tilings first" in searcher.status(False)
+
+
+def test_cost_queue_pickled():
+    """Test the cost queue still records expansions after it is pickled, when its
+    strategies are new objects."""
+    start_class = Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis("012")],
+        [],
+        (1, 1),
+    )
+    searcher = TileScope(start_class, TileScopePack.point_placement(), cost_queue=True)
+    reloaded = pickle.loads(pickle.dumps(searcher))
+    queue = reloaded.classqueue
+    assert isinstance(queue, CostQueue)
+    for idx, strategies in enumerate(queue.expansion_strats):
+        strategy = pickle.loads(pickle.dumps(strategies[-1]))
+        queue.record_expansion(0, (strategy,), 1.0)
+        assert queue.times[idx] == 1.0
+        assert queue.costs[idx] == queue.cost(0)
@@ -0,0 +1,38 @@
+"""Tests for checking specifications against brute force counts."""
+
+from cayley_permutations import string_to_basis
+from tilescope import TileScope, TileScopePack
+from tilescope.batch import start_tiling
+from tilescope.validation import CountCache, ValidationReport, validate_specification
+
+
+def test_validate_specification(tmp_path):
+    """Test a specification agrees with brute force, using the cache the second
+    time for a symmetric class."""
+    spec = TileScope(
+        start_tiling("231_312_2121"), TileScopePack.point_placement()
+    ).auto_search()
+    cache = CountCache(str(tmp_path / "counts.db"))
+    report = validate_specification(spec, "231_312_2121", 6, cache)
+    assert report.is_valid()
+    assert report.brute_force_counts == [1, 1, 3, 11, 41, 151, 553]
+    assert cache.get(tuple(string_to_basis("132_213_1212"))) == [
+        1,
+        1,
+        3,
+        11,
+        41,
+        151,
+        553,
+    ]
+    cache.put(tuple(string_to_basis("231_312_2121")), [1, 1, 3, 11, 40])
+    assert len(cache.get(tuple(string_to_basis("231_312_2121")))) == 7
+    assert validate_specification(spec, "132_213_1212", 5, cache).is_valid()
+
+
+def test_mismatches():
+    """Test the sizes where the counts differ are reported."""
+    report = ValidationReport("012_021", [1, 1, 3, 11, 43], [1, 1, 3, 12, 44])
+    assert not report.is_valid()
+    assert report.mismatches == [(3, 11, 12), (4, 43, 44)]
+    assert "size 3: 11 from the specification, 12 by brute force" in str(report)
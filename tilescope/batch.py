@@ -0,0 +1,215 @@
+"""
+Module for running TileScope on many bases, one class per worker process.
+
+The bases are read from a file with one basis per line, in any form accepted by
+string_to_basis, and blank lines and lines starting with # are skipped. Bases
+which are the same up to symmetry, so have the same lex_min, are only searched
+once. Each class is searched in its own process with a limit on the expansion
+time and, on Unix, the total time and the memory, and the result is written to
+the output as a line of JSON as soon as it is done.
+
+It can be run from the command line, e.g.
+
+    python -m tilescope.batch bases.txt point_placement results.jsonl --processes 4
+"""
+
+import argparse
+import inspect
+import json
+import logging
+import signal
+import time
+from multiprocessing import Pool
+from typing import Iterator, Optional
+
+import logzero  # type: ignore[import-untyped]
+from comb_spec_searcher.exception import ExceededMaxtimeError
+
+from cayley_permutations import CayleyPermutation, string_to_basis
+from cayley_permutations.simplify_basis import lex_min
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+from .searcher import TileScope
+from .strategy_packs import TileScopePack
+
+# A class to search: (basis, pack name, expansion time, number of terms to count).
+Job = tuple[str, str, Optional[int], int]
+
+
+def read_bases(path: str) -> list[str]:
+    """Return the bases in the file, one per line."""
+    with open(path, encoding="utf-8") as bases_file:
+        return [
+            line.strip()
+            for line in bases_file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+
+
+def basis_to_string(basis: tuple[CayleyPermutation, ...]) -> str:
+    """Return the basis as a string, e.g. "012_021"."""
+    return "_".join(str(cperm) for cperm in basis)
+
+
+def unique_bases(bases: list[str]) -> Iterator[tuple[str, str, bool]]:
+    """Yield each basis with its lex_min as a string and whether an earlier basis
+    has the same lex_min."""
+    seen = set()
+    for basis in bases:
+        canonical = basis_to_string(lex_min(string_to_basis(basis)))
+        yield basis, canonical, canonical in seen
+        seen.add(canonical)
+
+
+def start_tiling(basis: str) -> Tiling:
+    """Return the 1x1 tiling for the class with the basis."""
+    return Tiling(
+        [GriddedCayleyPerm(p, [(0, 0) for _ in p]) for p in string_to_basis(basis)],
+        [],
+        (1, 1),
+    )
+
+
+def get_pack(pack_name: str, root: Tiling) -> TileScopePack:
+    """Return the TileScopePack with the name of the classmethod creating it,
+    passing the root tiling if the method needs it."""
+    method = getattr(TileScopePack, pack_name, None)
+    if (
+        method is None
+        or pack_name.startswith("_")
+        or not inspect.ismethod(method)
+        or pack_name in ("make_pack", "all_packs")
+    ):
+        raise ValueError(f"Unknown strategy pack: {pack_name}")
+    if "root" in inspect.signature(method).parameters:
+        return method(root)
+    return method()
+
+
+def _initialise_worker(max_memory: Optional[int]) -> None:
+    """Limit the memory of the worker process to max_memory megabytes and only
+    log warnings."""
+    logzero.loglevel(logging.WARNING)
+    if max_memory is not None:
+        import resource  # pylint: disable=import-outside-toplevel
+
+        limit = max_memory * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _raise_timeout(signum, frame) -> None:
+    """Signal handler stopping a class which has run for longer than max_time."""
+    raise ExceededMaxtimeError
+
+
+def run_class(job: Job) -> dict:
+    """Search for a specification for the class and return the result as a
+    dictionary of JSON types. The status is "found", "timeout", "memory" or
+    "error" and, if a specification was found, the result contains it and the
+    counts of the class.
+
+    The expansion time is limited to max_time and, on Unix, an alarm stops the
+    whole search and count after max_time seconds, as a single expansion or the
+    counting can take much longer than the searcher checks the time."""
+    basis, pack_name, max_time, count_to = job
+    result: dict = {"basis": basis, "pack": pack_name}
+    start = time.time()
+    alarm = hasattr(signal, "SIGALRM")
+    if alarm and max_time is not None:
+        signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(max(max_time, 1))
+    try:
+        root = start_tiling(basis)
+        searcher = TileScope(root, get_pack(pack_name, root))
+        spec = searcher.auto_search(max_expansion_time=max_time)
+        result["counts"] = [spec.count_objects_of_size(n) for n in range(count_to)]
+        result["specification"] = spec.to_jsonable()
+        result["status"] = "found"
+    except ExceededMaxtimeError:
+        result["status"] = "timeout"
+        result["reason"] = f"No specification found in {max_time} seconds."
+    except MemoryError:
+        result["status"] = "memory"
+        result["reason"] = "Ran out of memory."
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        result["status"] = "error"
+        result["reason"] = f"{type(error).__name__}: {error}"
+    finally:
+        if alarm:
+            signal.alarm(0)
+    result["time"] = time.time() - start
+    return result
+
+
+def run_batch(
+    bases_path: str,
+    pack_name: str,
+    output_path: str,
+    *,
+    processes: Optional[int] = None,
+    max_time: Optional[int] = 600,
+    max_memory: Optional[int] = None,
+    count_to: int = 10,
+) -> None:
+    """
+    Search for specifications for the classes with the bases in the file using
+    the pack, in processes worker processes, and write the results to the output
+    as JSON lines in the order they finish. Bases with the same lex_min as an
+    earlier basis are not searched, and are written with status "duplicate".
+
+    max_time: the maximum expansion time in seconds for each class.
+    max_memory: the maximum memory in megabytes for each worker process.
+    count_to: the number of terms of each class found to count.
+    """
+    # pylint: disable=too-many-arguments, too-many-locals
+    get_pack(pack_name, Tiling.empty_tiling())
+    jobs: list[Job] = []
+    lex_mins: dict[str, str] = {}
+    with open(output_path, "w", encoding="utf-8") as output:
+        for basis, canonical, duplicate in unique_bases(read_bases(bases_path)):
+            if duplicate:
+                line = {"basis": basis, "lex_min": canonical, "status": "duplicate"}
+                output.write(json.dumps(line) + "\n")
+            else:
+                jobs.append((basis, pack_name, max_time, count_to))
+                lex_mins[basis] = canonical
+        output.flush()
+        with Pool(
+            processes, _initialise_worker, (max_memory,), maxtasksperchild=1
+        ) as pool:
+            for result in pool.imap_unordered(run_class, jobs):
+                result["lex_min"] = lex_mins[result["basis"]]
+                output.write(json.dumps(result) + "\n")
+                output.flush()
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run a batch from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Run TileScope on each basis in a file."
+    )
+    parser.add_argument("bases", help="file with one basis per line")
+    parser.add_argument("pack", help="name of a TileScopePack, e.g. point_placement")
+    parser.add_argument("output", help="file to write the JSON lines to")
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument(
+        "--max-time", type=int, default=600, help="expansion time per class"
+    )
+    parser.add_argument(
+        "--max-memory", type=int, default=None, help="megabytes per process"
+    )
+    parser.add_argument("--count-to", type=int, default=10)
+    args = parser.parse_args(argv)
+    run_batch(
+        args.bases,
+        args.pack,
+        args.output,
+        processes=args.processes,
+        max_time=args.max_time,
+        max_memory=args.max_memory,
+        count_to=args.count_to,
+    )
+
+
+if __name__ == "__main__":
+    main()
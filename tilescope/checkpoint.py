@@ -0,0 +1,114 @@
+"""
+Module containing the CheckpointableSearcher class, a searcher which saves its
+state to disk during an auto search so that the search can be resumed later.
+
+The checkpoint is the pickled searcher, which contains the class database, rule
+database, class queue and strategy pack, compressed with zlib. It is written to a
+temporary file first and then moved into place, so a process killed while writing
+never leaves a broken checkpoint behind.
+"""
+
+import os
+import pickle
+import time
+import zlib
+from typing import Optional, Type, TypeVar
+
+from comb_spec_searcher import (
+    CombinatorialSpecification,
+    CombinatorialSpecificationSearcher,
+)
+from comb_spec_searcher.exception import ExceededMaxtimeError
+from logzero import logger  # type: ignore[import-untyped]
+
+SearcherT = TypeVar("SearcherT", bound="CheckpointableSearcher")
+
+
+class CheckpointableSearcher(CombinatorialSpecificationSearcher):
+    """
+    A searcher which, if auto_search is given a checkpoint path, saves its state to
+    that path every checkpoint_interval seconds and when the maximum expansion time
+    is exceeded. Use resume to continue the search from the checkpoint.
+    """
+
+    checkpoint_path: Optional[str] = None
+    checkpoint_interval: float = 600
+    last_checkpoint: float = 0
+
+    def auto_search(
+        self,
+        *,
+        checkpoint: Optional[str] = None,
+        checkpoint_interval: float = 600,
+        **kwargs,
+    ) -> CombinatorialSpecification:
+        """
+        Run the auto search of CombinatorialSpecificationSearcher. If checkpoint is
+        a path, the state of the searcher is saved there periodically, at the end of
+        an expansion round, so that the search can be continued with resume.
+        """
+        if checkpoint is not None:
+            self.checkpoint_path = checkpoint
+            self.checkpoint_interval = checkpoint_interval
+        self.last_checkpoint = time.time()
+        try:
+            return super().auto_search(**kwargs)
+        except ExceededMaxtimeError:
+            if self.checkpoint_path is not None:
+                self.save_checkpoint(self.checkpoint_path)
+            raise
+
+    def _expand_classes_for(
+        self,
+        expansion_time: float,
+        status_update: Optional[int],
+        status_start: float,
+        auto_search_start: float,
+    ) -> tuple[bool, float]:
+        result = super()._expand_classes_for(
+            expansion_time, status_update, status_start, auto_search_start
+        )
+        self.checkpoint_if_due()
+        return result
+
+    def checkpoint_if_due(self) -> None:
+        """Save a checkpoint if checkpointing and the interval has passed."""
+        if (
+            self.checkpoint_path is not None
+            and time.time() - self.last_checkpoint >= self.checkpoint_interval
+        ):
+            self.save_checkpoint(self.checkpoint_path)
+
+    def save_checkpoint(self, path: str) -> None:
+        """Save the state of the searcher to the path."""
+        start = time.time()
+        data = zlib.compress(pickle.dumps(self, pickle.HIGHEST_PROTOCOL))
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as checkpoint_file:
+            checkpoint_file.write(data)
+        os.replace(temporary_path, path)
+        self.last_checkpoint = time.time()
+        logger.info(
+            "Saved checkpoint of %s bytes to %s in %.2f seconds.",
+            len(data),
+            path,
+            self.last_checkpoint - start,
+        )
+
+    @classmethod
+    def load_checkpoint(cls: Type[SearcherT], path: str) -> SearcherT:
+        """Return the searcher saved at the path."""
+        with open(path, "rb") as checkpoint_file:
+            searcher = pickle.loads(zlib.decompress(checkpoint_file.read()))
+        if not isinstance(searcher, cls):
+            raise ValueError(f"The checkpoint {path} is not a {cls.__name__}.")
+        return searcher
+
+    @classmethod
+    def resume(cls, path: str, **kwargs) -> CombinatorialSpecification:
+        """Continue the auto search saved at the path, checkpointing to the same
+        path. The keyword arguments are passed to auto_search."""
+        searcher = cls.load_checkpoint(path)
+        kwargs.setdefault("checkpoint", path)
+        kwargs.setdefault("checkpoint_interval", searcher.checkpoint_interval)
+        return searcher.auto_search(**kwargs)
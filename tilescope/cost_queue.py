@@ -0,0 +1,167 @@
+"""
+Module containing the CostQueue class, a class queue which expands the cheapest
+tilings first instead of in levels.
+
+The cost of a tiling is an estimate of how long the expansion strategies take to
+apply to it, from its dimensions, number of active cells and the total size of
+its obstructions and requirements. This is scaled for each set of expansion
+strategies by how long that set has taken per unit of cost on the tilings
+expanded so far. Labels wait in a heap ordered by cost, plus a small amount for
+each label added before them, so expensive tilings are delayed but never left
+behind forever.
+"""
+
+import heapq
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import tabulate
+from comb_spec_searcher.class_queue import DefaultQueue
+from comb_spec_searcher.strategies.strategy_pack import StrategyPack
+from comb_spec_searcher.typing import CSSstrategy, WorkPacket
+
+from gridded_cayley_permutations import Tiling
+
+if TYPE_CHECKING:
+    from .searcher import TileScope
+
+
+def tiling_cost(tiling: Tiling) -> int:
+    """Return the estimated cost of expanding the tiling.
+
+    >>> from gridded_cayley_permutations import GriddedCayleyPerm
+    >>> from cayley_permutations import CayleyPermutation
+    >>> tiling_cost(Tiling([GriddedCayleyPerm(CayleyPermutation((0, 1)),
+    ...     ((0, 0), (0, 0)))], [], (1, 1)))
+    4
+    """
+    return (
+        tiling.dimensions[0] * tiling.dimensions[1]
+        + len(tiling.active_cells)
+        + sum(len(ob) for ob in tiling.obstructions)
+        + sum(len(req) for req_list in tiling.requirements for req in req_list)
+    )
+
+
+class CostQueue(DefaultQueue):
+    """
+    A queue which applies the inferral and initial strategies to labels in the
+    order they are added, like DefaultQueue, and then applies each set of
+    expansion strategies to the label with the lowest cost. The searcher records
+    the time each expansion takes with record_expansion.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+
+    def __init__(
+        self, pack: StrategyPack, tilescope: "TileScope", ageing: float = 0.1
+    ) -> None:
+        super().__init__(pack)
+        self.tilescope = tilescope
+        self.ageing = ageing
+        # (priority, order added, label, index of the expansion set)
+        self.heap: list[tuple[float, int, int, int]] = []
+        self.queued: set[int] = set()
+        self.label_costs: dict[int, int] = {}
+        self.times = [0.0 for _ in self.expansion_strats]
+        self.costs = [0 for _ in self.expansion_strats]
+        self.added = 0
+        self.expanded = 0
+
+    def cost(self, label: int) -> int:
+        """Return the cost of the tiling with the label."""
+        cost = self.label_costs.get(label)
+        if cost is None:
+            cost = tiling_cost(self.tilescope.classdb.get_class(label))
+            self.label_costs[label] = cost
+        return cost
+
+    def time_factor(self, idx: int) -> float:
+        """Return the time taken per unit of cost by the expansion set with the
+        index, relative to all the sets. This is 1 until the set has been timed."""
+        total_costs = sum(self.costs)
+        if not self.costs[idx] or not total_costs or not sum(self.times):
+            return 1.0
+        return (self.times[idx] / self.costs[idx]) / (sum(self.times) / total_costs)
+
+    def expansion_set(self, strategy: CSSstrategy) -> Optional[int]:
+        """Return the index of the first set of expansion strategies containing the
+        strategy, or None if it is not an expansion strategy. Strategies are
+        compared by equality, so this still holds after the queue is pickled."""
+        for idx, strategies in enumerate(self.expansion_strats):
+            if strategy in strategies:
+                return idx
+        return None
+
+    def record_expansion(
+        self, label: int, strategies: tuple[CSSstrategy, ...], elapsed: float
+    ) -> None:
+        """Record the time taken to apply the strategies to the label."""
+        idx = self.expansion_set(strategies[0]) if strategies else None
+        if idx is None:
+            return
+        self.times[idx] += elapsed
+        self.costs[idx] += self.cost(label)
+
+    def _push(self, label: int, idx: int) -> None:
+        """Add the label to the heap, to be expanded with the set with the index. The
+        marker for a label which has been expanded with every set goes first, so
+        it is ignored as soon as the packets before it have been yielded."""
+        if idx == len(self.expansion_strats):
+            priority = float("-inf")
+        else:
+            priority = self.cost(label) * self.time_factor(idx)
+            priority += self.ageing * self.added
+        self.added += 1
+        heapq.heappush(self.heap, (priority, self.added, label, idx))
+
+    def _push_next_level(self) -> None:
+        """Move the labels waiting in next_level to the heap."""
+        for label in self.next_level:
+            if label not in self.queued and label not in self.ignore:
+                self.queued.add(label)
+                self._push(label, 0)
+        self.next_level.clear()
+
+    def _populate_staging(self) -> None:
+        while not self.staging and self.working:
+            self.staging.extend(self._iter_helper_working())
+        while not self.staging:
+            self._push_next_level()
+            if not self.heap:
+                raise StopIteration
+            self.staging.extend(self._iter_helper_heap())
+
+    def _iter_helper_heap(self) -> Iterator[WorkPacket]:
+        _, _, label, idx = heapq.heappop(self.heap)
+        if label in self.ignore:
+            return
+        if idx == len(self.expansion_strats):
+            self.set_stop_yielding(label)
+            return
+        self.expanded += 1
+        for strat in self.expansion_strats[idx]:
+            yield WorkPacket(label, (strat,), False)
+        self._push(label, idx + 1)
+
+    def do_level(self) -> Iterator[WorkPacket]:
+        raise NotImplementedError
+
+    def status(self) -> str:
+        status = "Queue status (expanding cheapest tilings first):\n"
+        table = [
+            ("working", f"{len(self.working):,d}"),
+            ("waiting", f"{len(self.heap):,d}"),
+            ("expanded", f"{self.expanded:,d}"),
+        ]
+        status += "    "
+        status += (
+            tabulate.tabulate(
+                table, headers=("Queue", "Size"), colalign=("left", "right")
+            ).replace("\n", "\n    ")
+            + "\n"
+        )
+        status += "\tThe time factor of each set of expansion strategies: "
+        status += ", ".join(
+            f"{self.time_factor(idx):.2f}" for idx in range(len(self.expansion_strats))
+        )
+        return status
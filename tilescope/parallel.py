@@ -0,0 +1,287 @@
+"""
+Module containing the ParallelSearcher class, a searcher which applies the
+expansion strategies in worker processes.
+
+The main process pulls work packets from the class queue, sends the class and
+strategies to the workers and adds the rules they send back, so it is the only
+process which touches the class and rule databases. Tilings are sent in the
+small form given by compress.
+"""
+
+import time
+from itertools import chain
+from multiprocessing import Pool
+from multiprocessing.pool import Pool as PoolType
+from typing import Any, Optional
+
+from comb_spec_searcher import CombinatorialSpecificationSearcher, StrategyPack
+from comb_spec_searcher.exception import StrategyDoesNotApply
+from comb_spec_searcher.strategies.rule import AbstractRule
+from comb_spec_searcher.typing import CSSstrategy, WorkPacket
+from logzero import logger  # type: ignore[import-untyped]
+
+from gridded_cayley_permutations import GriddedCayleyPerm, Tiling
+
+from .profiling import ProfiledSearcher
+
+# A rule found by a worker: (strategy, parent if not the expanded class, children).
+CompressedRule = tuple[Any, Optional[Any], tuple[Any, ...]]
+# The profile of a strategy applied by a worker: (index, time, produced, kept).
+WorkerProfile = tuple[int, float, int, int]
+
+
+def compress(comb_class: Any) -> Any:
+    """Return a small picklable form of a tiling, which is the tuple of obstructions,
+    requirements and dimensions with each gridded Cayley permutation given as its
+    pattern and positions. Other classes are returned as is."""
+    if type(comb_class) is not Tiling:  # pylint: disable=unidiomatic-typecheck
+        return comb_class
+    return (
+        tuple((tuple(ob.pattern), ob.positions) for ob in comb_class.obstructions),
+        tuple(
+            tuple((tuple(req.pattern), req.positions) for req in req_list)
+            for req_list in comb_class.requirements
+        ),
+        comb_class.dimensions,
+    )
+
+
+def decompress(data: Any) -> Any:
+    """Return the class from the form returned by compress."""
+    if not isinstance(data, tuple):
+        return data
+    obstructions, requirements, dimensions = data
+    return Tiling(
+        [GriddedCayleyPerm(patt, positions) for patt, positions in obstructions],
+        [
+            [GriddedCayleyPerm(patt, positions) for patt, positions in req_list]
+            for req_list in requirements
+        ],
+        dimensions,
+        simplify=False,
+    )
+
+
+def compress_rule(
+    rule: AbstractRule, comb_class: Any, children: tuple[Any, ...]
+) -> CompressedRule:
+    """Return the rule found by expanding the class in the form sent between
+    processes, with the parent left out if it is the class."""
+    parent = None if rule.comb_class == comb_class else compress(rule.comb_class)
+    return (rule.strategy, parent, tuple(compress(child) for child in children))
+
+
+_WORKER_STRATEGIES: tuple[CSSstrategy, ...] = ()
+
+
+def _initialise_worker(strategies: tuple[CSSstrategy, ...]) -> None:
+    """Store the strategies of the pack in the worker process."""
+    global _WORKER_STRATEGIES  # pylint: disable=global-statement
+    _WORKER_STRATEGIES = strategies
+
+
+def _expand_in_worker(
+    packet: tuple[int, Any, tuple[int, ...]],
+) -> tuple[int, list[CompressedRule], list[WorkerProfile]]:
+    """Apply the strategies with the given indices to the class with the label and
+    return the rules found, and the time taken and number of rules produced and
+    kept for each strategy."""
+    label, data, strategy_indices = packet
+    comb_class = decompress(data)
+    rules: list[CompressedRule] = []
+    profiles: list[WorkerProfile] = []
+    for idx in strategy_indices:
+        start, produced, kept = time.perf_counter(), 0, 0
+        # pylint: disable=protected-access
+        for rule in CombinatorialSpecificationSearcher._rules_from_strategy(
+            comb_class, _WORKER_STRATEGIES[idx]
+        ):
+            produced += 1
+            try:
+                children = rule.children
+            except StrategyDoesNotApply:
+                continue
+            if len(children) == 1 and rule.comb_class == children[0]:
+                continue
+            rules.append(compress_rule(rule, comb_class, children))
+            kept += 1
+        profiles.append((idx, time.perf_counter() - start, produced, kept))
+    return label, rules, profiles
+
+
+class ParallelSearcher(ProfiledSearcher):
+    """
+    A searcher which, if workers is more than 1, applies the expansion strategies
+    in that many worker processes, sending them packets_per_worker work packets
+    each at a time. Inferral strategies, and strategies not in the pack, are
+    still applied in the main process. In the worker processes only the time taken
+    by each strategy is profiled.
+
+    Subclasses can skip rules found by the workers with keep_worker_rule and
+    record the time each expansion took with record_worker_expansion.
+    """
+
+    def __init__(
+        self,
+        start_class: Any,
+        strategy_pack: StrategyPack,
+        *,
+        workers: int = 1,
+        packets_per_worker: int = 4,
+        **kwargs,
+    ) -> None:
+        self.workers = workers
+        self.packets_per_worker = packets_per_worker
+        self.pool: Optional[PoolType] = None
+        self.strategies = tuple(
+            chain(strategy_pack.initial_strats, *strategy_pack.expansion_strats)
+        )
+        self.strategy_index = self._strategy_index()
+        super().__init__(start_class, strategy_pack, **kwargs)
+
+    def _strategy_index(self) -> dict[int, int]:
+        """Return the index of each strategy sent to the workers. Strategies need not
+        be hashable, so they are looked up by identity."""
+        return {id(strategy): idx for idx, strategy in enumerate(self.strategies)}
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["pool"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.strategy_index = self._strategy_index()
+
+    def start_pool(self) -> PoolType:
+        """Return the pool of worker processes, starting it if needed."""
+        if self.pool is None:
+            self.pool = Pool(  # pylint: disable=consider-using-with
+                self.workers, _initialise_worker, (self.strategies,)
+            )
+        return self.pool
+
+    def close_pool(self) -> None:
+        """Stop the worker processes."""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def _auto_search_rules(self, **kwargs):
+        try:
+            return super()._auto_search_rules(**kwargs)
+        finally:
+            self.close_pool()
+
+    def _expand_classes_for(
+        self,
+        expansion_time: float,
+        status_update: Optional[int],
+        status_start: float,
+        auto_search_start: float,
+    ) -> tuple[bool, float]:
+        if self.workers <= 1:
+            return super()._expand_classes_for(
+                expansion_time, status_update, status_start, auto_search_start
+            )
+        return self._expand_classes_in_parallel_for(
+            expansion_time, status_update, status_start, auto_search_start
+        )
+
+    def _expand_classes_in_parallel_for(
+        self,
+        expansion_time: float,
+        status_update: Optional[int],
+        status_start: float,
+        auto_search_start: float,
+    ) -> tuple[bool, float]:
+        """Expand classes in the worker processes for expansion_time seconds. Returns
+        the same as _expand_classes_for."""
+        expansion_start = time.time()
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                logger.info("No more classes to expand.")
+                self.close_pool()
+                return False, status_start
+            self._expand_batch(batch)
+            if time.time() - expansion_start > expansion_time:
+                return True, status_start
+            if status_update is not None and time.time() - status_start > status_update:
+                self._log_status(auto_search_start, status_update)
+                status_start = time.time()
+
+    def _next_batch(self) -> list[WorkPacket]:
+        """Return the next work packets to send to the workers. Packets for inferral
+        strategies are expanded straight away in the main process."""
+        batch: list[WorkPacket] = []
+        while len(batch) < self.workers * self.packets_per_worker:
+            try:
+                packet = next(self.classqueue)
+            except StopIteration:
+                break
+            if not self.expand_verified and self.ruledb.is_verified(packet.label):
+                continue
+            if packet.inferral or any(
+                id(strategy) not in self.strategy_index
+                for strategy in packet.strategies
+            ):
+                comb_class = self.classdb.get_class(packet.label)
+                self._expand(
+                    comb_class, packet.label, packet.strategies, packet.inferral
+                )
+                continue
+            batch.append(packet)
+        return batch
+
+    def _expand_batch(self, batch: list[WorkPacket]) -> None:
+        """Expand the work packets in the worker processes and add the rules found,
+        in the order of the packets."""
+        packets = [
+            (
+                packet.label,
+                compress(self.classdb.get_class(packet.label)),
+                tuple(
+                    self.strategy_index[id(strategy)] for strategy in packet.strategies
+                ),
+            )
+            for packet in batch
+        ]
+        for label, rules, profiles in self.start_pool().imap(
+            _expand_in_worker, packets
+        ):
+            self.record_worker_expansion(label, profiles)
+            if self.profiler is not None:
+                for idx, elapsed, produced, kept in profiles:
+                    name = str(self.strategies[idx]).replace(";", ",")
+                    self.profiler.record(name, elapsed, produced, kept)
+            self._add_rules_from_worker(label, rules)
+
+    def record_worker_expansion(
+        self, label: int, profiles: list[WorkerProfile]
+    ) -> None:
+        """Called with the profile of each strategy a worker applied to the class
+        with the label, before the rules found are added."""
+
+    def keep_worker_rule(self, rule: AbstractRule) -> bool:
+        """Return True if the rule found by a worker should be added."""
+        # pylint: disable=unused-argument
+        return True
+
+    def _add_rules_from_worker(self, label: int, rules: list[CompressedRule]) -> None:
+        """Rebuild the rules sent by a worker and add them to the searcher."""
+        comb_class = self.classdb.get_class(label)
+        for strategy, parent, compressed_children in rules:
+            children = tuple(decompress(child) for child in compressed_children)
+            if parent is None:
+                start_label = label
+                rule = strategy(comb_class, children)
+            else:
+                parent_class = decompress(parent)
+                start_label = self.classdb.get_label(parent_class)
+                rule = strategy(parent_class, children)
+            if not self.keep_worker_rule(rule):
+                continue
+            end_labels = tuple(self.classdb.get_label(child) for child in children)
+            self.add_rule(start_label, end_labels, rule)
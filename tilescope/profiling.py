@@ -0,0 +1,332 @@
+"""
+Module containing the Profiler class and the ProfiledSearcher class, a searcher
+which can record where the time of a search goes.
+
+The profiler keeps a stack of frames. Each strategy applied by the searcher is a
+frame, and while a class is expanded the methods in INTERNALS are patched so that
+each call to them is a frame too. For each frame name the profiler records the
+number of calls, the total time and the time not spent in other frames (the self
+time), and for each stack of frame names the self time spent there. The latter
+is written in the collapsed stack format read by flamegraph tools.
+
+The patches are made on the classes, so any tiling made while a profiled searcher
+expands a class is timed, and they are removed once the expansion is done.
+"""
+
+import inspect
+import json
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+
+import tabulate
+from comb_spec_searcher import CombinatorialSpecificationSearcher
+from comb_spec_searcher.strategies.rule import AbstractRule
+from comb_spec_searcher.typing import CombinatorialClassType, CSSstrategy
+
+from gridded_cayley_permutations import GriddedCayleyPerm, RowColMap, Tiling
+from gridded_cayley_permutations.simplify_obstructions_and_requirements import (
+    SimplifyObstructionsAndRequirements,
+)
+
+# The methods timed while a class is expanded, as (class, method name).
+INTERNALS: tuple[tuple[type, str], ...] = (
+    (SimplifyObstructionsAndRequirements, "simplify"),
+    (Tiling, "is_empty"),
+    (GriddedCayleyPerm, "occurrences_in"),
+    (RowColMap, "preimage_of_gridded_cperm"),
+    (RowColMap, "preimage_of_obstructions"),
+    (RowColMap, "preimage_of_requirements"),
+    (RowColMap, "preimage_of_tiling"),
+)
+
+
+class Profiler:
+    """
+    Records the calls and time of named frames, and the rules produced and kept
+    for each strategy.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(self, internals: tuple[tuple[type, str], ...] = INTERNALS) -> None:
+        self.internals = internals
+        self.calls: Counter[str] = Counter()
+        self.times: dict[str, float] = defaultdict(float)
+        self.self_times: dict[str, float] = defaultdict(float)
+        self.stacks: dict[str, float] = defaultdict(float)
+        self.rules_produced: Counter[str] = Counter()
+        self.rules_kept: Counter[str] = Counter()
+        # each entry is [name, start time, time spent in child frames]
+        self._stack: list[list] = []
+        self._patched: list[tuple[type, str, Any]] = []
+        self._depth = 0
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_stack"] = []
+        state["_patched"] = []
+        state["_depth"] = 0
+        return state
+
+    def push(self, name: str) -> None:
+        """Start timing a frame with the name."""
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def pop(self) -> None:
+        """Stop timing the last frame started."""
+        name, start, child_time = self._stack[-1]
+        elapsed = time.perf_counter() - start
+        stack = ";".join(entry[0] for entry in self._stack)
+        self._stack.pop()
+        # a recursive call is already timed by the outer call
+        if all(entry[0] != name for entry in self._stack):
+            self.times[name] += elapsed
+        self.self_times[name] += elapsed - child_time
+        self.stacks[stack] += elapsed - child_time
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    @contextmanager
+    def frame(self, name: str) -> Iterator[None]:
+        """Time the body of the with statement as a call to the frame."""
+        self.calls[name] += 1
+        self.push(name)
+        try:
+            yield
+        finally:
+            self.pop()
+
+    def record(
+        self, name: str, elapsed: float, produced: int = 0, kept: int = 0
+    ) -> None:
+        """Record a call to the frame timed elsewhere, e.g. in a worker process."""
+        self.calls[name] += 1
+        self.times[name] += elapsed
+        self.self_times[name] += elapsed
+        stack = ";".join([entry[0] for entry in self._stack] + [name])
+        self.stacks[stack] += elapsed
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        self.rules_produced[name] += produced
+        self.rules_kept[name] += kept
+
+    def wrap(self, name: str, func: Callable) -> Callable:
+        """Return the function with each call to it timed as a frame."""
+        if inspect.isgeneratorfunction(func):
+
+            @wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                self.calls[name] += 1
+                generator = func(*args, **kwargs)
+                while True:
+                    self.push(name)
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        self.pop()
+                    yield item
+
+            return generator_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self.calls[name] += 1
+            self.push(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.pop()
+
+        return wrapper
+
+    @contextmanager
+    def instrumented(self) -> Iterator[None]:
+        """Time the internal methods within the body of the with statement."""
+        if self._depth == 0:
+            for owner, method in self.internals:
+                func = owner.__dict__[method]
+                self._patched.append((owner, method, func))
+                setattr(owner, method, self.wrap(f"{owner.__name__}.{method}", func))
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                while self._patched:
+                    owner, method, func = self._patched.pop()
+                    setattr(owner, method, func)
+
+    def to_jsonable(self) -> dict:
+        """Return the recorded data as a dictionary of JSON types."""
+        return {
+            "frames": {
+                name: {
+                    "calls": self.calls[name],
+                    "time": self.times[name],
+                    "self_time": self.self_times[name],
+                    "rules_produced": self.rules_produced[name],
+                    "rules_kept": self.rules_kept[name],
+                }
+                for name in self.calls
+            },
+            "stacks": dict(self.stacks),
+        }
+
+    def dump_json(self, path: str) -> None:
+        """Write the recorded data to the path as JSON."""
+        with open(path, "w", encoding="utf-8") as json_file:
+            json.dump(self.to_jsonable(), json_file, indent=2)
+
+    def collapsed(self) -> str:
+        """Return the self time of each stack in the collapsed stack format, one
+        stack per line followed by the time in microseconds."""
+        lines = []
+        for stack, seconds in sorted(self.stacks.items()):
+            microseconds = round(seconds * 1_000_000)
+            if microseconds > 0:
+                lines.append(f"{stack} {microseconds}")
+        return "\n".join(lines) + "\n"
+
+    def dump_collapsed(self, path: str) -> None:
+        """Write the collapsed stacks to the path."""
+        with open(path, "w", encoding="utf-8") as collapsed_file:
+            collapsed_file.write(self.collapsed())
+
+    def status(self) -> str:
+        """Return a table of the recorded frames, slowest first."""
+        table = []
+        for name in sorted(self.calls, key=self.times.__getitem__, reverse=True):
+            produced, kept = "-", "-"
+            if name in self.rules_produced or name in self.rules_kept:
+                produced = f"{self.rules_produced[name]:,d}"
+                kept = f"{self.rules_kept[name]:,d}"
+            table.append(
+                (
+                    name,
+                    f"{self.calls[name]:,d}",
+                    f"{self.times[name]:,.3f}",
+                    f"{self.self_times[name]:,.3f}",
+                    produced,
+                    kept,
+                )
+            )
+        headers = [
+            "",
+            "Number of\ncalls",
+            "Seconds\nspent",
+            "Seconds spent\nnot in others",
+            "Rules\nproduced",
+            "Rules\nkept",
+        ]
+        colalign = ("left", "right", "right", "right", "right", "right")
+        return (
+            "Profile:\n    "
+            + tabulate.tabulate(table, headers=headers, colalign=colalign).replace(
+                "\n", "\n    "
+            )
+            + "\n"
+        )
+
+
+class ProfiledSearcher(CombinatorialSpecificationSearcher):
+    """
+    A searcher which, if profile is True, records the time spent applying each
+    strategy and in the internal methods in INTERNALS, and the number of rules
+    each strategy produced and how many of those were kept. The profile is added
+    to the status and can be written out with the methods of the profiler.
+    """
+
+    profiler: Optional[Profiler] = None
+
+    def __init__(self, *args, profile: bool = False, **kwargs) -> None:
+        if profile:
+            self.enable_profiling()
+        super().__init__(*args, **kwargs)
+
+    def enable_profiling(self) -> Profiler:
+        """Start profiling, and return the profiler."""
+        if self.profiler is None:
+            self.profiler = Profiler()
+        return self.profiler
+
+    def disable_profiling(self) -> Optional[Profiler]:
+        """Stop profiling, and return the profiler with what was recorded."""
+        profiler, self.profiler = self.profiler, None
+        return profiler
+
+    def _expand(
+        self,
+        comb_class: CombinatorialClassType,
+        label: int,
+        strategies: tuple[CSSstrategy, ...],
+        inferral: bool,
+    ) -> None:
+        if self.profiler is None:
+            super()._expand(comb_class, label, strategies, inferral)
+            return
+        with self.profiler.instrumented():
+            super()._expand(comb_class, label, strategies, inferral)
+
+    def _expand_class_with_strategy(
+        self,
+        comb_class: CombinatorialClassType,
+        strategy_generator: CSSstrategy,
+        label: Optional[int] = None,
+        initial: bool = False,
+    ) -> Iterator[tuple[int, tuple[int, ...], AbstractRule]]:
+        rules = super()._expand_class_with_strategy(
+            comb_class, strategy_generator, label, initial
+        )
+        profiler = self.profiler
+        if profiler is None:
+            yield from rules
+            return
+        # time each step of the expansion, not the caller adding the rules
+        name = str(strategy_generator).replace(";", ",")
+        profiler.calls[name] += 1
+        profiler.rules_kept.setdefault(name, 0)
+        while True:
+            profiler.push(name)
+            try:
+                rule = next(rules)
+            except StopIteration:
+                return
+            finally:
+                profiler.pop()
+            profiler.rules_kept[name] += 1
+            yield rule
+
+    def _rules_from_strategy(  # type: ignore
+        self, comb_class: CombinatorialClassType, strategy: CSSstrategy
+    ) -> Iterator[AbstractRule]:
+        # pylint: disable=arguments-differ
+        rules = CombinatorialSpecificationSearcher._rules_from_strategy(
+            comb_class, strategy
+        )
+        if self.profiler is None:
+            yield from rules
+            return
+        name = str(strategy).replace(";", ",")
+        for rule in rules:
+            self.profiler.rules_produced[name] += 1
+            yield rule
+
+    def add_rule(
+        self, start_label: int, end_labels: tuple[int, ...], rule: AbstractRule
+    ) -> None:
+        if self.profiler is None:
+            super().add_rule(start_label, end_labels, rule)
+            return
+        with self.profiler.frame("add_rule"):
+            super().add_rule(start_label, end_labels, rule)
+
+    def status(self, elaborate: bool) -> str:
+        status = super().status(elaborate)
+        if self.profiler is not None:
+            status += "\n" + self.profiler.status()
+        return status
@@ -0,0 +1,175 @@
+"""
+Module containing the RuleCache class, an on-disk cache of the rules found by
+applying a strategy to a class, shared between searches.
+
+The cache is an SQLite database mapping a key made from the class and strategy to
+the compressed pickle of the rules found. Each entry records when it was last used
+and, once the total size of the entries is more than max_size bytes, the least
+recently used entries are removed. The times entries are used are kept in memory
+and written with the next put, every FLUSH_EVERY hits or when the cache is closed,
+so a hit does not commit to the database.
+"""
+
+import hashlib
+import pickle
+import sqlite3
+import time
+import zlib
+from typing import Any, Optional
+
+from logzero import logger  # type: ignore[import-untyped]
+
+
+class SQLiteCache:
+    """
+    A cache stored in the SQLite database at the path. The database is opened when
+    first used, creating the tables with the statements in SCHEMA, and is not
+    pickled with the cache.
+    """
+
+    SCHEMA: tuple[str, ...] = ()
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        return state
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Return the connection to the database, creating the tables if needed."""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path)
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+            self._connection.commit()
+        return self._connection
+
+    def close(self) -> None:
+        """Close the connection to the database."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class RuleCache(SQLiteCache):
+    """
+    An on-disk cache of rules, stored at the path. The rules are given as any
+    picklable value, which is stored against the class and strategy.
+    """
+
+    FLUSH_EVERY = 1000
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS rules ("
+        "key TEXT PRIMARY KEY, rules BLOB, size INTEGER, last_used REAL)",
+        "CREATE INDEX IF NOT EXISTS rules_last_used ON rules (last_used)",
+    )
+
+    def __init__(self, path: str, max_size: int = 256 * 1024 * 1024) -> None:
+        super().__init__(path)
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._last_used: dict[str, float] = {}
+
+    @staticmethod
+    def key(comb_class: Any, strategy: Any) -> str:
+        """Return the key for the class and strategy. The class should be given in
+        a canonical form whose repr determines it."""
+        strategy_type = type(strategy)
+        text = repr(
+            (
+                comb_class,
+                f"{strategy_type.__module__}.{strategy_type.__qualname__}",
+                repr(strategy),
+            )
+        )
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the rules stored with the key, or None if there are none."""
+        row = self.connection.execute(
+            "SELECT rules FROM rules WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._last_used[key] = time.time()
+        if len(self._last_used) >= self.FLUSH_EVERY:
+            self.flush()
+        return pickle.loads(zlib.decompress(row[0]))
+
+    def put(self, key: str, rules: Any) -> None:
+        """Store the rules with the key, evicting the least recently used entries
+        if the cache is too large."""
+        data = zlib.compress(pickle.dumps(rules, pickle.HIGHEST_PROTOCOL))
+        if len(data) > self.max_size:
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO rules VALUES (?, ?, ?, ?)",
+            (key, data, len(data), time.time()),
+        )
+        self.write_last_used()
+        self.evict()
+        self.connection.commit()
+
+    def write_last_used(self) -> None:
+        """Write the times the entries were last used to the database, without
+        committing."""
+        if self._last_used:
+            self.connection.executemany(
+                "UPDATE rules SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._last_used.items()],
+            )
+            self._last_used.clear()
+
+    def flush(self) -> None:
+        """Write and commit the times the entries were last used."""
+        self.write_last_used()
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Write the times the entries were last used and close the connection to
+        the database."""
+        if self._connection is not None:
+            self.flush()
+        super().close()
+
+    def size(self) -> int:
+        """Return the total size in bytes of the stored rules."""
+        return self.connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM rules"
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM rules").fetchone()[0]
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the total size of the
+        stored rules is at most max_size."""
+        excess = self.size() - self.max_size
+        if excess <= 0:
+            return
+        removed = 0
+        keys = []
+        for key, size in self.connection.execute(
+            "SELECT key, size FROM rules ORDER BY last_used"
+        ):
+            if removed >= excess:
+                break
+            keys.append((key,))
+            removed += size
+        self.connection.executemany("DELETE FROM rules WHERE key = ?", keys)
+        logger.debug("Evicted %s rules from the rule cache.", len(keys))
+
+    def status(self) -> str:
+        """Return a string with the number of hits and misses."""
+        return (
+            f"Rule cache: {self.hits:,d} hits, {self.misses:,d} misses, "
+            f"{len(self):,d} entries of {self.size():,d} bytes\n"
+        )
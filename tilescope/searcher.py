@@ -1,7 +1,153 @@
 """Module contaiing TileScope class for running TileScope with."""
 
-from comb_spec_searcher import CombinatorialSpecificationSearcher
+import time
+from typing import Any, Iterator, Union
 
+from comb_spec_searcher import StrategyPack
+from comb_spec_searcher.exception import StrategyDoesNotApply
+from comb_spec_searcher.strategies import AbstractStrategy
+from comb_spec_searcher.strategies.rule import AbstractRule
+from comb_spec_searcher.typing import CombinatorialClassType, CSSstrategy
 
-class TileScope(CombinatorialSpecificationSearcher):
-    """TileScope class for running TileScope with."""
+from gridded_cayley_permutations import Tiling
+
+from .checkpoint import CheckpointableSearcher
+from .cost_queue import CostQueue
+from .parallel import (
+    CompressedRule,
+    ParallelSearcher,
+    WorkerProfile,
+    compress,
+    compress_rule,
+    decompress,
+)
+from .rule_cache import RuleCache
+
+
+class TileScope(CheckpointableSearcher, ParallelSearcher):
+    """TileScope class for running TileScope with.
+
+    If workers is more than 1, the expansion strategies are applied in that many
+    worker processes, see ParallelSearcher.
+
+    Searches can be checkpointed and resumed, see CheckpointableSearcher, and
+    profiled, see ProfiledSearcher.
+
+    If rule_cache is a RuleCache or a path, the rules found by applying a strategy
+    to a tiling are stored in that on-disk cache and are looked up before applying
+    the strategy, so searches can reuse the rules found by earlier searches. The
+    cache is only used for strategies applied in the main process.
+
+    If the strategy pack has symmetries, e.g. from TileScopePack.add_all_symmetries,
+    each tiling found is linked by a symmetry rule to the first tiling found in its
+    symmetry class and only that tiling is expanded, see _symmetry_expand.
+
+    If cost_queue is True, the expansion strategies are applied to the cheapest
+    tilings first rather than in levels, see CostQueue. The time taken by each
+    expansion is recorded so the queue can estimate the cost of later ones.
+    """
+
+    def __init__(
+        self,
+        start_class: Tiling,
+        strategy_pack: StrategyPack,
+        *,
+        rule_cache: Union[None, str, RuleCache] = None,
+        cost_queue: bool = False,
+        **kwargs,
+    ) -> None:
+        if cost_queue:
+            kwargs["classqueue"] = CostQueue(strategy_pack, self)
+        if isinstance(rule_cache, str):
+            rule_cache = RuleCache(rule_cache)
+        self.rule_cache = rule_cache
+        # the label of the first tiling found in each symmetry class, keyed by the
+        # least compressed image
+        self.symmetry_representatives: dict[Any, int] = {}
+        super().__init__(start_class, strategy_pack, **kwargs)
+
+    def _expand(
+        self,
+        comb_class: CombinatorialClassType,
+        label: int,
+        strategies: tuple[CSSstrategy, ...],
+        inferral: bool,
+    ) -> None:
+        if not isinstance(self.classqueue, CostQueue) or inferral:
+            super()._expand(comb_class, label, strategies, inferral)
+            return
+        start = time.perf_counter()
+        super()._expand(comb_class, label, strategies, inferral)
+        self.classqueue.record_expansion(label, strategies, time.perf_counter() - start)
+
+    def _rules_from_strategy(  # type: ignore
+        self, comb_class: CombinatorialClassType, strategy: CSSstrategy
+    ) -> Iterator[AbstractRule]:
+        # pylint: disable=arguments-differ, unidiomatic-typecheck
+        if self.rule_cache is None or type(comb_class) is not Tiling:
+            yield from super()._rules_from_strategy(comb_class, strategy)
+            return
+        data = compress(comb_class)
+        key = self.rule_cache.key(data, strategy)
+        cached = self.rule_cache.get(key)
+        if cached is not None:
+            for rule_strategy, parent, compressed_children in cached:
+                children = tuple(decompress(child) for child in compressed_children)
+                parent_class = comb_class if parent is None else decompress(parent)
+                yield rule_strategy(parent_class, children)
+            return
+        rules: list[CompressedRule] = []
+        for rule in super()._rules_from_strategy(comb_class, strategy):
+            try:
+                children = rule.children
+            except StrategyDoesNotApply:
+                continue
+            rules.append(compress_rule(rule, comb_class, children))
+            yield rule
+        self.rule_cache.put(key, rules)
+
+    def _symmetry_expand(self, comb_class: CombinatorialClassType, label: int) -> None:
+        """Link the tiling to the representative of its symmetry class, which is the
+        first tiling of the class found. If the tiling is not the representative,
+        a symmetry rule to the representative is added and the tiling is no longer
+        expanded. Unlike CombinatorialSpecificationSearcher, the other images of
+        the tiling are not added to the class database."""
+        self.symmetry_expanded.add(label)
+        images: list[tuple[AbstractStrategy, Tiling]] = []
+        for strategy in self.symmetries:
+            if not isinstance(strategy, AbstractStrategy):
+                continue
+            try:
+                children = strategy.decomposition_function(comb_class)
+            except StrategyDoesNotApply:
+                continue
+            images.extend((strategy, image) for image in children or ())
+        if not images:
+            return
+        key = min(map(compress, [comb_class] + [image for _, image in images]))
+        representative_label = self.symmetry_representatives.setdefault(key, label)
+        if representative_label == label:
+            return
+        representative = self.classdb.get_class(representative_label)
+        strategy = next(
+            strategy for strategy, image in images if image == representative
+        )
+        self.ruledb.add(
+            label, (representative_label,), strategy(comb_class, (representative,))
+        )
+        self.classqueue.set_stop_yielding(label)
+        self.tried_to_verify.add(label)
+
+    def status(self, elaborate: bool) -> str:
+        status = super().status(elaborate)
+        if self.rule_cache is not None:
+            status += self.rule_cache.status()
+        return status
+
+    def record_worker_expansion(
+        self, label: int, profiles: list[WorkerProfile]
+    ) -> None:
+        if isinstance(self.classqueue, CostQueue):
+            strategies = tuple(self.strategies[idx] for idx, *_ in profiles)
+            total = sum(elapsed for _, elapsed, _, _ in profiles)
+            self.classqueue.record_expansion(label, strategies, total)
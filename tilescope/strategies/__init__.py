@@ -54,6 +54,12 @@ from .obstruction_transitivity import (
     ObstructionTransitivityStrategy,
     AbstractObstructionTransitivityStrategy,
 )
+from .symmetry import (
+    TilingSymmetryStrategy,
+    ReverseStrategy,
+    ComplementStrategy,
+    ReverseComplementStrategy,
+)
 
 __all__ = (
     "RequirementInsertionStrategy",
@@ -95,4 +101,8 @@ __all__ = (
     "FusionPointRowStrategy",
     "ObstructionTransitivityStrategy",
     "AbstractObstructionTransitivityStrategy",
+    "TilingSymmetryStrategy",
+    "ReverseStrategy",
+    "ComplementStrategy",
+    "ReverseComplementStrategy",
 )
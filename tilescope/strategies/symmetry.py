@@ -0,0 +1,123 @@
+"""Symmetries of tilings: the reverse, complement and reverse complement."""
+
+from typing import Dict, Iterator, Optional, Tuple
+from comb_spec_searcher import SymmetryStrategy
+from comb_spec_searcher.exception import StrategyDoesNotApply
+
+from gridded_cayley_permutations import Tiling
+from gridded_cayley_permutations import GriddedCayleyPerm
+
+
+class TilingSymmetryStrategy(SymmetryStrategy[Tiling, GriddedCayleyPerm]):
+    """
+    Maps a tiling to its image under a symmetry of Cayley permutations. Subclasses
+    give the symmetry and its inverse on tilings and gridded Cayley permutations.
+    Only the tiling class itself has symmetries, not its subclasses which track
+    more information.
+    """
+
+    def symmetry(self, tiling: Tiling) -> Tiling:
+        """Return the image of the tiling."""
+        raise NotImplementedError
+
+    def gcp_symmetry(
+        self, gcp: GriddedCayleyPerm, dimensions: Tuple[int, int]
+    ) -> GriddedCayleyPerm:
+        """Return the image of the gridded Cayley permutation."""
+        raise NotImplementedError
+
+    def inverse_gcp_symmetry(
+        self, gcp: GriddedCayleyPerm, dimensions: Tuple[int, int]
+    ) -> GriddedCayleyPerm:
+        """Return the preimage of the gridded Cayley permutation. The symmetries
+        are all involutions."""
+        return self.gcp_symmetry(gcp, dimensions)
+
+    def decomposition_function(self, comb_class: Tiling) -> Tuple[Tiling, ...]:
+        if type(comb_class) is not Tiling:  # pylint: disable=unidiomatic-typecheck
+            raise StrategyDoesNotApply("Only applies to tilings.")
+        return (self.symmetry(comb_class),)
+
+    def extra_parameters(
+        self, comb_class: Tiling, children: Optional[Tuple[Tiling, ...]] = None
+    ) -> Tuple[Dict[str, str], ...]:
+        return ({},)
+
+    def backward_map(
+        self,
+        comb_class: Tiling,
+        objs: Tuple[Optional[GriddedCayleyPerm], ...],
+        children: Optional[Tuple[Tiling, ...]] = None,
+    ) -> Iterator[GriddedCayleyPerm]:
+        obj = objs[0]
+        assert obj is not None
+        yield self.inverse_gcp_symmetry(obj, comb_class.dimensions)
+
+    def forward_map(
+        self,
+        comb_class: Tiling,
+        obj: GriddedCayleyPerm,
+        children: Optional[Tuple[Tiling, ...]] = None,
+    ) -> Tuple[Optional[GriddedCayleyPerm], ...]:
+        return (self.gcp_symmetry(obj, comb_class.dimensions),)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}()"
+
+    def to_jsonable(self) -> dict:
+        """Return a dictionary form of the strategy."""
+        d: dict = super().to_jsonable()
+        d.pop("ignore_parent")
+        d.pop("inferrable")
+        d.pop("possibly_empty")
+        d.pop("workable")
+        return d
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "TilingSymmetryStrategy":
+        return cls(**d)
+
+
+class ReverseStrategy(TilingSymmetryStrategy):
+    """Maps a tiling to its reverse."""
+
+    def symmetry(self, tiling: Tiling) -> Tiling:
+        return tiling.reverse()
+
+    def gcp_symmetry(
+        self, gcp: GriddedCayleyPerm, dimensions: Tuple[int, int]
+    ) -> GriddedCayleyPerm:
+        return gcp.reverse(dimensions)
+
+    def formal_step(self) -> str:
+        return "reverse of the tiling"
+
+
+class ComplementStrategy(TilingSymmetryStrategy):
+    """Maps a tiling to its complement."""
+
+    def symmetry(self, tiling: Tiling) -> Tiling:
+        return tiling.complement()
+
+    def gcp_symmetry(
+        self, gcp: GriddedCayleyPerm, dimensions: Tuple[int, int]
+    ) -> GriddedCayleyPerm:
+        return gcp.complement(dimensions)
+
+    def formal_step(self) -> str:
+        return "complement of the tiling"
+
+
+class ReverseComplementStrategy(TilingSymmetryStrategy):
+    """Maps a tiling to its reverse complement."""
+
+    def symmetry(self, tiling: Tiling) -> Tiling:
+        return tiling.reverse_complement()
+
+    def gcp_symmetry(
+        self, gcp: GriddedCayleyPerm, dimensions: Tuple[int, int]
+    ) -> GriddedCayleyPerm:
+        return gcp.reverse_complement(dimensions)
+
+    def formal_step(self) -> str:
+        return "reverse complement of the tiling"
@@ -29,6 +29,9 @@ from tilescope.strategies import (
     FusionPointRowFactory,
     FusionFactory,
     ObstructionTransitivityStrategy,
+    ReverseStrategy,
+    ComplementStrategy,
+    ReverseComplementStrategy,
 )
 
 
@@ -52,6 +55,7 @@ class TileScopePack(StrategyPack):
         root: Tiling | None = None,
         fusion: int = 0,
         shuffle_factors: bool = False,
+        symmetries: bool = False,
     ):
         """Make a strategy pack with the given strategies.
         expansions: The expansion strategies to use; a list of strings where
@@ -78,6 +82,8 @@ class TileScopePack(StrategyPack):
         fusion: If 0, no fusion. If 1, standard fusion. If 2, point row fusion. If 3, both.
 
         shuffle_factors: If True, replaces FactorStrategy with ShuffleFactorStrategy.
+
+        symmetries: If True, symmetric tilings are only expanded once, see add_all_symmetries.
         """
         # pylint:disable=too-many-arguments
         # pylint:disable=too-many-positional-arguments
@@ -134,6 +140,9 @@ class TileScopePack(StrategyPack):
                 raise ValueError("root Tiling must be provided for verification.")
             pack = pack.add_verification_strats(strats_to_add=verify, root=root)
 
+        if symmetries:
+            pack = pack.add_all_symmetries()
+
         return pack.change_name(pack.name[1:])
 
     @classmethod
@@ -241,6 +250,16 @@ class TileScopePack(StrategyPack):
             return pack
         raise ValueError("fusion_type must be 1, 2, or 3.")
 
+    def add_all_symmetries(self) -> "TileScopePack":
+        """
+        Create a new pack with the reverse, complement and reverse complement
+        symmetries. When a tiling is added, the searcher adds its symmetric
+        tilings with rules to them and only expands one tiling of each orbit.
+        """
+        pack = self.add_symmetry(ReverseStrategy(), "with_symmetries")
+        pack = pack.add_symmetry(ComplementStrategy())
+        return pack.add_symmetry(ReverseComplementStrategy())
+
     def change_name(self, new_name: str) -> "TileScopePack":
         """Return a new pack with the given name."""
         return TileScopePack(
@@ -0,0 +1,146 @@
+"""
+Module for checking a specification found for a class against the counts of the
+class found by brute force.
+
+The specification is counted in one worker process and the class is counted by
+generating its Cayley permutations with Av in another, so the slower of the two
+sets the time taken. The brute force counts can be kept in a CountCache, an
+SQLite database shared between runs, so each class is only generated once for
+each size. Classes with the same lex_min have the same counts, so share entries.
+"""
+
+import json
+from multiprocessing import Pool
+from typing import Optional
+
+from comb_spec_searcher import CombinatorialSpecification
+
+from cayley_permutations import Av, CayleyPermutation, string_to_basis
+from cayley_permutations.simplify_basis import lex_min
+
+from .batch import basis_to_string
+from .rule_cache import SQLiteCache
+
+
+class CountCache(SQLiteCache):
+    """
+    An on-disk cache of the counts of classes found by brute force, stored at the
+    path and keyed by the lex_min of the basis.
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS counts (basis TEXT PRIMARY KEY, counts TEXT)",
+    )
+
+    @staticmethod
+    def key(basis: tuple[CayleyPermutation, ...]) -> str:
+        """Return the key for the class with the basis."""
+        return basis_to_string(lex_min(basis))
+
+    def get(self, basis: tuple[CayleyPermutation, ...]) -> list[int]:
+        """Return the counts stored for the class, starting at size 0. The list
+        is empty if none are stored."""
+        row = self.connection.execute(
+            "SELECT counts FROM counts WHERE basis = ?", (self.key(basis),)
+        ).fetchone()
+        if row is None:
+            return []
+        return json.loads(row[0])
+
+    def put(self, basis: tuple[CayleyPermutation, ...], counts: list[int]) -> None:
+        """Store the counts of the class, unless more are already stored."""
+        if len(counts) <= len(self.get(basis)):
+            return
+        self.connection.execute(
+            "INSERT OR REPLACE INTO counts VALUES (?, ?)",
+            (self.key(basis), json.dumps(counts)),
+        )
+        self.connection.commit()
+
+
+class ValidationReport:
+    """The counts of a specification and of its class for sizes 0 to max_size."""
+
+    def __init__(
+        self, basis: str, spec_counts: list[int], brute_force_counts: list[int]
+    ) -> None:
+        self.basis = basis
+        self.spec_counts = spec_counts
+        self.brute_force_counts = brute_force_counts
+
+    @property
+    def mismatches(self) -> list[tuple[int, int, int]]:
+        """Return the sizes where the counts differ, with the count from the
+        specification and from brute force."""
+        return [
+            (size, spec_count, brute_force_count)
+            for size, (spec_count, brute_force_count) in enumerate(
+                zip(self.spec_counts, self.brute_force_counts)
+            )
+            if spec_count != brute_force_count
+        ]
+
+    def is_valid(self) -> bool:
+        """Return True if the counts agree for every size."""
+        return not self.mismatches
+
+    def __str__(self) -> str:
+        if self.is_valid():
+            return (
+                f"The specification for Av({self.basis}) agrees with brute force "
+                f"up to size {len(self.spec_counts) - 1}."
+            )
+        lines = [f"The specification for Av({self.basis}) disagrees with brute force:"]
+        for size, spec_count, brute_force_count in self.mismatches:
+            lines.append(
+                f"  size {size}: {spec_count} from the specification, "
+                f"{brute_force_count} by brute force"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}({self.basis!r}, {self.spec_counts!r}, "
+            f"{self.brute_force_counts!r})"
+        )
+
+
+def count_specification(spec_dict: dict, max_size: int) -> list[int]:
+    """Return the counts of the specification, given by its to_jsonable
+    dictionary, for sizes 0 to max_size."""
+    spec = CombinatorialSpecification.from_dict(spec_dict)
+    return [spec.count_objects_of_size(size) for size in range(max_size + 1)]
+
+
+def count_by_brute_force(
+    basis: tuple[CayleyPermutation, ...], max_size: int
+) -> list[int]:
+    """Return the counts of the class with the basis for sizes 0 to max_size."""
+    return Av(basis).counter(max_size)
+
+
+def validate_specification(
+    spec: CombinatorialSpecification,
+    basis: str,
+    max_size: int,
+    cache: Optional[CountCache] = None,
+) -> ValidationReport:
+    """
+    Count the specification and the class with the basis for sizes 0 to max_size
+    in two worker processes, and return the report comparing them. The brute
+    force counts are taken from the cache if it has enough of them, and the
+    counts found are added to it.
+    """
+    cperms = tuple(string_to_basis(basis))
+    cached = [] if cache is None else cache.get(cperms)
+    with Pool(1 if len(cached) > max_size else 2) as pool:
+        spec_result = pool.apply_async(
+            count_specification, (spec.to_jsonable(), max_size)
+        )
+        if len(cached) > max_size:
+            brute_force = cached[: max_size + 1]
+        else:
+            brute_force = pool.apply(count_by_brute_force, (cperms, max_size))
+            if cache is not None:
+                cache.put(cperms, brute_force)
+        return ValidationReport(basis, spec_result.get(), brute_force)